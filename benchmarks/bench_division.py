@@ -0,0 +1,70 @@
+"""
+Benchmark FixedPointArithmetic division throughput at several precisions.
+
+Compares the integer division engine with the digit-by-digit long division it
+replaced. Run with ``python benchmarks/bench_division.py``.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ntkmath.adv_decimal import FixedPointArithmetic
+
+PRECISIONS = (23, 100, 1000, 10000)
+
+
+def long_division(dividend, divisor, precision):
+    """The previous digit-by-digit algorithm, kept here as the baseline."""
+    remainder = 0
+    answer = ""
+    for i in str(dividend):
+        remainder += int(i)
+        answer += str(remainder // divisor)
+        remainder %= divisor
+        remainder *= 10
+    answer += "."
+    for _ in range(precision):
+        answer += str(remainder // divisor)
+        remainder = remainder % divisor
+        remainder *= 10
+        if remainder == 0:
+            break
+    return answer.lstrip("0")
+
+
+def throughput(statement, budget=0.5):
+    """Return calls per second of ``statement``, timed for about ``budget`` seconds."""
+    timer = timeit.Timer(statement)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * budget / max(elapsed, 1e-9)))
+    return number / min(timer.repeat(repeat=3, number=number))
+
+
+def main():
+    operands = (
+        ("small divisor", "22", "7"),
+        ("large divisor", "1" * 40 + ".5", "3" * 30 + ".7"),
+    )
+    print(
+        f"{'precision':>9} {'operands':>14} {'legacy/s':>12} {'engine/s':>12} "
+        f"{'speedup':>8}"
+    )
+    for precision in PRECISIONS:
+        for label, dividend, divisor in operands:
+            number = FixedPointArithmetic(dividend, mode="fpt")
+            number.precision = precision
+            value1, value2, _ = number._operands(divisor)
+
+            legacy = throughput(lambda: long_division(value1, value2, precision))
+            engine = throughput(lambda: number / divisor)
+            print(
+                f"{precision:>9} {label:>14} {legacy:>12,.0f} {engine:>12,.0f} "
+                f"{engine / legacy:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark sampling KeyframeTracks of very different lengths.
+
+Builds tracks of 10 to 100,000 keyframes with alternating easing curves and times
+how long one sample takes through binary search (``sample_at``), through a cursor
+during forward playback, and through batched ``sample`` over a whole array, next to
+the old approach of scanning the keyframes for the active segment. Run with
+``python benchmarks/bench_keyframes.py``.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ntkmath.general import Curves
+from ntkmath.timeline import KeyframeTrack
+
+SIZES = (10, 1_000, 100_000)
+SAMPLES = 20_000
+
+
+def build(count, rng):
+    times = [0.0]
+    for _ in range(count - 1):
+        times.append(times[-1] + rng.uniform(0.1, 1.0))
+    values = [rng.uniform(-100, 100) for _ in range(count)]
+    curves = [(Curves.ease_in_out_quad, Curves.bounce)[i % 2] for i in range(count - 1)]
+    return KeyframeTrack(times, values, curves)
+
+
+def scan(track, at):
+    """Find the segment by walking the keyframes, as before KeyframeTrack."""
+    times = track._times
+    segment = 0
+    while segment < len(times) - 2 and times[segment + 1] <= at:
+        segment += 1
+    return track._evaluate(segment, at)
+
+
+def per_sample(function, times):
+    start = time.perf_counter()
+    results = [function(at) for at in times]
+    return (time.perf_counter() - start) / len(times), results
+
+
+def main():
+    rng = random.Random(1)
+    print(
+        f"{'keyframes':>9} {'scan us':>9} {'search us':>10} {'cursor us':>10} "
+        f"{'batch us':>9}"
+    )
+    for count in SIZES:
+        track = build(count, rng)
+        playback = [
+            track.start + (track.end - track.start) * i / SAMPLES
+            for i in range(SAMPLES)
+        ]
+        shuffled = playback[:]
+        rng.shuffle(shuffled)
+
+        scanned, expected = per_sample(lambda at: scan(track, at), shuffled[:200])
+        searched, results = per_sample(track.sample_at, shuffled)
+        assert results[:200] == expected
+        cursor = track.cursor()
+        played, results = per_sample(cursor.sample, playback)
+        assert results == [track.sample_at(at) for at in playback]
+
+        start = time.perf_counter()
+        batch = track.sample(shuffled)
+        batched = (time.perf_counter() - start) / SAMPLES
+        assert list(batch) == [track.sample_at(at) for at in shuffled]
+        print(
+            f"{count:>9,} {scanned * 1e6:>9.2f} {searched * 1e6:>10.2f} "
+            f"{played * 1e6:>10.2f} {batched * 1e6:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark the memory taken by one million points.
+
+Compares Point objects with a per-instance ``__dict__`` (as Point was before it
+gained ``__slots__``), Point objects with ``__slots__``, and a PointArray.
+Run with ``python benchmarks/bench_point_memory.py``.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ntkmath.geometry import Point
+from ntkmath.geometry_array import PointArray
+
+COUNT = 1_000_000
+
+
+class DictPoint:
+    """Point as it was stored before ``__slots__``, kept here as the baseline."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def measure(build):
+    """Return (bytes allocated, seconds) for building and holding a collection."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    collection = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del collection
+    return size, elapsed
+
+
+def main():
+    xs = [float(i) for i in range(COUNT)]
+    ys = [float(-i) for i in range(COUNT)]
+    layouts = (
+        ("Point with __dict__", lambda: list(map(DictPoint, xs, ys))),
+        ("Point with __slots__", lambda: list(map(Point, xs, ys))),
+        ("PointArray", lambda: PointArray(xs, ys)),
+    )
+    print(f"{COUNT:,} points")
+    print(f"{'layout':>22} {'MiB':>9} {'bytes/point':>12} {'build s':>8}")
+    for label, build in layouts:
+        size, elapsed = measure(build)
+        print(f"{label:>22} {size / 2**20:>9.1f} {size / COUNT:>12.1f} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark point queries on a RectangleIndex against a linear scan.
+
+Scatters rotated rectangles at a constant density over a square world and times
+finding every rectangle under a random point, with ``point_in_rectangle`` on each
+rectangle in turn and with the grid index. Run with
+``python benchmarks/bench_spatial_index.py``.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from ntkmath.geometry import Rectangle
+from ntkmath.spatial_index import RectangleIndex
+
+SIZES = (1_000, 10_000, 100_000)
+QUERIES = 200
+
+
+def scatter(count, rng):
+    """Rotated rectangles, about 40 units across, averaging ~1 per 50x50 area."""
+    side = 50 * count**0.5
+    return side, [
+        Rectangle(
+            rng.uniform(0, side),
+            rng.uniform(0, side),
+            rng.uniform(10, 60),
+            rng.uniform(10, 60),
+            rng.uniform(0, 360),
+        )
+        for _ in range(count)
+    ]
+
+
+def per_query(function, points):
+    """Return (seconds per query, results) for running ``function`` on every point."""
+    start = time.perf_counter()
+    results = [function(x, y) for x, y in points]
+    return (time.perf_counter() - start) / len(points), results
+
+
+def main():
+    rng = random.Random(1)
+    print(
+        f"{'rectangles':>10} {'build ms':>9} {'scan us':>10} {'index us':>9} "
+        f"{'speedup':>8}"
+    )
+    for count in SIZES:
+        side, rectangles = scatter(count, rng)
+        points = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(QUERIES)]
+
+        start = time.perf_counter()
+        index = RectangleIndex(rectangles)
+        build = time.perf_counter() - start
+
+        scan, expected = per_query(
+            lambda x, y: [r for r in rectangles if r.point_in_rectangle(x, y)], points
+        )
+        indexed, results = per_query(index.query_point, points)
+        assert results == expected
+        print(
+            f"{count:>10,} {build * 1e3:>9.1f} {scan * 1e6:>10.1f} "
+            f"{indexed * 1e6:>9.1f} {scan / indexed:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
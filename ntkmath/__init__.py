@@ -3,30 +3,100 @@ ntkmath - A collection of mathematical utility functions and classes.
 """
 
 # Import all public functions and classes from submodules
-from .general import Curves, clamp, sign
+from .general import (
+    Curves,
+    BakedCurve,
+    bake_curve,
+    CubicBezier,
+    ComposedCurve,
+    reverse_curve,
+    mirror_curve,
+    sequence_curves,
+    blend_curves,
+    clamp_curve,
+    clamp,
+    sign,
+)
 from .geometry import (
     Rectangle,
     Triangle,
+    Polygon,
     Angle,
     Point,
     Line,
+    Transform,
+    shapes_overlap,
+)
+from .geometry_array import PointArray, RectangleArray, TriangleMesh
+from .spatial_index import RectangleIndex
+from .collision import SweepAndPrune
+from .timeline import Timeline, KeyframeTrack
+from .adv_decimal import (
+    FixedPointArithmetic,
+    FixedPointExpression,
+    FixedPointContext,
+    DecimalAccumulator,
+    getcontext,
+    setcontext,
+    localcontext,
+    sort_decimals,
+    argsort_decimals,
+    unique_decimals,
+    FPT,
+    Decimal,
 )
-from .adv_decimal import FixedPointArithmetic, FPT, Decimal
+from .decimal_array import DecimalArray
+from .decimal_linalg import dot, matmul, weighted_sum
+from .decimal_io import read_decimal_column, write_decimal_column
 
 # This list controls what gets imported with "from ntkmath import *"
 __all__ = [
     # General utilities
     "Curves",
+    "BakedCurve",
+    "bake_curve",
+    "CubicBezier",
+    "ComposedCurve",
+    "reverse_curve",
+    "mirror_curve",
+    "sequence_curves",
+    "blend_curves",
+    "clamp_curve",
+    "Timeline",
+    "KeyframeTrack",
     "clamp",
     "sign",
     # Geometry classes and functions
     "Rectangle",
     "Triangle",
+    "Polygon",
     "Angle",
     "Point",
     "Line",
+    "Transform",
+    "shapes_overlap",
+    "PointArray",
+    "RectangleArray",
+    "TriangleMesh",
+    "RectangleIndex",
+    "SweepAndPrune",
     # Advanced decimal arithmetic
     "FixedPointArithmetic",
+    "FixedPointExpression",
+    "FixedPointContext",
+    "DecimalAccumulator",
+    "getcontext",
+    "setcontext",
+    "localcontext",
+    "sort_decimals",
+    "argsort_decimals",
+    "unique_decimals",
     "FPT",
     "Decimal",
+    "DecimalArray",
+    "dot",
+    "matmul",
+    "weighted_sum",
+    "read_decimal_column",
+    "write_decimal_column",
 ]
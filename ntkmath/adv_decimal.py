@@ -1,26 +1,509 @@
+import contextvars
+import decimal
+import re
+import sys
+from contextlib import contextmanager
+from decimal import (
+    ROUND_05UP,
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_HALF_DOWN,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP,
+    ROUND_UP,
+)
+from fractions import Fraction
+from math import gcd
+
+_NUMBER_PATTERN = re.compile(r"\s*([-+]?)(\d*)(?:\.(\d*))?(?:[eE]([-+]?\d+))?\s*\Z")
+
+# Divisors at least this many bits long are divided through a Newton reciprocal,
+# which beats CPython's quadratic long division from roughly 20,000 digits on.
+_NEWTON_DIVISOR_BITS = 65536
+_NEWTON_BASE_BITS = 1024
+
+# Hashes follow the rules for numeric types, so equal ints, floats, Fractions and
+# fixed-point values hash alike; 10 is inverted modulo the (prime) hash modulus.
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INV10 = pow(10, _HASH_MODULUS - 2, _HASH_MODULUS)
+
+# Unbounded context for exact conversions to and from the stdlib Decimal
+_EXACT_DECIMAL_CONTEXT = decimal.Context(
+    prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN
+)
+
+
+def _reciprocal(divisor, bits):
+    """Approximate 2**(divisor.bit_length() + bits) / divisor to within a few units.
+
+    Args:
+        divisor (int): Positive divisor
+        bits (int): Number of bits of the reciprocal to compute
+
+    Returns:
+        int: The approximate reciprocal
+    """
+    size = divisor.bit_length()
+    if bits <= _NEWTON_BASE_BITS:
+        return (1 << (size + bits)) // divisor
+    # Only the leading bits of the divisor matter at this precision
+    shift = size - bits - 32
+    if shift > 0:
+        return _reciprocal(divisor >> shift, bits)
+    half = bits // 2 + 16
+    reciprocal = _reciprocal(divisor, half) << (bits - half)
+    # One Newton step doubles the number of correct bits: x += x * (1 - d * x)
+    error = (1 << (size + bits)) - divisor * reciprocal
+    return reciprocal + ((reciprocal * error) >> (size + bits))
+
+
+def _newton_divmod(dividend, divisor):
+    """divmod() for large non-negative integers through a Newton reciprocal.
+
+    Args:
+        dividend (int): Non-negative dividend
+        divisor (int): Positive divisor
+
+    Returns:
+        tuple: (quotient, remainder), identical to divmod(dividend, divisor)
+    """
+    dividend_bits, divisor_bits = dividend.bit_length(), divisor.bit_length()
+    if dividend_bits < divisor_bits:
+        return 0, dividend
+    bits = dividend_bits - divisor_bits + 2
+    reciprocal = _reciprocal(divisor, bits)
+    shift = max(0, divisor_bits - 64)
+    quotient = ((dividend >> shift) * reciprocal) >> (divisor_bits + bits - shift)
+    remainder = dividend - quotient * divisor
+    # The estimate is off by at most a couple of units
+    while remainder < 0:
+        quotient -= 1
+        remainder += divisor
+    while remainder >= divisor:
+        quotient += 1
+        remainder -= divisor
+    return quotient, remainder
+
+
+def _int_divmod(dividend, divisor):
+    """divmod() for non-negative integers, picking the faster engine for their size."""
+    divisor_bits = divisor.bit_length()
+    if (
+        divisor_bits >= _NEWTON_DIVISOR_BITS
+        and dividend.bit_length() <= 3 * divisor_bits
+    ):
+        return _newton_divmod(dividend, divisor)
+    return divmod(dividend, divisor)
+
+
+def _round_quotient(quotient, remainder, divisor, negative, rounding):
+    """Round the magnitude of a truncated quotient according to a rounding mode.
+
+    Args:
+        quotient (int): Truncated magnitude of the quotient
+        remainder (int): Remainder left by the truncation
+        divisor (int): Divisor the remainder is relative to
+        negative (bool): Whether the final result is negative
+        rounding (str): One of the decimal module's ROUND_* constants
+
+    Returns:
+        int: The rounded magnitude
+    """
+    if remainder == 0 or rounding == ROUND_DOWN:
+        return quotient
+    if rounding == ROUND_UP:
+        return quotient + 1
+    if rounding == ROUND_CEILING:
+        return quotient if negative else quotient + 1
+    if rounding == ROUND_FLOOR:
+        return quotient + 1 if negative else quotient
+    if rounding == ROUND_05UP:
+        return quotient + 1 if quotient % 5 == 0 else quotient
+    twice = 2 * remainder
+    if twice != divisor:
+        return quotient + 1 if twice > divisor else quotient
+    if rounding == ROUND_HALF_UP or (rounding == ROUND_HALF_EVEN and quotient % 2):
+        return quotient + 1
+    return quotient
+
+
+class FixedPointContext:
+    """
+    Precision, rounding and output scale used by FixedPointArithmetic operations.
+
+    Every thread and every asyncio task works with its own current context (see
+    ``getcontext()`` and ``localcontext()``), so handlers running concurrently can use
+    different settings without interfering with each other. Powers of ten are cached
+    on the context so that hot loops do not recompute ``10**n``.
+
+    Args:
+        precision (int): Maximum number of decimals kept by a division. Defaults to 23.
+        rounding (str): How a division (or ``scale``) drops decimals, one of the
+            decimal module's ROUND_* constants. Defaults to ROUND_DOWN (truncation).
+        scale (int, optional): When set, every result is rounded to exactly this
+            many decimals. Defaults to None.
+    """
+
+    ROUNDINGS = (
+        ROUND_DOWN,
+        ROUND_UP,
+        ROUND_HALF_UP,
+        ROUND_HALF_DOWN,
+        ROUND_HALF_EVEN,
+        ROUND_CEILING,
+        ROUND_FLOOR,
+        ROUND_05UP,
+    )
+
+    def __init__(self, precision=23, rounding=ROUND_DOWN, scale=None, _powers=None):
+        if not isinstance(precision, int) or precision < 0:
+            raise ValueError(
+                f"precision must be a non-negative integer, not {precision!r}"
+            )
+        if rounding not in self.ROUNDINGS:
+            raise ValueError(
+                f"rounding must be one of {self.ROUNDINGS}, not {rounding!r}"
+            )
+        if scale is not None and (not isinstance(scale, int) or scale < 0):
+            raise ValueError(
+                f"scale must be a non-negative integer or None, not {scale!r}"
+            )
+        self.precision = precision
+        self.rounding = rounding
+        self.scale = scale
+        self._powers = {} if _powers is None else _powers
+
+    def pow10(self, exponent):
+        """Return ``10**exponent``, computing each power only once."""
+        try:
+            return self._powers[exponent]
+        except KeyError:
+            power = self._powers[exponent] = 10**exponent
+            return power
+
+    def copy(self, **changes):
+        """Return a copy of this context with some settings changed.
+
+        Args:
+            **changes: New values for ``precision``, ``rounding`` or ``scale``
+
+        Returns:
+            FixedPointContext: The new context, sharing this one's cached powers of ten
+        """
+        settings = {
+            "precision": self.precision,
+            "rounding": self.rounding,
+            "scale": self.scale,
+        }
+        settings.update(changes)
+        return FixedPointContext(_powers=self._powers, **settings)
+
+    def __repr__(self):
+        return (
+            f"FixedPointContext(precision={self.precision}, "
+            f"rounding={self.rounding}, scale={self.scale})"
+        )
+
+
+_current_context = contextvars.ContextVar("ntkmath_fixed_point_context")
+
+
+def getcontext():
+    """Return the current FixedPointContext of this thread or asyncio task."""
+    try:
+        return _current_context.get()
+    except LookupError:
+        context = FixedPointContext()
+        _current_context.set(context)
+        return context
+
+
+def setcontext(context):
+    """Make ``context`` the current FixedPointContext of this thread or asyncio task."""
+    if not isinstance(context, FixedPointContext):
+        raise TypeError(f"expected a FixedPointContext, not {type(context).__name__}")
+    _current_context.set(context)
+
+
+@contextmanager
+def localcontext(context=None, **changes):
+    """Use a copy of a context as the current context for the duration of a with block.
+
+    Args:
+        context (FixedPointContext, optional): Context to copy (the current one if None)
+        **changes: Settings to change on the copy (``precision``, ``rounding``, ``scale``)
+
+    Yields:
+        FixedPointContext: The context in effect inside the block
+    """
+    context = (context or getcontext()).copy(**changes)
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
 class FixedPointArithmetic:
     """
     Fixed Point Arithmetic class for precise decimal calculations.
 
-    This class provides arithmetic operations without floating-point precision issues
-    by using string-based calculations.
+    This class provides arithmetic operations without floating-point precision issues.
+    The value is parsed once into a scaled integer and an exponent (the number of
+    digits after the decimal point), and every operator works on those integers.
+    ``str()`` and ``format()`` render the value itself.
+
+    The ``mode`` decides what the operators return:
+
+    - ``"str"`` (default): strings in the same format as earlier releases.
+    - ``"fpt"``: FixedPointArithmetic instances (in ``"fpt"`` mode), so chained
+      expressions never go back through a string.
+    - ``"lazy"``: FixedPointExpression trees that are evaluated exactly in one pass
+      by ``evaluate()``, rounding only once at the end.
+
+    Division precision, rounding and an optional fixed output scale come from the
+    current FixedPointContext; assigning ``precision`` overrides it for one instance.
     """
 
-    def __init__(self, number1):
+    MODES = ("str", "fpt", "lazy")
+
+    def __init__(self, number1, mode="str"):
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}, not {mode!r}")
         self.number1 = number1
-        self.precision = 23
-
-    def _compensate(self, answer, imprecision):
-        """Compensate for decimal precision in string representation."""
-        answer_str = str(answer).replace(".", "")
-        negative = answer_str[0] == "-"
-        if answer_str[0] == "-":
-            answer_str = answer_str[1:]
-        if len(answer_str) <= imprecision:
-            answer = "0." + "0" * (imprecision - len(answer_str)) + answer_str
+        self._precision = None
+        self.mode = mode
+
+    @property
+    def precision(self):
+        """Maximum number of decimals kept by a division (the context's unless overridden)."""
+        if self._precision is None:
+            return getcontext().precision
+        return self._precision
+
+    @precision.setter
+    def precision(self, precision):
+        self._precision = precision
+
+    @property
+    def number1(self):
+        """The value this instance was created from.
+
+        Assigning it changes the value, and with it the hash: reassigning an
+        instance that is a set member or dict key leaves it filed under the old one.
+        """
+        if self._number1 is None:
+            self._number1 = str(self)
+        return self._number1
+
+    @number1.setter
+    def number1(self, number1):
+        self._int, self._exp = self._parse(number1)
+        self._number1 = number1
+        self._sort_key = None
+
+    @classmethod
+    def _from_scaled(cls, value, exp, mode="str", precision=None):
+        """Build an instance directly from a scaled integer and its exponent."""
+        result = cls.__new__(cls)
+        result._int = value
+        result._exp = exp
+        result._number1 = None
+        result._sort_key = None
+        result._precision = precision
+        result.mode = mode
+        return result
+
+    @staticmethod
+    def _parse(number):
+        """Convert a number into a scaled integer and its exponent.
+
+        Args:
+            number (str, int, float, FixedPointArithmetic): Number to convert
+
+        Returns:
+            tuple: (scaled_integer, exponent) such that number == scaled_integer / 10**exponent
+        """
+        if isinstance(number, FixedPointArithmetic):
+            return number._int, number._exp
+        if isinstance(number, int):
+            return int(number), 0
+        if isinstance(number, decimal.Decimal):
+            return FixedPointArithmetic._parse_decimal(number)
+
+        number_str = str(number)
+        head, _, tail = number_str.partition(".")
+        if not tail or tail.isdigit():
+            try:
+                return int(head + tail), len(tail)
+            except ValueError:
+                pass
+
+        match = _NUMBER_PATTERN.match(number_str)
+        if match is None or not (match.group(2) or match.group(3)):
+            raise ValueError(f"Invalid number for fixed-point arithmetic: {number!r}")
+        sign, whole, fraction, exponent = match.groups()
+        fraction = fraction or ""
+        value = int(whole + fraction or "0")
+        exp = len(fraction) - int(exponent or 0)
+        if exp < 0:
+            value *= 10**-exp
+            exp = 0
+        return (-value if sign == "-" else value), exp
+
+    @staticmethod
+    def _parse_decimal(number):
+        """Convert a finite stdlib Decimal into a scaled integer and its exponent."""
+        exponent = number.as_tuple().exponent
+        if not isinstance(exponent, int):
+            raise ValueError(f"Invalid number for fixed-point arithmetic: {number!r}")
+        if exponent >= 0:
+            return int(number), 0
+        return int(number.scaleb(-exponent, _EXACT_DECIMAL_CONTEXT)), -exponent
+
+    @classmethod
+    def from_int(cls, number, mode="str"):
+        """Create an instance from an integer.
+
+        Args:
+            number (int): Integer value
+            mode (str, optional): Mode of the new instance
+
+        Returns:
+            FixedPointArithmetic: The same value, with no decimals
+        """
+        if not isinstance(number, int):
+            raise TypeError(f"from_int() needs an int, not {type(number).__name__}")
+        return cls._from_scaled(int(number), 0, mode)
+
+    @classmethod
+    def from_decimal(cls, number, mode="str"):
+        """Create an instance from a stdlib ``decimal.Decimal``, keeping its exponent.
+
+        Args:
+            number (decimal.Decimal): Finite decimal value
+            mode (str, optional): Mode of the new instance
+
+        Returns:
+            FixedPointArithmetic: The same value (``Decimal("1.50")`` keeps two decimals)
+        """
+        return cls._from_scaled(*cls._parse_decimal(number), mode)
+
+    @classmethod
+    def from_fraction(cls, number, mode="str", precision=None):
+        """Create an instance from a ``fractions.Fraction`` (or anything with a ratio).
+
+        Fractions that terminate in decimal are converted exactly; others are rounded
+        like a division, to ``precision`` decimals with the context's rounding.
+
+        Args:
+            number (Fraction): Rational value
+            mode (str, optional): Mode of the new instance
+            precision (int, optional): Decimals kept for non-terminating values
+                (the context's precision if None)
+
+        Returns:
+            FixedPointArithmetic: The converted value
+        """
+        context = getcontext()
+        if precision is None:
+            precision = context.precision
+        value, exp = cls._divide(
+            number.numerator, number.denominator, precision, context
+        )
+        return cls._from_scaled(value, exp, mode)
+
+    @classmethod
+    def from_float(cls, number, mode="str", exact=True):
+        """Create an instance from the binary value of a float.
+
+        Unlike ``FixedPointArithmetic(0.1)``, which reads the float's shortest repr
+        ("0.1"), this converts the value actually stored. Every float is a terminating
+        decimal, so with ``exact`` the result is the float to the last digit
+        (0.1 becomes 0.1000000000000000055511151231257827021181583404541015625).
+        Otherwise it is rounded like a division, using the context's precision,
+        rounding and scale.
+
+        Args:
+            number (float): Finite float
+            mode (str, optional): Mode of the new instance
+            exact (bool, optional): Keep every digit instead of rounding to the context
+
+        Returns:
+            FixedPointArithmetic: The converted value
+        """
+        numerator, denominator = float(number).as_integer_ratio()
+        if not exact:
+            return cls.from_fraction(Fraction(numerator, denominator), mode)
+        exp = denominator.bit_length() - 1
+        return cls._from_scaled(numerator * 5**exp, exp, mode)
+
+    def as_integer_ratio(self):
+        """Return the value as a fraction in lowest terms.
+
+        Returns:
+            tuple: (numerator, denominator) with a positive denominator
+        """
+        if self._exp <= 0:
+            return self._int * 10**-self._exp, 1
+        denominator = 10**self._exp
+        common = gcd(self._int, denominator)
+        return self._int // common, denominator // common
+
+    def to_fraction(self):
+        """Return the exact value as a ``fractions.Fraction``."""
+        return Fraction(*self.as_integer_ratio())
+
+    def to_decimal(self):
+        """Return the exact value as a stdlib ``decimal.Decimal`` with the same exponent."""
+        return decimal.Decimal(self._int).scaleb(-self._exp, _EXACT_DECIMAL_CONTEXT)
+
+    def __float__(self):
+        # int / int is correctly rounded, even beyond the range of a float's mantissa
+        if self._exp <= 0:
+            return float(self._int * 10**-self._exp)
+        return self._int / 10**self._exp
+
+    def __int__(self):
+        # Truncates toward zero, like int(float) and int(decimal.Decimal)
+        if self._exp <= 0:
+            return self._int * 10**-self._exp
+        quotient = abs(self._int) // 10**self._exp
+        return -quotient if self._int < 0 else quotient
+
+    @staticmethod
+    def _to_string(value, exp):
+        """Render a scaled integer with exactly ``exp`` digits after the decimal point."""
+        if exp <= 0:
+            return str(value * 10**-exp)
+        digits = str(abs(value)).rjust(exp + 1, "0")
+        answer = f"{digits[:-exp]}.{digits[-exp:]}"
+        return f"-{answer}" if value < 0 else answer
+
+    def _operands(self, number2, number1=None, context=None):
+        """Parse the operands of a binary operation and align them to a shared exponent.
+
+        Args:
+            number2 (str, int, float, FixedPointArithmetic): Right operand
+            number1 (str, int, float, FixedPointArithmetic, optional): Left operand
+                (uses this instance if None)
+            context (FixedPointContext, optional): Context to take powers of ten from
+
+        Returns:
+            tuple: (scaled_number1, scaled_number2, exponent)
+        """
+        if number1 is None:
+            value1, exp1 = self._int, self._exp
         else:
-            answer = f"{answer_str[:-imprecision]}.{answer_str[-imprecision:]}"
-        return f"-{answer}" if negative else answer
+            value1, exp1 = self._parse(number1)
+        value2, exp2 = self._parse(number2)
+        if exp1 == exp2:
+            return value1, value2, exp1
+        pow10 = (context or getcontext()).pow10
+        if exp1 > exp2:
+            return value1, value2 * pow10(exp1 - exp2), exp1
+        return value1 * pow10(exp2 - exp1), value2, exp2
 
     @staticmethod
     def _generate_string_numbers(number1, number2):
@@ -58,6 +541,88 @@ class FixedPointArithmetic:
 
         return string_number1, string_number2, imprecision
 
+    def __str__(self):
+        return self._to_string(self._int, self._exp)
+
+    def __repr__(self):
+        return f"FixedPointArithmetic('{self}')"
+
+    def __format__(self, format_spec):
+        if not format_spec:
+            return str(self)
+        return format(self.to_decimal(), format_spec)
+
+    @staticmethod
+    def _quantize(value, exp, context):
+        """Round a scaled integer to the context's output scale.
+
+        Returns:
+            tuple: (scaled_integer, exponent) with ``exponent == context.scale``
+        """
+        scale = context.scale
+        if exp <= scale:
+            return value * context.pow10(scale - exp), scale
+        divisor = context.pow10(exp - scale)
+        quotient, remainder = divmod(abs(value), divisor)
+        quotient = _round_quotient(
+            quotient, remainder, divisor, value < 0, context.rounding
+        )
+        return (-quotient if value < 0 else quotient), scale
+
+    def _result(self, value, exp, context):
+        """Return an eager result in this instance's mode.
+
+        At least one decimal is kept, unless the context fixes the output scale.
+        """
+        if context.scale is not None:
+            value, exp = self._quantize(value, exp, context)
+        elif exp == 0:
+            value, exp = value * 10, 1
+        if self.mode == "str":
+            return self._to_string(value, exp)
+        return self._from_scaled(value, exp, self.mode, self._precision)
+
+    @staticmethod
+    def _divide(dividend, divisor, precision, context):
+        """Divide two integers, rounding the quotient to ``precision`` decimals.
+
+        Trailing zeros are dropped when the division is exact, keeping at least one decimal.
+        If the context fixes the output scale, the quotient has exactly that many decimals.
+
+        Args:
+            dividend (int): Dividend
+            divisor (int): Divisor
+            precision (int): Maximum number of digits after the decimal point
+            context (FixedPointContext): Context supplying rounding, scale and powers of ten
+
+        Returns:
+            tuple: (scaled_quotient, exponent)
+        """
+        if divisor == 0:
+            raise ZeroDivisionError("division by zero")
+        negative = (dividend < 0) != (divisor < 0)
+        dividend, divisor = abs(dividend), abs(divisor)
+
+        if context.scale is not None:
+            exp = context.scale
+        else:
+            # The quotient terminates after max(twos, fives) decimals when the reduced
+            # divisor is 2**twos * 5**fives; otherwise it is rounded at ``precision``.
+            reduced = divisor // gcd(dividend, divisor)
+            twos = (reduced & -reduced).bit_length() - 1
+            reduced >>= twos
+            fives = 0
+            while reduced % 5 == 0:
+                reduced //= 5
+                fives += 1
+            exp = max(twos, fives, min(precision, 1))
+            if reduced != 1 or exp > precision:
+                exp = precision
+
+        value, remainder = _int_divmod(dividend * context.pow10(exp), divisor)
+        value = _round_quotient(value, remainder, divisor, negative, context.rounding)
+        return (-value if negative else value), exp
+
     def __truediv__(self, number2, number1=None):
         """
         Divide with fixed-point precision.
@@ -68,44 +633,24 @@ class FixedPointArithmetic:
 
         Returns:
             str: String representation of the decimal result
+                (FixedPointArithmetic or FixedPointExpression outside "str" mode)
         """
-
-        if number1 is None:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                self.number1, number2
-            )
-        else:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                number1, number2
+        if self.mode == "lazy":
+            return FixedPointExpression(
+                "/", self if number1 is None else number1, number2
             )
-
-        remainder = 0
-        answer = ""
-        negative = False
-        if string_number2.startswith("-"):
-            negative = not negative
-        if string_number1.startswith("-"):
-            negative = not negative
-
-        string_number2 = int(string_number2.lstrip("-"))
-
-        for i in string_number1.lstrip("-"):
-            remainder += int(i)
-            answer += str(remainder // string_number2)
-            remainder %= string_number2
-            remainder *= 10
-        answer += "."
-        for _ in range(self.precision):
-            answer += str(remainder // string_number2)
-            remainder = remainder % string_number2
-            remainder *= 10
-            if remainder == 0:
-                break
-
-        return "-" + answer.lstrip("0") if negative else answer.lstrip("0")
+        context = getcontext()
+        value1, value2, _ = self._operands(number2, number1, context)
+        value, exp = self._divide(value1, value2, self.precision, context)
+        if self.mode != "str":
+            return self._from_scaled(value, exp, self.mode, self._precision)
+        answer = self._to_string(abs(value), exp).lstrip("0")
+        if exp == 0:
+            answer += "."
+        return "-" + answer if (value1 < 0) != (value2 < 0) else answer
 
     def __rtruediv__(self, number2):
-        return self.__truediv__(self.number1, number2)
+        return self.__truediv__(self, number2)
 
     def __add__(self, number2):
         """Addition with fixed-point precision.
@@ -115,14 +660,13 @@ class FixedPointArithmetic:
 
         Returns:
             str: String representation of the decimal result
+                (FixedPointArithmetic or FixedPointExpression outside "str" mode)
         """
-        string_number1, string_number2, imprecision = self._generate_string_numbers(
-            self.number1, number2
-        )
-        answer = int(string_number1) + int(string_number2)
-        # Compensate
-        answer = self._compensate(answer, imprecision)
-        return answer
+        if self.mode == "lazy":
+            return FixedPointExpression("+", self, number2)
+        context = getcontext()
+        value1, value2, exp = self._operands(number2, None, context)
+        return self._result(value1 + value2, exp, context)
 
     def __radd__(self, number2):
         return self.__add__(number2)
@@ -136,22 +680,18 @@ class FixedPointArithmetic:
 
         Returns:
             str: String representation of the decimal result
+                (FixedPointArithmetic or FixedPointExpression outside "str" mode)
         """
-        if number1 is None:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                self.number1, number2
-            )
-        else:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                number1, number2
+        if self.mode == "lazy":
+            return FixedPointExpression(
+                "-", self if number1 is None else number1, number2
             )
-        answer = int(string_number1) - int(string_number2)
-        # Compensate
-        answer = self._compensate(answer, imprecision)
-        return answer
+        context = getcontext()
+        value1, value2, exp = self._operands(number2, number1, context)
+        return self._result(value1 - value2, exp, context)
 
     def __rsub__(self, number2):
-        return self.__sub__(self.number1, number2)
+        return self.__sub__(self, number2)
 
     def __mul__(self, number2):
         """Multiplication with fixed-point precision.
@@ -161,95 +701,407 @@ class FixedPointArithmetic:
 
         Returns:
             str: String representation of the decimal result
+                (FixedPointArithmetic or FixedPointExpression outside "str" mode)
         """
-        string_number1, string_number2, imprecision = self._generate_string_numbers(
-            self.number1, number2
-        )
-        answer = int(string_number1) * int(string_number2)
-        # Compensate
-        answer = self._compensate(answer, imprecision * 2).rstrip("0")
-        if answer.endswith("."):
-            answer += "0"
-        return answer
+        if self.mode == "lazy":
+            return FixedPointExpression("*", self, number2)
+        value2, exp2 = self._parse(number2)
+        value, exp = self._int * value2, self._exp + exp2
+        while exp > 1 and value % 10 == 0:
+            value //= 10
+            exp -= 1
+        return self._result(value, exp, getcontext())
 
     def __rmul__(self, number2):
         return self.__mul__(number2)
 
     def __le__(self, number2, number1=None):
-        if number1 is None:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                self.number1, number2
-            )
-        else:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                number1, number2
-            )
-        answer = int(string_number1) <= int(string_number2)
-        return answer
+        value1, value2, _ = self._operands(number2, number1)
+        return value1 <= value2
 
     def __rle__(self, number2):
-        return self.__le__(self.number1, number2)
+        return self.__le__(self, number2)
 
     def __ge__(self, number2, number1=None):
-        if number1 is None:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                self.number1, number2
-            )
-        else:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                number1, number2
-            )
-        answer = int(string_number1) >= int(string_number2)
-        return answer
+        value1, value2, _ = self._operands(number2, number1)
+        return value1 >= value2
 
     def __rge__(self, number2):
-        return self.__ge__(self.number1, number2)
+        return self.__ge__(self, number2)
 
     def __lt__(self, number2, number1=None):
-        if number1 is None:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                self.number1, number2
-            )
-        else:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                number1, number2
-            )
-        answer = int(string_number1) < int(string_number2)
-        return answer
+        value1, value2, _ = self._operands(number2, number1)
+        return value1 < value2
 
     def __rlt__(self, number2):
-        return self.__lt__(self.number1, number2)
+        return self.__lt__(self, number2)
 
     def __gt__(self, number2, number1=None):
-        if number1 is None:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                self.number1, number2
-            )
-        else:
-            string_number1, string_number2, imprecision = self._generate_string_numbers(
-                number1, number2
-            )
-        answer = int(string_number1) > int(string_number2)
-        return answer
+        value1, value2, _ = self._operands(number2, number1)
+        return value1 > value2
 
     def __rgt__(self, number2):
-        return self.__gt__(self.number1, number2)
+        return self.__gt__(self, number2)
 
-    def __eq__(self, number2):
-        string_number1, string_number2, imprecision = self._generate_string_numbers(
-            self.number1, number2
-        )
-        answer = int(string_number1) == int(string_number2)
-        return answer
+    def __eq__(self, number2, number1=None):
+        try:
+            value1, value2, _ = self._operands(number2, number1)
+        except (TypeError, ValueError):
+            return NotImplemented
+        return value1 == value2
 
     def __req__(self, number2):
-        return self.__eq__(self.number1, number2)
+        return self.__eq__(self, number2)
 
     def __ne__(self, number2):
-        return not self.__eq__(number2)
+        answer = self.__eq__(number2)
+        return answer if answer is NotImplemented else not answer
 
     def __rne__(self, number2):
-        return not self.__eq__(self.number1, number2)
+        return not self.__eq__(self, number2)
+
+    def __hash__(self):
+        # Floats compare through their repr, so FPT("0.1") == 0.1. Integral values
+        # hash as ints; others as their nearest float, which is the float they equal
+        # if any, so "1.50", "1.5" and 1.5 share a hash. Values too large for a float
+        # equal none and hash like Fraction(self._int, 10**self._exp). The hash
+        # follows the value, which assigning number1 changes: don't reassign an
+        # instance used as a set member or dict key
+        if self._exp <= 0:
+            return hash(self._int * 10**-self._exp)
+        if self._int % 10**self._exp == 0:
+            return hash(self._int // 10**self._exp)
+        try:
+            return hash(float(self))
+        except OverflowError:
+            pass
+        answer = abs(self._int) % _HASH_MODULUS
+        answer = answer * pow(_HASH_INV10, self._exp, _HASH_MODULUS) % _HASH_MODULUS
+        if self._int < 0:
+            answer = -answer
+        return -2 if answer == -1 else answer
+
+    @property
+    def sort_key(self):
+        """A key that orders instances by value without aligning them to each other.
+
+        The key is ``(floor, fraction_digits)``: the integer part rounded down and the
+        digits of the remaining fraction with trailing zeros removed, which compare
+        correctly as strings. Equal values have equal keys whatever their scale, and
+        the key is computed once per value, so
+        ``sorted(prices, key=operator.attrgetter("sort_key"))`` compares plain tuples.
+        """
+        if self._sort_key is None:
+            if self._exp <= 0:
+                self._sort_key = (self._int * 10**-self._exp, "")
+            else:
+                floor, remainder = divmod(self._int, 10**self._exp)
+                digits = str(remainder).rjust(self._exp, "0").rstrip("0")
+                self._sort_key = (floor, digits)
+        return self._sort_key
+
+
+class FixedPointExpression:
+    """
+    A deferred tree of ``+ - * /`` operations over fixed-point values.
+
+    Created by the operators of a FixedPointArithmetic in ``"lazy"`` mode. Nothing is
+    computed until ``evaluate()`` is called: sums are aligned to a common scale once per
+    chain of additions, products are exact, and divisions are only carried out (and
+    rounded according to the current FixedPointContext) at the very end.
+    """
+
+    __slots__ = ("op", "left", "right", "precision")
+
+    def __init__(self, op, left, right):
+        # Like the eager operators, take the precision of the operand whose operator
+        # built this node: the left one, or the right one for reflected operators
+        lazy = (FixedPointArithmetic, FixedPointExpression)
+        owner = left if isinstance(left, lazy) else right
+        self.op = op
+        self.left = self._operand(left)
+        self.right = self._operand(right)
+        if isinstance(owner, FixedPointExpression):
+            self.precision = owner.precision
+        else:
+            self.precision = getattr(owner, "_precision", None)
+
+    @staticmethod
+    def _operand(number):
+        if isinstance(number, (FixedPointArithmetic, FixedPointExpression)):
+            return number
+        return FixedPointArithmetic(number)
+
+    def __add__(self, number2):
+        return FixedPointExpression("+", self, number2)
+
+    def __radd__(self, number2):
+        return FixedPointExpression("+", number2, self)
+
+    def __sub__(self, number2):
+        return FixedPointExpression("-", self, number2)
+
+    def __rsub__(self, number2):
+        return FixedPointExpression("-", number2, self)
+
+    def __mul__(self, number2):
+        return FixedPointExpression("*", self, number2)
+
+    def __rmul__(self, number2):
+        return FixedPointExpression("*", number2, self)
+
+    def __truediv__(self, number2):
+        return FixedPointExpression("/", self, number2)
+
+    def __rtruediv__(self, number2):
+        return FixedPointExpression("/", number2, self)
+
+    def _flatten(self):
+        """Collect the operands of the chain of same-precedence operations rooted here.
+
+        Returns:
+            list: (inverted, operand) pairs; ``inverted`` marks subtracted terms or divisors
+        """
+        additive = self.op in "+-"
+        operands = []
+        stack = [(self, False)]
+        while stack:
+            node, inverted = stack.pop()
+            if isinstance(node, FixedPointExpression) and (node.op in "+-") == additive:
+                stack.append((node.right, inverted != (node.op in "-/")))
+                stack.append((node.left, inverted))
+            else:
+                operands.append((inverted, node))
+        return operands
+
+    @classmethod
+    def _evaluate(cls, node, pow10):
+        """Evaluate a node exactly.
+
+        Args:
+            node (FixedPointArithmetic, FixedPointExpression): Node to evaluate
+            pow10 (callable): Returns powers of ten, normally FixedPointContext.pow10
+
+        Returns:
+            tuple: (numerator, exponent, denominator) such that the value is
+                numerator / (10**exponent * denominator)
+        """
+        if isinstance(node, FixedPointArithmetic):
+            return node._int, node._exp, 1
+
+        operands = [
+            (inverted, cls._evaluate(operand, pow10))
+            for inverted, operand in node._flatten()
+        ]
+        if node.op in "+-":
+            exp = max(term[1] for _, term in operands)
+            denominator = 1
+            for _, (_, _, term_denominator) in operands:
+                denominator *= term_denominator // gcd(denominator, term_denominator)
+            total = 0
+            for inverted, (value, term_exp, term_denominator) in operands:
+                value *= pow10(exp - term_exp) * (denominator // term_denominator)
+                total += -value if inverted else value
+            return total, exp, denominator
+
+        value, exp, denominator = 1, 0, 1
+        for inverted, (factor, factor_exp, factor_denominator) in operands:
+            if not inverted:
+                value *= factor
+                exp += factor_exp
+                denominator *= factor_denominator
+            elif factor == 0:
+                raise ZeroDivisionError("division by zero")
+            else:
+                value *= factor_denominator * pow10(factor_exp)
+                if factor < 0:
+                    value = -value
+                denominator *= abs(factor)
+        return value, exp, denominator
+
+    def evaluate(self):
+        """Evaluate the expression.
+
+        Returns:
+            FixedPointArithmetic: The result, in ``"fpt"`` mode
+        """
+        context = getcontext()
+        precision = context.precision if self.precision is None else self.precision
+        value, exp, denominator = self._evaluate(self, context.pow10)
+        if denominator != 1:
+            value, exp = FixedPointArithmetic._divide(
+                value, denominator * context.pow10(exp), precision, context
+            )
+        elif context.scale is not None:
+            value, exp = FixedPointArithmetic._quantize(value, exp, context)
+        elif exp == 0:
+            value, exp = value * 10, 1
+        return FixedPointArithmetic._from_scaled(value, exp, "fpt", self.precision)
+
+    def __str__(self):
+        return str(self.evaluate())
+
+    def __format__(self, format_spec):
+        return format(self.evaluate(), format_spec)
+
+    def __repr__(self):
+        return f"FixedPointExpression({self.left!r} {self.op} {self.right!r})"
+
+
+class DecimalAccumulator:
+    """
+    Exact running sum of fixed-point values.
+
+    The total is kept as a single integer scaled to the widest number of decimals seen
+    so far, so adding a value costs one parse and one integer addition no matter how
+    long the total has grown. Partial sums (for example from worker processes) can be
+    combined exactly with ``merge()``.
+
+    Args:
+        numbers (iterable, optional): Numbers to add straight away
+    """
+
+    def __init__(self, numbers=()):
+        self._total = 0
+        self._exp = 0
+        self.count = 0
+        self.extend(numbers)
+
+    def add(self, number):
+        """Add one number.
+
+        Args:
+            number (str, int, float, FixedPointArithmetic): Number to add
+
+        Returns:
+            DecimalAccumulator: This accumulator
+        """
+        value, exp = FixedPointArithmetic._parse(number)
+        if exp > self._exp:
+            self._total *= getcontext().pow10(exp - self._exp)
+            self._exp = exp
+        elif exp < self._exp:
+            value *= getcontext().pow10(self._exp - exp)
+        self._total += value
+        self.count += 1
+        return self
+
+    def extend(self, numbers):
+        """Add every number from an iterable, consuming it lazily.
+
+        Args:
+            numbers (iterable): Numbers to add (a generator is read one item at a time)
+
+        Returns:
+            DecimalAccumulator: This accumulator
+        """
+        parse = FixedPointArithmetic._parse
+        pow10 = getcontext().pow10
+        total, total_exp, count = self._total, self._exp, self.count
+        for number in numbers:
+            value, exp = parse(number)
+            if exp > total_exp:
+                total *= pow10(exp - total_exp)
+                total_exp = exp
+            elif exp < total_exp:
+                value *= pow10(total_exp - exp)
+            total += value
+            count += 1
+        self._total, self._exp, self.count = total, total_exp, count
+        return self
+
+    def merge(self, other):
+        """Add the total of another accumulator.
+
+        Args:
+            other (DecimalAccumulator): Partial sum to combine with this one
+
+        Returns:
+            DecimalAccumulator: This accumulator
+        """
+        count = self.count
+        self.add(other.result())
+        self.count = count + other.count
+        return self
+
+    def __iadd__(self, number):
+        return self.add(number)
+
+    def result(self):
+        """Return the total.
+
+        Returns:
+            FixedPointArithmetic: The exact sum, with the widest scale seen
+        """
+        return FixedPointArithmetic._from_scaled(self._total, self._exp)
+
+    def __repr__(self):
+        return f"DecimalAccumulator(total={self.result()}, count={self.count})"
+
+
+def _aligned(numbers):
+    """Parse numbers and scale them all to the widest exponent among them.
+
+    Returns:
+        tuple: (list of numbers, list of scaled integers, exponent)
+    """
+    numbers = list(numbers)
+    parsed = [FixedPointArithmetic._parse(number) for number in numbers]
+    exp = max((item[1] for item in parsed), default=0)
+    pow10 = getcontext().pow10
+    values = [value * pow10(exp - item_exp) for value, item_exp in parsed]
+    return numbers, values, exp
+
+
+def argsort_decimals(numbers, reverse=False):
+    """Return the indices that would sort a collection of numbers by value.
+
+    The collection is aligned to one scale once, so the sort compares plain integers.
+    The sort is stable; equal values keep their order (also when ``reverse`` is set).
+
+    Args:
+        numbers (iterable): Numbers (str, int, float, FixedPointArithmetic) to order
+        reverse (bool, optional): Sort from largest to smallest
+
+    Returns:
+        list: Indices into ``numbers``
+    """
+    _, values, _ = _aligned(numbers)
+    return sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+
+
+def sort_decimals(numbers, reverse=False):
+    """Sort a collection of numbers by value.
+
+    Args:
+        numbers (iterable): Numbers (str, int, float, FixedPointArithmetic) to sort
+        reverse (bool, optional): Sort from largest to smallest
+
+    Returns:
+        list: The original items, in order of value
+    """
+    numbers, values, _ = _aligned(numbers)
+    order = sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+    return [numbers[index] for index in order]
+
+
+def unique_decimals(numbers):
+    """Return the distinct values of a collection of numbers, smallest first.
+
+    Values that are numerically equal ("1.50" and "1.5") count as one; the first
+    occurrence is the one returned.
+
+    Args:
+        numbers (iterable): Numbers (str, int, float, FixedPointArithmetic) to dedupe
+
+    Returns:
+        list: One original item per distinct value, in order of value
+    """
+    numbers, values, _ = _aligned(numbers)
+    first = {}
+    for index, value in enumerate(values):
+        first.setdefault(value, index)
+    return [numbers[first[value]] for value in sorted(first)]
 
 
 # Alias for backward compatibility
@@ -0,0 +1,110 @@
+from operator import itemgetter
+
+try:
+    from .geometry import shapes_overlap
+except ImportError:
+    from geometry import shapes_overlap
+
+# Endpoint kinds; starts sort before ends at the same coordinate so touching counts
+_START, _END = 0, 1
+_ENDPOINT_ORDER = itemgetter(0, 1)
+
+
+class SweepAndPrune:
+    """
+    Broad-phase collision detection over Rectangles and Triangles.
+
+    The x extents of all shapes' bounding boxes are kept as one sorted list of
+    endpoints. ``pairs()`` refreshes the endpoints from the shapes' current positions
+    and restores the order, which takes close to linear time when shapes move a
+    little between frames, then sweeps the list once: only shapes whose x extents
+    overlap are compared at all, and only those whose bounding boxes also overlap in
+    y are handed to the exact separating-axis test.
+
+    Args:
+        shapes (iterable, optional): Shapes to add straight away
+    """
+
+    def __init__(self, shapes=()):
+        self._endpoints = []
+        self._entries = {}
+        for shape in shapes:
+            self.add(shape)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, shape):
+        return id(shape) in self._entries
+
+    def add(self, shape):
+        """Add a shape (anything with ``get_points()`` and ``get_aabb()``).
+
+        Args:
+            shape (Rectangle, Triangle): Shape to track
+        """
+        key = id(shape)
+        if key in self._entries:
+            return
+        min_x, _, max_x, _ = shape.get_aabb()
+        start, end = [min_x, _START, key], [max_x, _END, key]
+        self._entries[key] = (shape, start, end)
+        # New endpoints go to the back; the next sort moves them into place
+        self._endpoints += (start, end)
+
+    def remove(self, shape):
+        """Stop tracking a shape.
+
+        Args:
+            shape (Rectangle, Triangle): Shape to remove
+
+        Raises:
+            KeyError: If the shape is not tracked
+        """
+        _, start, end = self._entries.pop(id(shape))
+        self._endpoints = [
+            endpoint
+            for endpoint in self._endpoints
+            if endpoint is not start and endpoint is not end
+        ]
+
+    def _refresh(self):
+        """Move every endpoint to its shape's position and restore the sorted order."""
+        y_extents = {}
+        for key, (shape, start, end) in self._entries.items():
+            min_x, min_y, max_x, max_y = shape.get_aabb()
+            start[0], end[0] = min_x, max_x
+            y_extents[key] = (min_y, max_y, shape)
+
+        # The list stays sorted from the last call, so Timsort only has to merge the
+        # few runs that moving shapes broke up: close to linear for a coherent frame
+        self._endpoints.sort(key=_ENDPOINT_ORDER)
+        return y_extents
+
+    def candidate_pairs(self):
+        """Return the pairs of shapes whose bounding boxes overlap.
+
+        Returns:
+            list: Tuples ``(shape1, shape2)``
+        """
+        y_extents = self._refresh()
+        active = {}
+        pairs = []
+        for _, kind, key in self._endpoints:
+            if kind == _END:
+                del active[key]
+                continue
+            min_y, max_y, shape = y_extents[key]
+            for other_min_y, other_max_y, other in active.values():
+                if other_min_y <= max_y and min_y <= other_max_y:
+                    pairs.append((other, shape))
+            active[key] = y_extents[key]
+        return pairs
+
+    def pairs(self):
+        """Return every pair of overlapping shapes (touching counts).
+
+        Returns:
+            list: Tuples ``(shape1, shape2)``, each pair once
+        """
+        return [pair for pair in self.candidate_pairs() if shapes_overlap(*pair)]
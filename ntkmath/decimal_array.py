@@ -0,0 +1,402 @@
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .adv_decimal import (
+        ROUND_05UP,
+        ROUND_CEILING,
+        ROUND_DOWN,
+        ROUND_FLOOR,
+        ROUND_HALF_EVEN,
+        ROUND_HALF_UP,
+        ROUND_UP,
+        FixedPointArithmetic,
+        _round_quotient,
+        getcontext,
+    )
+except ImportError:
+    from adv_decimal import (
+        ROUND_05UP,
+        ROUND_CEILING,
+        ROUND_DOWN,
+        ROUND_FLOOR,
+        ROUND_HALF_EVEN,
+        ROUND_HALF_UP,
+        ROUND_UP,
+        FixedPointArithmetic,
+        _round_quotient,
+        getcontext,
+    )
+
+_INT64_MAX = 2**63 - 1
+
+
+def _store(values):
+    """Store a list of Python ints as int64 when they fit, as Python ints otherwise."""
+    if np is None:
+        return values
+    if not values or max(-min(values), max(values)) <= _INT64_MAX:
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=object)
+
+
+def _is_int64(data):
+    return np is not None and isinstance(data, np.ndarray) and data.dtype != object
+
+
+def _max_abs(data):
+    """Largest magnitude in the data (or of a scalar), as a Python int."""
+    if isinstance(data, int):
+        return abs(data)
+    if len(data) == 0:
+        return 0
+    if np is not None:
+        return max(-int(data.min()), int(data.max()))
+    return max(-min(data), max(data))
+
+
+def _abs(data):
+    if isinstance(data, int):
+        return abs(data)
+    if np is None:
+        return [abs(value) for value in data]
+    return np.abs(data)
+
+
+def _any(data):
+    if isinstance(data, bool) or np is None:
+        return any(data) if isinstance(data, list) else data
+    return bool(data.any())
+
+
+def _widen(data):
+    """Switch int64 storage to Python ints so that results can grow past 64 bits."""
+    return data.astype(object) if _is_int64(data) else data
+
+
+def _fit(bound, *operands):
+    """Widen array operands whose result could reach ``bound`` in magnitude."""
+    if bound < _INT64_MAX:
+        return operands
+    return tuple(
+        operand if isinstance(operand, int) else _widen(operand) for operand in operands
+    )
+
+
+def _apply(op, data1, data2):
+    """Apply a binary operator elementwise, broadcasting scalars."""
+    if np is not None or (isinstance(data1, int) and isinstance(data2, int)):
+        return op(data1, data2)
+    if isinstance(data1, int):
+        return [op(data1, value2) for value2 in data2]
+    if isinstance(data2, int):
+        return [op(value1, data2) for value1 in data1]
+    return [op(value1, value2) for value1, value2 in zip(data1, data2)]
+
+
+def _round_magnitudes(quotient, remainder, divisor, negative, rounding):
+    """Vectorized ``_round_quotient`` over arrays of non-negative quotients."""
+    if np is None:
+        if isinstance(divisor, int):
+            divisor = [divisor] * len(quotient)
+        if isinstance(negative, bool):
+            negative = [negative] * len(quotient)
+        return [
+            _round_quotient(*items, rounding)
+            for items in zip(quotient, remainder, divisor, negative)
+        ]
+    if rounding == ROUND_DOWN:
+        return quotient
+    inexact = remainder != 0
+    if rounding == ROUND_UP:
+        up = inexact
+    elif rounding == ROUND_CEILING:
+        up = inexact & ~negative
+    elif rounding == ROUND_FLOOR:
+        up = inexact & negative
+    elif rounding == ROUND_05UP:
+        up = inexact & (quotient % 5 == 0)
+    else:
+        # remainder > divisor - remainder avoids overflowing 2 * remainder in int64
+        rest = divisor - remainder
+        up = remainder > rest
+        tie = remainder == rest
+        if rounding == ROUND_HALF_UP:
+            up = up | tie
+        elif rounding == ROUND_HALF_EVEN:
+            up = up | (tie & (quotient % 2 == 1))
+    return quotient + up.astype(quotient.dtype)
+
+
+class DecimalArray:
+    """
+    A column of fixed-point values stored as scaled integers sharing one scale.
+
+    Values are held as NumPy int64 when they all fit, and as Python ints (a NumPy
+    object array, or a list without NumPy) otherwise; results switch to Python ints
+    automatically whenever they could overflow. Arithmetic is elementwise and
+    broadcasts scalars, with the same exactness as FixedPointArithmetic: ``+ - *``
+    are exact, and ``/`` rounds to the context's scale (or precision) with the
+    context's rounding mode. Comparisons return boolean masks.
+
+    Args:
+        values (iterable): Numbers accepted by FixedPointArithmetic
+        scale (int, optional): Number of decimals to store. Defaults to the largest
+            number of decimals among the values; values with more decimals are rounded
+            with the context's rounding mode.
+    """
+
+    def __init__(self, values, scale=None):
+        if isinstance(values, DecimalArray):
+            data, exp = values._data, values.scale
+            data = data.copy() if np is not None else list(data)
+        else:
+            parsed = [FixedPointArithmetic._parse(value) for value in values]
+            exp = max((value_exp for _, value_exp in parsed), default=0)
+            context = getcontext()
+            data = _store(
+                [value * context.pow10(exp - value_exp) for value, value_exp in parsed]
+            )
+        self._data = data
+        self.scale = exp
+        if scale is not None and scale != exp:
+            self._data = self.rescale(scale)._data
+            self.scale = scale
+
+    @classmethod
+    def from_scaled(cls, data, scale):
+        """Build an array directly from scaled integers.
+
+        Args:
+            data (sequence): Integers, each the value times ``10**scale``
+            scale (int): Number of decimals the integers carry
+
+        Returns:
+            DecimalArray: The array, sharing ``data`` when it is already a NumPy array
+        """
+        result = cls.__new__(cls)
+        if np is not None and isinstance(data, np.ndarray) and data.dtype.kind in "iO":
+            result._data = (
+                data if data.dtype in (np.int64, object) else data.astype(np.int64)
+            )
+        else:
+            result._data = _store([int(value) for value in data])
+        result.scale = scale
+        return result
+
+    @property
+    def scaled(self):
+        """The underlying scaled integers (NumPy array, or list without NumPy)."""
+        return self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.from_scaled(self._data[index], self.scale)
+        return FixedPointArithmetic._from_scaled(int(self._data[index]), self.scale)
+
+    def __iter__(self):
+        for value in self._data:
+            yield FixedPointArithmetic._from_scaled(int(value), self.scale)
+
+    def to_strings(self):
+        """Render every value with exactly ``scale`` decimals.
+
+        Returns:
+            list: One string per value
+        """
+        to_string = FixedPointArithmetic._to_string
+        return [to_string(int(value), self.scale) for value in self._data]
+
+    def __repr__(self):
+        return f"DecimalArray([{', '.join(self.to_strings())}], scale={self.scale})"
+
+    def sum(self):
+        """Exact sum of the values.
+
+        Returns:
+            FixedPointArithmetic: The total
+        """
+        data = self._data
+        if _is_int64(data) and _max_abs(data) * len(data) < _INT64_MAX:
+            total = int(data.sum())
+        else:
+            total = int(sum(_widen(data)))
+        return FixedPointArithmetic._from_scaled(total, self.scale)
+
+    def rescale(self, scale):
+        """Return the values with a different number of decimals.
+
+        Decimals that are dropped are rounded with the context's rounding mode.
+
+        Args:
+            scale (int): New number of decimals
+
+        Returns:
+            DecimalArray: The rescaled array
+        """
+        context = getcontext()
+        if scale >= self.scale:
+            factor = context.pow10(scale - self.scale)
+            (data,) = _fit(_max_abs(self._data) * factor, self._data)
+            return self.from_scaled(_apply(operator.mul, data, factor), scale)
+        return self.from_scaled(
+            self._divide(self._data, context.pow10(self.scale - scale), context),
+            scale,
+        )
+
+    @staticmethod
+    def _divide(numerator, denominator, context):
+        """Divide scaled integers elementwise, rounding with the context's mode."""
+        negative = _apply(
+            operator.ne,
+            _apply(operator.lt, numerator, 0),
+            _apply(operator.lt, denominator, 0),
+        )
+        magnitude1, magnitude2 = _abs(numerator), _abs(denominator)
+        quotient = _apply(operator.floordiv, magnitude1, magnitude2)
+        remainder = _apply(operator.mod, magnitude1, magnitude2)
+        quotient = _round_magnitudes(
+            quotient, remainder, magnitude2, negative, context.rounding
+        )
+        if np is None:
+            return [
+                -value if sign else value for value, sign in zip(quotient, negative)
+            ]
+        return np.where(negative, -quotient, quotient)
+
+    def _operand(self, other):
+        """Return (data, scale) for an array or scalar operand."""
+        if isinstance(other, DecimalArray):
+            if len(other) != len(self):
+                raise ValueError(
+                    f"operands have different lengths: {len(self)} and {len(other)}"
+                )
+            return other._data, other.scale
+        return FixedPointArithmetic._parse(other)
+
+    def _aligned(self, other, context):
+        """Return both operands' data at their common scale."""
+        data1, scale1 = self._data, self.scale
+        data2, scale2 = self._operand(other)
+        scale = max(scale1, scale2)
+        factor1 = context.pow10(scale - scale1)
+        factor2 = context.pow10(scale - scale2)
+        if factor1 != 1:
+            (data1,) = _fit(_max_abs(data1) * factor1, data1)
+            data1 = _apply(operator.mul, data1, factor1)
+        if factor2 != 1:
+            (data2,) = _fit(_max_abs(data2) * factor2, data2)
+            data2 = _apply(operator.mul, data2, factor2)
+        return data1, data2, scale
+
+    def _result(self, data, scale, context):
+        result = self.from_scaled(data, scale)
+        if context.scale is not None and context.scale != scale:
+            return result.rescale(context.scale)
+        return result
+
+    def _additive(self, op, other, reflected=False):
+        context = getcontext()
+        data1, data2, scale = self._aligned(other, context)
+        data1, data2 = _fit(_max_abs(data1) + _max_abs(data2), data1, data2)
+        if reflected:
+            data1, data2 = data2, data1
+        return self._result(_apply(op, data1, data2), scale, context)
+
+    def __add__(self, other):
+        return self._additive(operator.add, other)
+
+    def __radd__(self, other):
+        return self._additive(operator.add, other, reflected=True)
+
+    def __sub__(self, other):
+        return self._additive(operator.sub, other)
+
+    def __rsub__(self, other):
+        return self._additive(operator.sub, other, reflected=True)
+
+    def __mul__(self, other):
+        context = getcontext()
+        data2, scale2 = self._operand(other)
+        data1, data2 = _fit(_max_abs(self._data) * _max_abs(data2), self._data, data2)
+        return self._result(
+            _apply(operator.mul, data1, data2), self.scale + scale2, context
+        )
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __neg__(self):
+        return self.from_scaled(_apply(operator.sub, 0, self._data), self.scale)
+
+    def divide(self, other, scale=None, reflected=False):
+        """Divide elementwise, rounding each quotient to a fixed number of decimals.
+
+        Args:
+            other (DecimalArray, str, int, float, FixedPointArithmetic): Divisor
+            scale (int, optional): Decimals of the result. Defaults to the context's
+                scale, or its precision when no scale is set.
+            reflected (bool, optional): Divide ``other`` by this array instead
+
+        Returns:
+            DecimalArray: The quotients
+        """
+        context = getcontext()
+        if scale is None:
+            scale = context.precision if context.scale is None else context.scale
+        data1, scale1 = self._data, self.scale
+        data2, scale2 = self._operand(other)
+        if reflected:
+            data1, scale1, data2, scale2 = data2, scale2, data1, scale1
+        if _any(_apply(operator.eq, data2, 0)):
+            raise ZeroDivisionError("division by zero")
+        # value1 / value2 at ``scale`` == data1 * 10**(scale + scale2 - scale1) / data2
+        shift = scale + scale2 - scale1
+        if shift >= 0:
+            factor = context.pow10(shift)
+            bound = _max_abs(data1) * factor + 1
+            data1, data2 = _fit(bound, data1, data2)
+            numerator, denominator = _apply(operator.mul, data1, factor), data2
+        else:
+            factor = context.pow10(-shift)
+            data1, data2 = _fit(_max_abs(data2) * factor + 1, data1, data2)
+            numerator, denominator = data1, _apply(operator.mul, data2, factor)
+        return self.from_scaled(self._divide(numerator, denominator, context), scale)
+
+    def __truediv__(self, other):
+        return self.divide(other)
+
+    def __rtruediv__(self, other):
+        return self.divide(other, reflected=True)
+
+    def _compare(self, op, other):
+        context = getcontext()
+        data1, data2, _ = self._aligned(other, context)
+        return _apply(op, data1, data2)
+
+    def __eq__(self, other):
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other):
+        return self._compare(operator.ne, other)
+
+    def __lt__(self, other):
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other):
+        return self._compare(operator.le, other)
+
+    def __gt__(self, other):
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other):
+        return self._compare(operator.ge, other)
+
+    __hash__ = None
@@ -0,0 +1,383 @@
+import os
+import warnings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .adv_decimal import FixedPointArithmetic, _round_quotient, getcontext
+    from .decimal_array import DecimalArray
+except ImportError:
+    from adv_decimal import FixedPointArithmetic, _round_quotient, getcontext
+    from decimal_array import DecimalArray
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# Fields with more significant digits than this are parsed as Python ints
+_INT64_DIGITS = 18
+# Longer fields are parsed individually instead of widening the character matrix
+_MAX_FIELD_WIDTH = 40
+
+if np is not None:
+    _INT64_POWERS = np.array([10**i for i in range(_INT64_DIGITS + 1)], dtype=np.int64)
+
+
+def _iter_chunks(source, block_size):
+    """Yield bytes chunks of whole lines (each ending with a newline) from a source."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as stream:
+            yield from _iter_chunks(stream, block_size)
+        return
+
+    if hasattr(source, "read"):
+        carry, pending = b"", b""
+        while True:
+            data = source.read(block_size)
+            if not data:
+                break
+            if pending:
+                yield pending
+            data = carry + data
+            cut = data.rfind(b"\n") + 1
+            pending, carry = data[:cut], data[cut:]
+        # An unterminated last line joins the final block rather than forming its own
+        if carry:
+            pending += carry + b"\n"
+        if pending:
+            yield pending
+        return
+
+    # Any buffer, including bytes and mmap.mmap; only one block is copied at a time
+    view = memoryview(source).cast("B")
+    position, size = 0, len(view)
+    while position < size:
+        data = bytes(view[position : position + block_size])
+        cut = data.rfind(b"\n") + 1
+        if not cut and position + len(data) < size:
+            # A line longer than the block: keep reading until its end
+            end = position + len(data)
+            while not cut and end < size:
+                data += bytes(view[end : end + block_size])
+                end += block_size
+                cut = data.rfind(b"\n") + 1
+        if not cut:
+            yield data + b"\n"
+            return
+        yield data[:cut]
+        position += cut
+
+
+def _align(value, exp, scale, context):
+    """Align a parsed scaled integer to ``scale`` decimals, rounding with the context."""
+    if exp <= scale:
+        return value * context.pow10(scale - exp)
+    divisor = context.pow10(exp - scale)
+    quotient, remainder = divmod(abs(value), divisor)
+    quotient = _round_quotient(
+        quotient, remainder, divisor, value < 0, context.rounding
+    )
+    return -quotient if value < 0 else quotient
+
+
+def _finish(fast_values, slow_indices, slow_parsed, scale, context):
+    """Merge individually parsed fields into the vectorized results."""
+    slow_values = [_align(value, exp, scale, context) for value, exp in slow_parsed]
+    if slow_values and max(map(abs, slow_values)) > 2**63 - 1:
+        fast_values = fast_values.astype(object)
+    fast_values[slow_indices] = slow_values
+    return fast_values
+
+
+def _parse_chunk_python(chunk, column, delimiter, scale, context):
+    """Parse one chunk field by field (used when NumPy is not installed)."""
+    parsed = []
+    for line in chunk.split(b"\n"):
+        line = line.rstrip(b"\r")
+        if not line:
+            continue
+        fields = line.split(delimiter)
+        if column >= len(fields):
+            raise ValueError(f"line has no column {column}: {line!r}")
+        parsed.append(FixedPointArithmetic._parse(fields[column].decode("ascii")))
+    if scale is None:
+        scale = max((exp for _, exp in parsed), default=0)
+    return [_align(value, exp, scale, context) for value, exp in parsed], scale
+
+
+def _field_bounds(buffer, column, delimiter):
+    """Return start and end offsets of one column on every non-blank line."""
+    line_ends = np.flatnonzero(buffer == 10)
+    line_starts = np.empty_like(line_ends)
+    line_starts[0] = 0
+    line_starts[1:] = line_ends[:-1] + 1
+    has_return = (line_ends > line_starts) & (buffer[line_ends - 1] == 13)
+    line_ends = line_ends - has_return
+    keep = line_ends > line_starts
+    line_starts, line_ends = line_starts[keep], line_ends[keep]
+
+    delimiters = np.flatnonzero(buffer == delimiter[0])
+    first = np.searchsorted(delimiters, line_starts)
+    padded = np.append(delimiters, len(buffer))
+    if column == 0:
+        starts = line_starts
+    else:
+        before = padded[np.minimum(first + column - 1, len(delimiters))]
+        if np.any(before >= line_ends):
+            raise ValueError(f"some lines have no column {column}")
+        starts = before + 1
+    after = padded[np.minimum(first + column, len(delimiters))]
+    ends = np.minimum(after, line_ends)
+    if np.any(ends <= starts):
+        raise ValueError("empty decimal field")
+    return starts, ends
+
+
+def _parse_plain(buffer, starts, ends, scale):
+    """Parse fields that are all plain ``[sign]digits[.digits]`` in bulk.
+
+    The decimal points are deleted from the whole block at once and NumPy parses the
+    remaining integers in C; each integer is then scaled by the decimals its field was
+    missing, which is the padding rule of ``_generate_string_numbers``.
+
+    Returns:
+        tuple: (scaled integers as a NumPy array, scale), or None when some field
+            needs the general parser
+    """
+    count = len(starts)
+    lengths = ends - starts
+    if len(buffer) != int(lengths.sum()) + count or np.any(buffer[ends] != 10):
+        # Gather the column into its own buffer, one field per line
+        spans = lengths + 1
+        offsets = np.cumsum(spans) - spans
+        buffer = buffer[
+            np.arange(int(spans.sum())) - np.repeat(offsets - starts, spans)
+        ]
+        buffer[offsets + lengths] = 10
+        starts, ends = offsets, offsets + lengths
+    text = buffer.tobytes()
+    if text.translate(None, b"0123456789.-+ \t\r\n"):
+        return None
+    last = buffer[ends - 1]
+    if np.any(((last < 48) | (last > 57)) & (last != 46)):
+        return None
+
+    dots = np.append(np.flatnonzero(buffer == 46), len(buffer))
+    first = np.searchsorted(dots, starts)
+    has_dot = dots[first] < ends
+    if np.any(dots[np.minimum(first + 1, len(dots) - 1)] < ends):
+        return None
+    fraction_digits = np.where(has_dot, ends - dots[first] - 1, 0)
+    if scale is None:
+        scale = int(fraction_digits.max())
+    padding = scale - fraction_digits
+    if np.any(padding < 0) or np.any(lengths - has_dot + padding > _INT64_DIGITS):
+        return None
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text.translate(None, b"."), dtype=np.int64, sep="\n")
+        except (ValueError, DeprecationWarning):
+            return None
+    if len(values) != count:
+        return None
+    return values * _INT64_POWERS[padding], scale
+
+
+def _parse_fields(buffer, starts, ends, scale, context):
+    """Parse decimal fields of a byte buffer into scaled integers.
+
+    Blocks of plain numbers go through ``_parse_plain``. Otherwise the fields are
+    laid out as rows of a character matrix and every digit is weighted by its
+    distance from the decimal point, which applies the padding rule of
+    ``_generate_string_numbers`` (missing decimals count as zeros) to all fields at
+    once without building a string per field. Fields using syntax the vectorized
+    path does not cover (exponents, misplaced signs, ...) or with too many digits for
+    int64 are parsed individually.
+
+    Returns:
+        tuple: (scaled integers as a NumPy array, scale)
+    """
+    plain = _parse_plain(buffer, starts, ends, scale)
+    if plain is not None:
+        return plain
+
+    lengths = ends - starts
+    width = int(min(lengths.max(), _MAX_FIELD_WIDTH))
+    columns = np.arange(width)
+    index = np.minimum(starts[:, None] + columns, len(buffer) - 1)
+    chars = np.where(columns < lengths[:, None], buffer[index], np.uint8(32))
+
+    is_digit = (chars - np.uint8(48)) < 10
+    is_dot = chars == 46
+    is_minus = chars == 45
+    is_sign = is_minus | (chars == 43)
+    is_space = (chars == 32) | (chars == 9) | (chars == 13)
+    is_number = is_digit | is_dot | is_sign
+    number_seen = np.cumsum(is_number, axis=1, dtype=np.int8)
+    number_total = number_seen[:, -1:]
+    dots_seen = np.cumsum(is_dot, axis=1, dtype=np.int8)
+
+    digits = is_digit.sum(axis=1)
+    whole_digits = (is_digit & (dots_seen == 0)).sum(axis=1)
+    fraction_digits = digits - whole_digits
+    slow = (
+        (lengths > width)
+        | ~(is_number | is_space).all(axis=1)
+        | (dots_seen[:, -1] > 1)
+        | (is_sign.sum(axis=1) > 1)
+        | (is_sign & (number_seen > 1)).any(axis=1)
+        | (is_space & (number_seen > 0) & (number_seen < number_total)).any(axis=1)
+        | (digits == 0)
+    )
+
+    def parse_slow(indices):
+        return [
+            FixedPointArithmetic._parse(
+                buffer[starts[index] : ends[index]].tobytes().decode("ascii")
+            )
+            for index in indices
+        ]
+
+    slow_indices = np.flatnonzero(slow)
+    slow_parsed = parse_slow(slow_indices)
+    if scale is None:
+        scale = max(
+            int(fraction_digits[~slow].max(initial=0)),
+            max((exp for _, exp in slow_parsed), default=0),
+        )
+
+    wide = ~slow & ((fraction_digits > scale) | (whole_digits + scale > _INT64_DIGITS))
+    if wide.any():
+        wide_indices = np.flatnonzero(wide)
+        slow_parsed += parse_slow(wide_indices)
+        slow_indices = np.concatenate([slow_indices, wide_indices])
+        slow |= wide
+
+    # Column of the decimal point, or just past the last digit when there is none
+    point = np.where(
+        dots_seen[:, -1] > 0,
+        is_dot.argmax(axis=1),
+        (number_seen == number_total).argmax(axis=1) + 1,
+    )
+    exponent = point[:, None] - columns + (scale - (columns < point[:, None]))
+    weights = _INT64_POWERS[np.clip(exponent, 0, _INT64_DIGITS)]
+    values = np.where(is_digit, (chars - np.uint8(48)) * weights, 0).sum(axis=1)
+    values[slow] = 0
+    values = np.where(is_minus.any(axis=1), -values, values)
+    if len(slow_indices):
+        values = _finish(values, slow_indices, slow_parsed, scale, context)
+    return values, scale
+
+
+def read_decimal_column(
+    source,
+    column=0,
+    delimiter=",",
+    scale=None,
+    skip_rows=0,
+    block_size=DEFAULT_BLOCK_SIZE,
+):
+    """Stream a column of decimal text into blocks of scaled integers.
+
+    The source is read ``block_size`` bytes at a time, so files of any size can be
+    processed in constant memory. Blank lines are ignored; quoted fields are not
+    supported.
+
+    Args:
+        source (str, os.PathLike, file, buffer): Path, binary file object, or any buffer
+            such as bytes or an ``mmap.mmap``
+        column (int, optional): Zero-based column to read. Defaults to 0.
+        delimiter (str, optional): Single-character column separator. Defaults to ",".
+        scale (int, optional): Decimals of every block. Defaults to the widest number
+            of decimals within each block. Extra decimals are rounded with the
+            context's rounding mode.
+        skip_rows (int, optional): Number of leading lines to skip, such as a header.
+        block_size (int, optional): Bytes to read per block.
+
+    Yields:
+        DecimalArray: One block of values sharing one scale
+    """
+    delimiter = delimiter.encode("ascii")
+    if len(delimiter) != 1:
+        raise ValueError("delimiter must be a single character")
+    context = getcontext()
+    for chunk in _iter_chunks(source, block_size):
+        while skip_rows and chunk:
+            cut = chunk.find(b"\n") + 1
+            chunk = chunk[cut:]
+            skip_rows -= 1
+        if not chunk.strip():
+            continue
+        if np is None:
+            values, block_scale = _parse_chunk_python(
+                chunk, column, delimiter, scale, context
+            )
+        else:
+            buffer = np.frombuffer(chunk, dtype=np.uint8)
+            starts, ends = _field_bounds(buffer, column, delimiter)
+            values, block_scale = _parse_fields(buffer, starts, ends, scale, context)
+        yield DecimalArray.from_scaled(values, block_scale)
+
+
+def format_decimal_block(array, newline="\n"):
+    """Format every value of an array, one per line, in a single formatting pass.
+
+    Args:
+        array (DecimalArray): Values to format
+        newline (str, optional): Line terminator. Defaults to "\\n".
+
+    Returns:
+        str: The values with exactly ``array.scale`` decimals, each followed by ``newline``
+    """
+    count, scale = len(array), array.scale
+    if not count:
+        return ""
+    data = array.scaled
+    if scale == 0:
+        return newline.join(str(int(value)) for value in data) + newline
+    factor = getcontext().pow10(scale)
+    if np is None:
+        items = []
+        for value in data:
+            whole, fraction = divmod(abs(value), factor)
+            items += ("-" if value < 0 else "", whole, fraction)
+    else:
+        if data.dtype != object and factor > 2**63 - 1:
+            data = data.astype(object)
+        magnitude = np.abs(data)
+        items = np.empty(3 * count, dtype=object)
+        items[0::3] = np.where(data < 0, "-", "")
+        items[1::3] = magnitude // factor
+        items[2::3] = magnitude % factor
+        items = items.tolist()
+    template = f"%s%d.%0{scale}d{newline}"
+    return (template * count) % tuple(items)
+
+
+def write_decimal_column(destination, blocks, newline="\n"):
+    """Write decimal values, one per line, in bulk.
+
+    Args:
+        destination (str, os.PathLike, file): Path, or a binary or text file object
+        blocks (DecimalArray, iterable): An array or an iterable of arrays, such as
+            the blocks produced by ``read_decimal_column``
+        newline (str, optional): Line terminator. Defaults to "\\n".
+
+    Returns:
+        int: Number of values written
+    """
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "wb") as stream:
+            return write_decimal_column(stream, blocks, newline)
+    if isinstance(blocks, DecimalArray):
+        blocks = (blocks,)
+    binary = not hasattr(destination, "encoding")
+    written = 0
+    for block in blocks:
+        text = format_decimal_block(block, newline)
+        destination.write(text.encode("ascii") if binary else text)
+        written += len(block)
+    return written
@@ -0,0 +1,223 @@
+import operator
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .adv_decimal import FixedPointArithmetic, getcontext
+    from .decimal_array import DecimalArray
+except ImportError:
+    from adv_decimal import FixedPointArithmetic, getcontext
+    from decimal_array import DecimalArray
+
+_INT64_MAX = 2**63 - 1
+
+# Inputs shorter than this are never split across processes
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def _is_int64(values):
+    return np is not None and isinstance(values, np.ndarray) and values.dtype != object
+
+
+def _largest(values):
+    """Largest magnitude in a row, as a Python int."""
+    if not len(values):
+        return 0
+    if _is_int64(values):
+        return max(-int(values.min()), int(values.max()))
+    return max(-min(values), max(values))
+
+
+def _as_lists(rows):
+    """Rows as lists of Python ints, for the exact pure-Python kernels."""
+    return [row.tolist() if _is_int64(row) else row for row in rows]
+
+
+def _scaled_rows(rows):
+    """Parse rows of numbers and scale them all to one shared exponent.
+
+    DecimalArray rows stored as int64 stay int64 arrays (as long as rescaling them
+    cannot overflow), so that the NumPy kernels use them without conversion.
+
+    Args:
+        rows (iterable): Rows, each a sequence of numbers or a DecimalArray
+
+    Returns:
+        tuple: (list of rows of scaled integers, each an int64 array or a list of
+            ints, exponent, largest magnitude)
+    """
+    parsed = []
+    for row in rows:
+        if isinstance(row, DecimalArray):
+            data = row.scaled
+            values = data if _is_int64(data) else list(data)
+            parsed.append((values, row.scale))
+        else:
+            items = [FixedPointArithmetic._parse(value) for value in row]
+            exp = max((item_exp for _, item_exp in items), default=0)
+            pow10 = getcontext().pow10
+            values = [value * pow10(exp - item_exp) for value, item_exp in items]
+            parsed.append((values, exp))
+
+    exp = max((row_exp for _, row_exp in parsed), default=0)
+    pow10 = getcontext().pow10
+    scaled, largest = [], 0
+    for values, row_exp in parsed:
+        row_largest = _largest(values)
+        if row_exp != exp:
+            factor = pow10(exp - row_exp)
+            row_largest *= factor
+            if _is_int64(values) and row_largest <= _INT64_MAX:
+                values = values * factor
+            else:
+                values = [value * factor for value in _as_lists([values])[0]]
+        largest = max(largest, row_largest)
+        scaled.append(values)
+    return scaled, exp, largest
+
+
+def _dot_chunk(pair):
+    """Exact dot product of two lists of ints (run in worker processes)."""
+    values1, values2 = pair
+    return sum(map(operator.mul, values1, values2))
+
+
+def _matmul_chunk(job):
+    """Exact product of some rows of the left matrix with the right matrix's columns."""
+    rows, columns = job
+    return [[sum(map(operator.mul, row, column)) for column in columns] for row in rows]
+
+
+def _chunks(length, chunk_size):
+    return [(start, start + chunk_size) for start in range(0, length, chunk_size)]
+
+
+def _fits_int64(largest1, largest2, terms):
+    """Whether NumPy can add up ``terms`` products in int64 without overflowing."""
+    return (
+        np is not None
+        and max(largest1, largest2) <= _INT64_MAX
+        and largest1 * largest2 * terms < _INT64_MAX
+    )
+
+
+def _finish(total, exp):
+    """Round a raw total to the context's scale, if it has one."""
+    context = getcontext()
+    if context.scale is not None:
+        total, exp = FixedPointArithmetic._quantize(total, exp, context)
+    return total, exp
+
+
+def dot(values1, values2, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Exact dot product of two vectors of fixed-point values.
+
+    Every product is taken between raw scaled integers and summed without rounding;
+    the total is rescaled once at the end (to the context's scale if it has one,
+    otherwise it keeps the sum of both inputs' decimals).
+
+    Args:
+        values1 (sequence, DecimalArray): First vector, e.g. quantities
+        values2 (sequence, DecimalArray): Second vector, e.g. prices
+        workers (int, optional): Split vectors longer than ``chunk_size`` across a pool
+            of this many processes; the partial sums are combined exactly
+        chunk_size (int, optional): Number of terms per process task
+
+    Returns:
+        FixedPointArithmetic: The dot product
+    """
+    (scaled1,), exp1, largest1 = _scaled_rows([values1])
+    (scaled2,), exp2, largest2 = _scaled_rows([values2])
+    if len(scaled1) != len(scaled2):
+        raise ValueError(f"length mismatch: {len(scaled1)} and {len(scaled2)}")
+
+    if workers and len(scaled1) > chunk_size:
+        scaled1, scaled2 = _as_lists([scaled1, scaled2])
+        jobs = [
+            (scaled1[start:stop], scaled2[start:stop])
+            for start, stop in _chunks(len(scaled1), chunk_size)
+        ]
+        with ProcessPoolExecutor(workers) as executor:
+            total = sum(executor.map(_dot_chunk, jobs))
+    elif _fits_int64(largest1, largest2, len(scaled1)):
+        total = int(
+            np.dot(
+                np.asarray(scaled1, dtype=np.int64), np.asarray(scaled2, dtype=np.int64)
+            )
+        )
+    else:
+        total = _dot_chunk(_as_lists([scaled1, scaled2]))
+
+    total, exp = _finish(total, exp1 + exp2)
+    return FixedPointArithmetic._from_scaled(total, exp)
+
+
+def matmul(matrix1, matrix2, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Exact matrix product of two matrices of fixed-point values.
+
+    Args:
+        matrix1 (sequence): Left matrix as rows (sequences of numbers or DecimalArrays)
+        matrix2 (sequence): Right matrix as rows
+        workers (int, optional): Spread the rows of the result across a pool of this
+            many processes when the product has more than ``chunk_size`` terms
+        chunk_size (int, optional): Approximate number of terms per process task
+
+    Returns:
+        list: Rows of the product, each a DecimalArray
+    """
+    rows, exp1, largest1 = _scaled_rows(matrix1)
+    columns, exp2, largest2 = _scaled_rows(matrix2)
+    inner = len(columns)
+    if any(len(row) != inner for row in rows):
+        raise ValueError(f"every row of the left matrix needs {inner} values")
+    width = len(columns[0]) if columns else 0
+    if any(len(column) != width for column in columns):
+        raise ValueError("rows of the right matrix differ in length")
+
+    terms = len(rows) * inner * width
+    if workers and terms > chunk_size:
+        rows = _as_lists(rows)
+        columns = [list(column) for column in zip(*_as_lists(columns))]
+        step = max(1, chunk_size // max(1, inner * width))
+        jobs = [(rows[start:stop], columns) for start, stop in _chunks(len(rows), step)]
+        with ProcessPoolExecutor(workers) as executor:
+            product = [
+                row for chunk in executor.map(_matmul_chunk, jobs) for row in chunk
+            ]
+    elif _fits_int64(largest1, largest2, inner):
+        product = np.asarray(rows, dtype=np.int64).reshape(
+            len(rows), inner
+        ) @ np.asarray(columns, dtype=np.int64).reshape(inner, width)
+    else:
+        columns = [list(column) for column in zip(*_as_lists(columns))]
+        product = _matmul_chunk((_as_lists(rows), columns))
+
+    scale = getcontext().scale
+    result = []
+    for row in product:
+        array = DecimalArray.from_scaled(row, exp1 + exp2)
+        result.append(array if scale is None else array.rescale(scale))
+    return result
+
+
+def weighted_sum(vectors, weights, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Exact weighted sum of vectors: ``sum(weight * vector)``, elementwise.
+
+    Args:
+        vectors (sequence): Vectors of equal length (sequences of numbers or
+            DecimalArrays), e.g. one price series per instrument
+        weights (sequence, DecimalArray): One weight per vector
+        workers (int, optional): See ``matmul()``
+        chunk_size (int, optional): See ``matmul()``
+
+    Returns:
+        DecimalArray: The combined vector
+    """
+    vectors = list(vectors)
+    if len(weights) != len(vectors):
+        raise ValueError(f"{len(weights)} weights for {len(vectors)} vectors")
+    return matmul([weights], vectors, workers, chunk_size)[0]
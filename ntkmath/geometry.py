@@ -1,5 +1,10 @@
 from math import sin, asin, cos, radians, sqrt
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 try:
     from .general import sign
 except ImportError:
@@ -7,6 +12,8 @@ except ImportError:
 
 
 class Point:
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -41,6 +48,9 @@ class Point:
 
 
 class Rectangle:
+    # Assigning any of these clears the cached corners and bounding box
+    _GEOMETRY_FIELDS = frozenset(("x", "y", "width", "height", "rotation"))
+
     def __init__(self, x=0, y=0, width=0, height=0, rotation=0):
         self.x = x
         self.y = y
@@ -48,36 +58,90 @@ class Rectangle:
         self.height = height
         self.rotation = rotation
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in self._GEOMETRY_FIELDS:
+            cache = self.__dict__
+            cache["_corners"] = None
+            cache["_aabb"] = None
+            if name == "rotation":
+                cache["_sin_cos"] = None
+
     def get_area(self):
         """Get the area of the rectangle."""
         return self.width * self.height
 
+    def get_sin_cos(self):
+        """Get the sine and cosine of the rotation.
+
+        Cached until ``rotation`` is assigned again.
+
+        Returns:
+            tuple: (sin, cos) of the rotation angle
+        """
+        sin_cos = self._sin_cos
+        if sin_cos is None:
+            sin_cos = self._sin_cos = Angle.sin_cos(self.rotation)
+        return sin_cos
+
     def get_points(self):
         """Get 4 corner points of a rectangle, accounting for rotation.
 
+        The corners are cached until one of ``x``, ``y``, ``width``, ``height`` or
+        ``rotation`` is assigned again, so the same Points are returned until then
+        (treat them as read-only).
+
         Returns:
             tuple: Four Point objects representing the corners (a, b, c, d)
                   where a is origin, b is origin+width, c is opposite corner, d is origin+height
         """
-        # Starting point (origin)
-        a = Point(self.x, self.y)
+        corners = self._corners
+        if corners is None:
+            sin_a, cos_a = self.get_sin_cos()
 
-        # Convert rotation to radians
-        rad_angle = radians(Angle.normalize(self.rotation))
+            # Starting point (origin)
+            a = Point(self.x, self.y)
 
-        # Width vector (along rotation angle)
-        width_vector = Line(rad_angle, self.width)
-        b = a.offset(width_vector.x, width_vector.y)
+            # Width vector (along rotation angle)
+            width_x, width_y = self.width * cos_a, self.width * sin_a
+            b = a.offset(width_x, width_y)
 
-        # Height vector (perpendicular to width, 90 degrees rotated)
-        height_angle = rad_angle + radians(90)  # Add 90 degrees for perpendicular
-        height_vector = Line(height_angle, self.height)
-        d = a.offset(height_vector.x, height_vector.y)
+            # Height vector (perpendicular to width, 90 degrees rotated)
+            height_x, height_y = -self.height * sin_a, self.height * cos_a
+            d = a.offset(height_x, height_y)
 
-        # Opposite corner (origin + width + height)
-        c = d.offset(width_vector.x, width_vector.y)
+            # Opposite corner (origin + width + height)
+            c = d.offset(width_x, width_y)
 
-        return a, b, c, d
+            corners = self._corners = (a, b, c, d)
+        return corners
+
+    def get_aabb(self):
+        """Get the axis-aligned bounding box of the rotated rectangle.
+
+        Cached like the corners.
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y)
+        """
+        aabb = self._aabb
+        if aabb is None:
+            points = self.get_points()
+            xs = [point.x for point in points]
+            ys = [point.y for point in points]
+            aabb = self._aabb = (min(xs), min(ys), max(xs), max(ys))
+        return aabb
+
+    def overlaps(self, other):
+        """Check if this rectangle overlaps a Rectangle or Triangle (touching counts).
+
+        Args:
+            other (Rectangle, Triangle): Shape to test against, rotation included
+
+        Returns:
+            bool: True if the shapes share at least one point
+        """
+        return shapes_overlap(self, other)
 
     def get_rel_point_rect(self, x, y):
         """Get relative point in a rectangle given absolute coordinates, compensating for rotation.
@@ -97,14 +161,10 @@ class Rectangle:
         if self.rotation == 0:
             return dx, dy
 
-        # Apply inverse rotation to get relative coordinates
-        rad_angle = radians(Angle.normalize(self.rotation))
-        cos_a = cos(-rad_angle)  # Negative angle for inverse rotation
-        sin_a = sin(-rad_angle)
-
-        # Apply 2D rotation matrix (inverse rotation)
-        rel_x = dx * cos_a - dy * sin_a
-        rel_y = dx * sin_a + dy * cos_a
+        # Apply the inverse rotation (by -angle) to get relative coordinates
+        sin_a, cos_a = self.get_sin_cos()
+        rel_x = dx * cos_a + dy * sin_a
+        rel_y = dy * cos_a - dx * sin_a
 
         return rel_x, rel_y
 
@@ -119,18 +179,60 @@ class Rectangle:
         Returns:
             bool: True if point is inside the rectangle
         """
-        hit = (int(x), int(y))
-        a, b, c, d = self.get_points()
+        return self.contains_point(int(x), int(y))
 
-        rect_area = self.get_area()
+    def contains_point(self, x, y):
+        """Check if a point is inside the rectangle (edges included), accounting for rotation.
 
-        area_apd = Triangle(a, hit, d).get_area()
-        area_dpc = Triangle(d, hit, c).get_area()
-        area_cpb = Triangle(c, hit, b).get_area()
-        area_pba = Triangle(hit, b, a).get_area()
+        Unlike ``point_in_rectangle``, the coordinates are used as given rather than
+        truncated to integers. The point is moved into the rectangle's frame (the math of
+        ``get_rel_point_rect``) and compared against its sides, without creating any
+        objects; unrotated rectangles skip the trigonometry altogether.
 
-        # If the sum of the areas of the triangles equals the rectangle area, the point is inside
-        return sum((area_apd, area_dpc, area_cpb, area_pba)) <= rect_area
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+
+        Returns:
+            bool: True if point is inside the rectangle
+        """
+        dx = x - self.x
+        dy = y - self.y
+        if self.rotation != 0:
+            sin_a, cos_a = self.get_sin_cos()
+            dx, dy = dx * cos_a + dy * sin_a, dy * cos_a - dx * sin_a
+        width, height = self.width, self.height
+        return (0 <= dx <= width or width <= dx <= 0) and (
+            0 <= dy <= height or height <= dy <= 0
+        )
+
+    def contains_points(self, xs, ys=None):
+        """Check many points against the rectangle at once.
+
+        The inverse rotation is worked out once for the whole batch; the bounds check
+        then runs over the coordinate arrays.
+
+        Args:
+            xs (sequence, PointArray): X coordinates, or a PointArray holding both
+            ys (sequence, optional): Y coordinates (omitted for a PointArray)
+
+        Returns:
+            numpy.ndarray: Boolean mask, True where the point is inside (edges included);
+                a list of bools without NumPy
+        """
+        if ys is None:
+            xs, ys = xs.x, xs.y
+        if np is None:
+            return list(map(self.contains_point, xs, ys))
+
+        dx = np.asarray(xs, dtype=np.float64) - self.x
+        dy = np.asarray(ys, dtype=np.float64) - self.y
+        if self.rotation != 0:
+            sin_a, cos_a = self.get_sin_cos()
+            dx, dy = dx * cos_a + dy * sin_a, dy * cos_a - dx * sin_a
+        low_x, high_x = sorted((0, self.width))
+        low_y, high_y = sorted((0, self.height))
+        return (dx >= low_x) & (dx <= high_x) & (dy >= low_y) & (dy <= high_y)
 
 
 class Triangle:
@@ -145,18 +247,305 @@ class Triangle:
         Returns:
             float: Area of the triangle
         """
-        return (
-            abs(
-                (self.b[0] * self.a[1] - self.a[0] * self.b[1])
-                + (
-                    self.c[0] * self.b[1]
-                    - self.b[0] * self.c[1]
-                    + self.a[0] * self.c[1]
-                    - self.c[0] * self.a[1]
-                )
-            )
-            / 2
+        (ax, ay), (bx, by), (cx, cy) = self.a, self.b, self.c
+        return abs((bx * ay - ax * by) + (cx * by - bx * cy + ax * cy - cx * ay)) / 2
+
+    def get_points(self):
+        """Get the 3 corner points of the triangle.
+
+        Returns:
+            tuple: The points (a, b, c) as given
+        """
+        return self.a, self.b, self.c
+
+    def get_aabb(self):
+        """Get the axis-aligned bounding box of the triangle.
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y)
+        """
+        xs = (self.a[0], self.b[0], self.c[0])
+        ys = (self.a[1], self.b[1], self.c[1])
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def overlaps(self, other):
+        """Check if this triangle overlaps a Rectangle or Triangle (touching counts).
+
+        Args:
+            other (Rectangle, Triangle): Shape to test against
+
+        Returns:
+            bool: True if the shapes share at least one point
+        """
+        return shapes_overlap(self, other)
+
+
+class Polygon:
+    """
+    A simple polygon given by its vertices in order (either orientation).
+
+    The vertices and an edge table (start and end of every edge) are built once when
+    the polygon is created and reused by every query; the batched point test keeps a
+    NumPy copy of the edge table, with each edge's extent, after its first call.
+    Treat a Polygon as fixed, and create a new one to change its shape.
+
+    Args:
+        points (iterable): Vertices as Points, (x, y) pairs or a PointArray
+    """
+
+    def __init__(self, points):
+        vertices = tuple((float(point[0]), float(point[1])) for point in points)
+        if len(vertices) < 3:
+            raise ValueError("a polygon needs at least 3 vertices")
+        self.vertices = vertices
+        self._edges = tuple(
+            (x0, y0, x1, y1)
+            for (x0, y0), (x1, y1) in zip(vertices, vertices[1:] + vertices[:1])
         )
+        self._edge_arrays = None
+
+    @classmethod
+    def convex_hull(cls, points):
+        """Build the convex hull of a set of points (Andrew's monotone chain, O(n log n)).
+
+        Args:
+            points (iterable): Points, (x, y) pairs, a PointArray or an (N, 2) array
+
+        Returns:
+            Polygon: The hull, counter-clockwise in the usual y-up orientation, without
+                collinear points
+        """
+        if hasattr(points, "x") and not isinstance(points, Point):
+            coordinates = zip(points.x.tolist(), points.y.tolist())
+        elif np is not None and isinstance(points, np.ndarray):
+            coordinates = map(tuple, points.tolist())
+        else:
+            coordinates = ((point[0], point[1]) for point in points)
+        unique = sorted(set(coordinates))
+        if len(unique) < 3:
+            raise ValueError("a convex hull needs at least 3 distinct points")
+
+        def half(chain_points):
+            chain = []
+            for x, y in chain_points:
+                while len(chain) >= 2:
+                    (x0, y0), (x1, y1) = chain[-2], chain[-1]
+                    if (x1 - x0) * (y - y0) - (y1 - y0) * (x - x0) > 0:
+                        break
+                    chain.pop()
+                chain.append((x, y))
+            return chain
+
+        lower = half(unique)
+        upper = half(reversed(unique))
+        hull = lower[:-1] + upper[:-1]
+        if len(hull) < 3:
+            raise ValueError("the points are collinear")
+        return cls(hull)
+
+    def get_points(self):
+        """Get the vertices as Point objects."""
+        return [Point(x, y) for x, y in self.vertices]
+
+    def get_signed_area(self):
+        """Get the area, positive for counter-clockwise vertices (y up)."""
+        return sum(x0 * y1 - x1 * y0 for x0, y0, x1, y1 in self._edges) / 2
+
+    def get_area(self):
+        """Get the area of the polygon (shoelace formula)."""
+        return abs(self.get_signed_area())
+
+    def get_centroid(self):
+        """Get the centroid (center of mass) of the polygon's area.
+
+        Returns:
+            Point: The centroid (the vertex average for a polygon without area)
+        """
+        twice_area = 0.0
+        sum_x = sum_y = 0.0
+        for x0, y0, x1, y1 in self._edges:
+            cross = x0 * y1 - x1 * y0
+            twice_area += cross
+            sum_x += (x0 + x1) * cross
+            sum_y += (y0 + y1) * cross
+        if twice_area == 0:
+            count = len(self.vertices)
+            return Point(
+                sum(x for x, _ in self.vertices) / count,
+                sum(y for _, y in self.vertices) / count,
+            )
+        return Point(sum_x / (3 * twice_area), sum_y / (3 * twice_area))
+
+    def get_aabb(self):
+        """Get the axis-aligned bounding box of the polygon.
+
+        Returns:
+            tuple: (min_x, min_y, max_x, max_y)
+        """
+        xs = [x for x, _ in self.vertices]
+        ys = [y for _, y in self.vertices]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def contains_point(self, x, y):
+        """Check if a point is inside the polygon (edges included).
+
+        Uses the winding number, so self-overlapping regions count as inside.
+
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+
+        Returns:
+            bool: True if the point is inside or on the boundary
+        """
+        winding = 0
+        for x0, y0, x1, y1 in self._edges:
+            cross = (x1 - x0) * (y - y0) - (x - x0) * (y1 - y0)
+            if y0 <= y:
+                if y1 > y and cross > 0:
+                    winding += 1
+            elif y1 <= y and cross < 0:
+                winding -= 1
+            if (
+                cross == 0
+                and (x0 <= x <= x1 or x1 <= x <= x0)
+                and (y0 <= y <= y1 or y1 <= y <= y0)
+            ):
+                return True
+        return winding != 0
+
+    def contains_points(self, xs, ys):
+        """Check many points against the polygon at once.
+
+        Args:
+            xs (sequence): X coordinates
+            ys (sequence): Y coordinates
+
+        Returns:
+            numpy.ndarray: Boolean mask, True where the point is inside or on the
+                boundary; a list of bools without NumPy
+        """
+        if np is None:
+            return list(map(self.contains_point, xs, ys))
+        if self._edge_arrays is None:
+            x0, y0, x1, y1 = np.array(self._edges).T
+            self._edge_arrays = (
+                x0,
+                y0,
+                x1,
+                y1,
+                np.minimum(x0, x1),
+                np.maximum(x0, x1),
+                np.minimum(y0, y1),
+                np.maximum(y0, y1),
+            )
+        x0, y0, x1, y1, min_x, max_x, min_y, max_y = self._edge_arrays
+        xs = np.asarray(xs, dtype=np.float64).ravel()
+        ys = np.asarray(ys, dtype=np.float64).ravel()
+        result = np.empty(len(xs), dtype=bool)
+
+        # Points against all edges at once, in chunks of about a million pairs
+        chunk = max(1, (1 << 20) // len(x0))
+        for start in range(0, len(xs), chunk):
+            px = xs[start : start + chunk, None]
+            py = ys[start : start + chunk, None]
+            cross = (x1 - x0) * (py - y0) - (px - x0) * (y1 - y0)
+            below = y0 <= py
+            winding = (below & (y1 > py) & (cross > 0)).sum(axis=1) - (
+                ~below & (y1 <= py) & (cross < 0)
+            ).sum(axis=1)
+            boundary = (
+                (cross == 0)
+                & (min_x <= px)
+                & (px <= max_x)
+                & (min_y <= py)
+                & (py <= max_y)
+            ).any(axis=1)
+            result[start : start + chunk] = (winding != 0) | boundary
+        return result
+
+    def __len__(self):
+        return len(self.vertices)
+
+    def __repr__(self):
+        return f"Polygon({list(self.vertices)})"
+
+
+def _separating_axes(shape, points):
+    """Edge normals of a shape, the candidate separating axes."""
+    if isinstance(shape, Rectangle):
+        # Opposite sides are parallel, so two axes cover all four edges
+        sin_a, cos_a = shape.get_sin_cos()
+        return ((cos_a, sin_a), (-sin_a, cos_a))
+    return [
+        (start[1] - end[1], end[0] - start[0])
+        for start, end in zip(points, points[1:] + points[:1])
+    ]
+
+
+def shapes_overlap(shape1, shape2):
+    """Exact separating-axis overlap test between two convex shapes.
+
+    Two convex shapes are disjoint exactly when some edge normal of one of them
+    separates their projections, so only those axes need checking. Shapes that only
+    touch along an edge or at a corner count as overlapping.
+
+    Args:
+        shape1 (Rectangle, Triangle): First shape (rotation included)
+        shape2 (Rectangle, Triangle): Second shape
+
+    Returns:
+        bool: True if the shapes share at least one point
+    """
+    points1 = [(point[0], point[1]) for point in shape1.get_points()]
+    points2 = [(point[0], point[1]) for point in shape2.get_points()]
+    for shape, points in ((shape1, points1), (shape2, points2)):
+        for axis_x, axis_y in _separating_axes(shape, points):
+            projections1 = [x * axis_x + y * axis_y for x, y in points1]
+            projections2 = [x * axis_x + y * axis_y for x, y in points2]
+            if max(projections1) < min(projections2) or max(projections2) < min(
+                projections1
+            ):
+                return False
+    return True
+
+
+# Angles (in degrees) with an entry in the sin/cos table: every multiple of this
+_TABLE_STEP = 0.25
+
+
+def _build_sin_cos_table():
+    """Tabulate (sin, cos) for every multiple of _TABLE_STEP in [0, 360).
+
+    Only the first octant is computed; every other entry is the same pair of numbers
+    with roles and signs swapped, so the symmetries hold exactly (sin(a + 90) is
+    cos(a), and the axes give exact zeros and ones). 30 and 45 degrees are pinned to
+    their correctly rounded values.
+    """
+    steps = round(45 / _TABLE_STEP)
+    octant = []
+    for step in range(steps + 1):
+        angle = radians(step * _TABLE_STEP)
+        octant.append((sin(angle), cos(angle)))
+    octant[round(30 / _TABLE_STEP)] = (0.5, octant[round(30 / _TABLE_STEP)][1])
+    octant[steps] = (sqrt(0.5), sqrt(0.5))
+
+    quadrant = octant + [(c, s) for s, c in reversed(octant[:-1])]
+    quadrant[-1] = (1.0, 0.0)
+    quadrant.pop()  # 90 degrees starts the next quadrant
+    table = {}
+    for index, (s, c) in enumerate(quadrant):
+        angle = index * _TABLE_STEP
+        # 0.0 - x rather than -x, so that the axes get 0.0 and not -0.0
+        table[angle] = (s, c)
+        table[angle + 90] = (c, 0.0 - s)
+        table[angle + 180] = (0.0 - s, 0.0 - c)
+        table[angle + 270] = (0.0 - c, s)
+    return table
+
+
+_SIN_COS_TABLE = _build_sin_cos_table()
+_sin_cos_arrays = None
 
 
 class Angle:
@@ -165,12 +554,233 @@ class Angle:
         """Normalize angle to be within [0, 360) degrees."""
         return (360 + angle) % 360
 
+    @staticmethod
+    def sin_cos(degrees):
+        """Get the sine and cosine of an angle in one call.
+
+        Whole degrees and quarter degrees come from a lookup table whose values are
+        exact at 0, 90, 180 and 270 and exactly symmetric between quadrants; other
+        angles are computed.
+
+        Args:
+            degrees (float): Angle in degrees
+
+        Returns:
+            tuple: (sin, cos) of the angle
+        """
+        angle = (360 + degrees) % 360
+        pair = _SIN_COS_TABLE.get(angle)
+        if pair is None:
+            rad_angle = radians(angle)
+            pair = (sin(rad_angle), cos(rad_angle))
+        return pair
+
+    @staticmethod
+    def sin_cos_array(degrees):
+        """Get the sines and cosines of many angles, with the same values as ``sin_cos``.
+
+        Args:
+            degrees (sequence): Angles in degrees
+
+        Returns:
+            tuple: (sines, cosines) as NumPy arrays (lists without NumPy)
+        """
+        global _sin_cos_arrays
+        if np is None:
+            pairs = [Angle.sin_cos(angle) for angle in degrees]
+            return [s for s, _ in pairs], [c for _, c in pairs]
+
+        angles = (360 + np.asarray(degrees, dtype=np.float64)) % 360
+        rad_angles = np.radians(angles)
+        sines, cosines = np.sin(rad_angles), np.cos(rad_angles)
+        if _sin_cos_arrays is None:
+            keys = sorted(_SIN_COS_TABLE)
+            _sin_cos_arrays = (
+                np.array([_SIN_COS_TABLE[key][0] for key in keys]),
+                np.array([_SIN_COS_TABLE[key][1] for key in keys]),
+            )
+        steps = angles / _TABLE_STEP
+        tabulated = steps == np.floor(steps)
+        index = steps[tabulated].astype(np.intp)
+        sines[tabulated] = _sin_cos_arrays[0][index]
+        cosines[tabulated] = _sin_cos_arrays[1][index]
+        return sines, cosines
+
     @staticmethod
     def to_radians(degrees):
         """Convert angle to radians."""
         return radians(degrees)
 
 
+class Transform:
+    """
+    Immutable 2D affine transform (a 3x3 matrix with last row 0, 0, 1).
+
+    A point (x, y) maps to ``(a * x + c * y + tx, b * x + d * y + ty)``. Transforms
+    compose with ``@`` like matrices: ``(outer @ inner).apply(p)`` is
+    ``outer.apply(inner.apply(p))``, so a child widget's world transform is
+    ``parent_world @ child_local`` and can be cached until an ancestor changes.
+    Rotations use the same convention (degrees) and trig table as Rectangle.
+
+    Args:
+        a (float, optional): Matrix entry row 0, column 0
+        b (float, optional): Matrix entry row 1, column 0
+        c (float, optional): Matrix entry row 0, column 1
+        d (float, optional): Matrix entry row 1, column 1
+        tx (float, optional): Translation along x
+        ty (float, optional): Translation along y
+    """
+
+    __slots__ = ("a", "b", "c", "d", "tx", "ty")
+
+    def __init__(self, a=1.0, b=0.0, c=0.0, d=1.0, tx=0.0, ty=0.0):
+        for name, value in zip(self.__slots__, (a, b, c, d, tx, ty)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Transform is immutable")
+
+    @classmethod
+    def identity(cls):
+        """The transform that leaves every point where it is."""
+        return cls()
+
+    @classmethod
+    def translation(cls, offset_x, offset_y):
+        """A transform that moves points by the given amounts."""
+        return cls(tx=offset_x, ty=offset_y)
+
+    @classmethod
+    def rotation(cls, angle, pivot=(0, 0)):
+        """A transform that rotates points about a pivot.
+
+        Args:
+            angle (float): Rotation in degrees
+            pivot (Point, tuple, optional): Center of rotation
+
+        Returns:
+            Transform: The rotation
+        """
+        sin_a, cos_a = Angle.sin_cos(angle)
+        pivot_x, pivot_y = pivot[0], pivot[1]
+        return cls(
+            cos_a,
+            sin_a,
+            -sin_a,
+            cos_a,
+            pivot_x - pivot_x * cos_a + pivot_y * sin_a,
+            pivot_y - pivot_x * sin_a - pivot_y * cos_a,
+        )
+
+    @classmethod
+    def scaling(cls, scale_x, scale_y=None):
+        """A transform that scales points away from the origin."""
+        return cls(scale_x, 0.0, 0.0, scale_x if scale_y is None else scale_y)
+
+    @classmethod
+    def from_rectangle(cls, rectangle):
+        """The pose of a rectangle: maps its local frame to absolute coordinates.
+
+        Local (0, 0) is the rectangle's origin and local (width, height) its opposite
+        corner, so ``apply`` reproduces ``get_points()`` and the inverse reproduces
+        ``get_rel_point_rect()``.
+
+        Args:
+            rectangle (Rectangle): Rectangle whose position and rotation to use
+
+        Returns:
+            Transform: The rectangle's transform
+        """
+        sin_a, cos_a = rectangle.get_sin_cos()
+        return cls(cos_a, sin_a, -sin_a, cos_a, rectangle.x, rectangle.y)
+
+    def to_matrix(self):
+        """Return the full 3x3 matrix as nested tuples."""
+        return (
+            (self.a, self.c, self.tx),
+            (self.b, self.d, self.ty),
+            (0.0, 0.0, 1.0),
+        )
+
+    def __matmul__(self, other):
+        if not isinstance(other, Transform):
+            return NotImplemented
+        return Transform(
+            self.a * other.a + self.c * other.b,
+            self.b * other.a + self.d * other.b,
+            self.a * other.c + self.c * other.d,
+            self.b * other.c + self.d * other.d,
+            self.a * other.tx + self.c * other.ty + self.tx,
+            self.b * other.tx + self.d * other.ty + self.ty,
+        )
+
+    def then(self, other):
+        """Return the transform that applies this one and then ``other``."""
+        return other @ self
+
+    def determinant(self):
+        """Determinant of the linear part (the factor by which areas scale)."""
+        return self.a * self.d - self.b * self.c
+
+    def inverse(self):
+        """Return the transform that undoes this one.
+
+        Returns:
+            Transform: The inverse
+
+        Raises:
+            ValueError: If the transform collapses the plane (determinant 0)
+        """
+        determinant = self.determinant()
+        if determinant == 0:
+            raise ValueError("Transform is not invertible")
+        a, b = self.d / determinant, -self.b / determinant
+        c, d = -self.c / determinant, self.a / determinant
+        return Transform(
+            a, b, c, d, -(a * self.tx + c * self.ty), -(b * self.tx + d * self.ty)
+        )
+
+    def apply(self, target):
+        """Transform a point, or every point of a coordinate array at once.
+
+        Args:
+            target (Point, tuple, PointArray, numpy.ndarray): A single point, a
+                PointArray, or an (N, 2) array of coordinates
+
+        Returns:
+            Point, PointArray or numpy.ndarray: The transformed point(s), as a new
+                object of the same kind (a Point for a tuple)
+        """
+        a, b, c, d, tx, ty = self.a, self.b, self.c, self.d, self.tx, self.ty
+        if np is not None and isinstance(target, np.ndarray):
+            return target @ np.array([[a, b], [c, d]]) + (tx, ty)
+        if isinstance(target, (Point, tuple, list)):
+            x, y = target[0], target[1]
+            return Point(a * x + c * y + tx, b * x + d * y + ty)
+        # A PointArray: one pass over each coordinate buffer
+        xs, ys = target.x, target.y
+        if np is not None:
+            return type(target)(a * xs + c * ys + tx, b * xs + d * ys + ty)
+        return type(target)(
+            [a * x + c * y + tx for x, y in zip(xs, ys)],
+            [b * x + d * y + ty for x, y in zip(xs, ys)],
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Transform):
+            return NotImplemented
+        return self.to_matrix() == other.to_matrix()
+
+    def __hash__(self):
+        return hash(self.to_matrix())
+
+    def __repr__(self):
+        return (
+            f"Transform(a={self.a}, b={self.b}, c={self.c}, d={self.d}, "
+            f"tx={self.tx}, ty={self.ty})"
+        )
+
+
 def Line(angle, length):
     """Create a line vector from angle and length.
 
@@ -0,0 +1,698 @@
+from array import array
+from math import floor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .geometry import Angle, Point, Rectangle, Triangle
+except ImportError:
+    from geometry import Angle, Point, Rectangle, Triangle
+
+# Average number of grid cells a TriangleMesh triangle may be filed under, and the
+# most cells a grid may have along either axis
+_GRID_CELLS_PER_TRIANGLE = 8
+_GRID_MAX_SIDE = 2**31
+
+
+def _buffer(values):
+    """Store coordinates contiguously: float64 NumPy array, or a view of array('d')."""
+    if np is not None:
+        return np.array(values, dtype=np.float64)
+    return memoryview(array("d", values))
+
+
+def _as_buffer(values):
+    """Like ``_buffer``, but share ``values`` when it already has the right layout."""
+    if np is not None and isinstance(values, np.ndarray) and values.dtype == np.float64:
+        return values
+    if np is None and isinstance(values, memoryview) and values.format == "d":
+        return values
+    return _buffer(values)
+
+
+class PointArray:
+    """
+    A collection of points stored as two contiguous coordinate buffers.
+
+    x and y live in separate float64 buffers (NumPy arrays, or ``array('d')`` without
+    NumPy) instead of one Point object per point, which takes a fraction of the memory
+    and lets transformations run over whole buffers at once. Indexing returns a Point;
+    slicing returns a PointArray that views the same buffers without copying, so
+    in-place ``translate()`` and ``rotate()`` on a slice change the parent too.
+
+    Args:
+        xs (iterable): X coordinates
+        ys (iterable): Y coordinates (as many as ``xs``)
+    """
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, xs=(), ys=()):
+        self.x = _as_buffer(xs)
+        self.y = _as_buffer(ys)
+        if len(self.x) != len(self.y):
+            raise ValueError(
+                f"{len(self.x)} x coordinates for {len(self.y)} y coordinates"
+            )
+
+    @classmethod
+    def from_points(cls, points):
+        """Build an array from Points (or anything iterable as ``(x, y)``).
+
+        Args:
+            points (iterable): Points to copy
+
+        Returns:
+            PointArray: The coordinates of the points
+        """
+        points = points if isinstance(points, (list, tuple)) else list(points)
+        return cls([point[0] for point in points], [point[1] for point in points])
+
+    def to_points(self):
+        """Return the points as a list of Point objects."""
+        return list(map(Point, self.x.tolist(), self.y.tolist()))
+
+    def copy(self):
+        """Return a PointArray with its own copy of the coordinates."""
+        return PointArray(_buffer(self.x), _buffer(self.y))
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointArray(self.x[index], self.y[index])
+        return Point(float(self.x[index]), float(self.y[index]))
+
+    def __iter__(self):
+        return iter(self.to_points())
+
+    def __repr__(self):
+        pairs = ", ".join(
+            f"({x}, {y})" for x, y in zip(self.x.tolist(), self.y.tolist())
+        )
+        return f"PointArray([{pairs}])"
+
+    def offset(self, offset_x, offset_y):
+        """Offset every point by given amounts.
+
+        Args:
+            offset_x (float, sequence): X offset, for all points or one per point
+            offset_y (float, sequence): Y offset, for all points or one per point
+
+        Returns:
+            PointArray: New array of offset points
+        """
+        return self.copy().translate(offset_x, offset_y)
+
+    def translate(self, offset_x, offset_y):
+        """Move every point in place.
+
+        Args:
+            offset_x (float, sequence): X offset, for all points or one per point
+            offset_y (float, sequence): Y offset, for all points or one per point
+
+        Returns:
+            PointArray: This array
+        """
+        if np is not None:
+            self.x += offset_x
+            self.y += offset_y
+            return self
+        for buffer, offsets in ((self.x, offset_x), (self.y, offset_y)):
+            if isinstance(offsets, (int, float)):
+                offsets = [offsets] * len(buffer)
+            for index, offset in enumerate(offsets):
+                buffer[index] += offset
+        return self
+
+    def rotate(self, angle, pivot=(0, 0)):
+        """Rotate every point in place about a pivot.
+
+        Uses the same convention as Rectangle rotation: ``angle`` is in degrees, and a
+        positive angle turns the x axis towards the y axis.
+
+        Args:
+            angle (float): Rotation in degrees
+            pivot (Point, tuple, optional): Center of rotation
+
+        Returns:
+            PointArray: This array
+        """
+        sin_a, cos_a = Angle.sin_cos(angle)
+        pivot_x, pivot_y = pivot[0], pivot[1]
+        if np is not None:
+            dx = self.x - pivot_x
+            dy = self.y - pivot_y
+            np.multiply(dx, cos_a, out=self.x)
+            self.x -= dy * sin_a
+            self.x += pivot_x
+            np.multiply(dx, sin_a, out=self.y)
+            self.y += dy * cos_a
+            self.y += pivot_y
+            return self
+        xs, ys = self.x, self.y
+        for index in range(len(xs)):
+            dx, dy = xs[index] - pivot_x, ys[index] - pivot_y
+            xs[index] = dx * cos_a - dy * sin_a + pivot_x
+            ys[index] = dx * sin_a + dy * cos_a + pivot_y
+        return self
+
+
+class RectangleArray:
+    """
+    A collection of rectangles stored column by column.
+
+    x, y, width, height and rotation (in degrees, as on Rectangle) each live in one
+    contiguous float64 buffer, laid out like PointArray's. Bulk geometry runs over
+    the whole columns at once; indexing returns a Rectangle and slicing returns a
+    RectangleArray viewing the same buffers.
+
+    Args:
+        x (iterable): X coordinates of the rectangles' origins
+        y (iterable): Y coordinates of the rectangles' origins
+        width (iterable): Widths
+        height (iterable): Heights
+        rotation (iterable, optional): Rotations in degrees (all 0 if omitted)
+    """
+
+    __slots__ = ("x", "y", "width", "height", "rotation")
+
+    def __init__(self, x=(), y=(), width=(), height=(), rotation=None):
+        self.x = _as_buffer(x)
+        self.y = _as_buffer(y)
+        self.width = _as_buffer(width)
+        self.height = _as_buffer(height)
+        self.rotation = _as_buffer(
+            [0.0] * len(self.x) if rotation is None else rotation
+        )
+        if (
+            len(set(map(len, (self.x, self.y, self.width, self.height, self.rotation))))
+            > 1
+        ):
+            raise ValueError("x, y, width, height and rotation differ in length")
+
+    @classmethod
+    def from_rectangles(cls, rectangles):
+        """Build an array from Rectangle objects.
+
+        Args:
+            rectangles (iterable): Rectangles to copy
+
+        Returns:
+            RectangleArray: The rectangles' columns
+        """
+        rectangles = (
+            rectangles if isinstance(rectangles, (list, tuple)) else list(rectangles)
+        )
+        return cls(
+            [rectangle.x for rectangle in rectangles],
+            [rectangle.y for rectangle in rectangles],
+            [rectangle.width for rectangle in rectangles],
+            [rectangle.height for rectangle in rectangles],
+            [rectangle.rotation for rectangle in rectangles],
+        )
+
+    def to_rectangles(self):
+        """Return the rectangles as a list of Rectangle objects."""
+        return list(map(Rectangle, *(column.tolist() for column in self._columns())))
+
+    def _columns(self):
+        return self.x, self.y, self.width, self.height, self.rotation
+
+    def copy(self):
+        """Return a RectangleArray with its own copy of the columns."""
+        return RectangleArray(*map(_buffer, self._columns()))
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RectangleArray(*(column[index] for column in self._columns()))
+        return Rectangle(*(float(column[index]) for column in self._columns()))
+
+    def __iter__(self):
+        return iter(self.to_rectangles())
+
+    def __repr__(self):
+        return f"RectangleArray({len(self)} rectangles)"
+
+    def _sin_cos(self):
+        """Sine and cosine of every rotation, as Rectangle.get_sin_cos() gives them."""
+        return Angle.sin_cos_array(self.rotation)
+
+    def areas(self):
+        """Get the area of every rectangle.
+
+        Returns:
+            numpy.ndarray: One area per rectangle (a list without NumPy)
+        """
+        if np is not None:
+            return self.width * self.height
+        return [width * height for width, height in zip(self.width, self.height)]
+
+    def corners(self):
+        """Get the 4 corner points of every rectangle, accounting for rotation.
+
+        Returns:
+            numpy.ndarray: Array of shape (N, 4, 2) holding the corners (a, b, c, d) of
+                each rectangle in the order of Rectangle.get_points(); without NumPy, a
+                list of four (x, y) tuples per rectangle
+        """
+        sin_a, cos_a = self._sin_cos()
+        if np is None:
+            result = []
+            for x, y, width, height, s, c in zip(
+                self.x, self.y, self.width, self.height, sin_a, cos_a
+            ):
+                width_x, width_y = width * c, width * s
+                height_x, height_y = -height * s, height * c
+                result.append(
+                    [
+                        (x, y),
+                        (x + width_x, y + width_y),
+                        (x + height_x + width_x, y + height_y + width_y),
+                        (x + height_x, y + height_y),
+                    ]
+                )
+            return result
+
+        width_x, width_y = self.width * cos_a, self.width * sin_a
+        height_x, height_y = -self.height * sin_a, self.height * cos_a
+        result = np.empty((len(self), 4, 2))
+        result[:, :, 0] = self.x[:, None]
+        result[:, :, 1] = self.y[:, None]
+        result[:, 1, 0] += width_x
+        result[:, 1, 1] += width_y
+        result[:, 2, 0] += height_x
+        result[:, 2, 1] += height_y
+        result[:, 2, 0] += width_x
+        result[:, 2, 1] += width_y
+        result[:, 3, 0] += height_x
+        result[:, 3, 1] += height_y
+        return result
+
+    def aabbs(self):
+        """Get the axis-aligned bounding box of every rectangle.
+
+        Returns:
+            numpy.ndarray: Array of shape (N, 4) with rows (min_x, min_y, max_x, max_y);
+                a list of tuples without NumPy
+        """
+        corners = self.corners()
+        if np is None:
+            return [
+                (
+                    min(x for x, _ in points),
+                    min(y for _, y in points),
+                    max(x for x, _ in points),
+                    max(y for _, y in points),
+                )
+                for points in corners
+            ]
+        return np.concatenate((corners.min(axis=1), corners.max(axis=1)), axis=1)
+
+    def translate(self, offset_x, offset_y):
+        """Move every rectangle in place.
+
+        Args:
+            offset_x (float, sequence): X offset, for all rectangles or one per rectangle
+            offset_y (float, sequence): Y offset, for all rectangles or one per rectangle
+
+        Returns:
+            RectangleArray: This array
+        """
+        PointArray(self.x, self.y).translate(offset_x, offset_y)
+        return self
+
+    def rotate(self, angle, pivot=None):
+        """Rotate every rectangle in place.
+
+        Args:
+            angle (float): Rotation in degrees, added to each rectangle's rotation
+            pivot (Point, tuple, optional): Center of rotation for the origins; without
+                one, each rectangle turns about its own origin
+
+        Returns:
+            RectangleArray: This array
+        """
+        if pivot is not None:
+            PointArray(self.x, self.y).rotate(angle, pivot)
+        if np is not None:
+            self.rotation += angle
+        else:
+            for index in range(len(self.rotation)):
+                self.rotation[index] += angle
+        return self
+
+    def get_rel_point_rect(self, x, y):
+        """Get points relative to every rectangle, compensating for rotation.
+
+        Args:
+            x (float, sequence): Absolute x coordinate, one for all rectangles or one
+                per rectangle
+            y (float, sequence): Absolute y coordinate, likewise
+
+        Returns:
+            tuple: (rel_x, rel_y) arrays in each rectangle's frame (lists without NumPy)
+        """
+        sin_a, cos_a = self._sin_cos()
+        if np is not None:
+            dx = np.asarray(x, dtype=np.float64) - self.x
+            dy = np.asarray(y, dtype=np.float64) - self.y
+            return dx * cos_a + dy * sin_a, dy * cos_a - dx * sin_a
+        count = len(self)
+        xs = [x] * count if isinstance(x, (int, float)) else x
+        ys = [y] * count if isinstance(y, (int, float)) else y
+        rel_x, rel_y = [], []
+        for px, py, ox, oy, s, c in zip(xs, ys, self.x, self.y, sin_a, cos_a):
+            dx, dy = px - ox, py - oy
+            rel_x.append(dx * c + dy * s)
+            rel_y.append(dy * c - dx * s)
+        return rel_x, rel_y
+
+
+def _cross(ax, ay, bx, by, px, py):
+    """Twice the signed area of (a, b, p); works elementwise on NumPy arrays."""
+    return (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+
+
+class TriangleMesh:
+    """
+    Triangles sharing one vertex buffer, addressed through an index buffer.
+
+    Each vertex is stored once in a PointArray; the triangles are rows of three int32
+    indices into it (a NumPy (M, 3) array, or a flat ``array('i')`` without NumPy).
+    Areas and point tests run over all triangles at once, and ``locate_point`` goes
+    through a uniform grid over the triangles' bounding boxes, built on first use
+    (call ``invalidate()`` after moving vertices).
+
+    Args:
+        vertices (PointArray, iterable): Vertex coordinates, as a PointArray or (x, y) pairs
+        indices (iterable): One (i, j, k) triple of vertex indices per triangle
+    """
+
+    def __init__(self, vertices, indices):
+        if not isinstance(vertices, PointArray):
+            vertices = PointArray.from_points(vertices)
+        self.vertices = vertices
+        if np is not None:
+            self.indices = np.array(indices, dtype=np.int32).reshape(-1, 3)
+            count = len(self.indices)
+            bounds = (self.indices.min(), self.indices.max()) if count else None
+        else:
+            self.indices = array("i", (index for triple in indices for index in triple))
+            count = len(self.indices) // 3
+            bounds = (min(self.indices), max(self.indices)) if count else None
+        if bounds and not 0 <= bounds[0] <= bounds[1] < len(vertices):
+            raise IndexError("triangle vertex index out of range")
+        self._count = count
+        self._grid = None
+
+    @classmethod
+    def from_triangles(cls, triangles):
+        """Build a mesh from Triangle objects, storing shared vertices once.
+
+        Args:
+            triangles (iterable): Triangles whose corners are Points or (x, y) pairs
+
+        Returns:
+            TriangleMesh: The mesh
+        """
+        positions = {}
+        indices = []
+        for triangle in triangles:
+            indices.append(
+                [
+                    positions.setdefault((point[0], point[1]), len(positions))
+                    for point in (triangle.a, triangle.b, triangle.c)
+                ]
+            )
+        return cls(PointArray.from_points(list(positions)), indices)
+
+    def __len__(self):
+        return self._count
+
+    def _triangle_indices(self, index):
+        if np is not None:
+            return self.indices[index].tolist()
+        if index < 0:
+            index += self._count
+        return self.indices[3 * index : 3 * index + 3].tolist()
+
+    def __getitem__(self, index):
+        return Triangle(
+            *(self.vertices[vertex] for vertex in self._triangle_indices(index))
+        )
+
+    def to_triangles(self):
+        """Return the triangles as a list of Triangle objects (with Point corners)."""
+        return [self[index] for index in range(len(self))]
+
+    def _corner_coordinates(self, triangles=None):
+        """Coordinates of the triangles' corners: (ax, ay, bx, by, cx, cy) columns.
+
+        Args:
+            triangles (sequence, optional): Triangle indices to gather (all if None)
+        """
+        xs, ys = self.vertices.x, self.vertices.y
+        if np is not None:
+            indices = self.indices if triangles is None else self.indices[triangles]
+            a, b, c = indices.T
+            return xs[a], ys[a], xs[b], ys[b], xs[c], ys[c]
+        flat = self.indices
+        if triangles is None:
+            corners = [flat[corner::3] for corner in range(3)]
+        else:
+            corners = [
+                [flat[3 * index + corner] for index in triangles] for corner in range(3)
+            ]
+        return tuple(
+            [buffer[index] for index in vertex_indices]
+            for vertex_indices in corners
+            for buffer in (xs, ys)
+        )
+
+    def areas(self):
+        """Get the area of every triangle (shoelace formula).
+
+        Returns:
+            numpy.ndarray: One area per triangle (a list without NumPy)
+        """
+        ax, ay, bx, by, cx, cy = self._corner_coordinates()
+        if np is not None:
+            return np.abs(_cross(ax, ay, bx, by, cx, cy)) / 2
+        return [abs(_cross(*corners)) / 2 for corners in zip(ax, ay, bx, by, cx, cy)]
+
+    def total_area(self):
+        """Get the summed area of all triangles."""
+        return float(sum(self.areas()))
+
+    def contains_points(self, xs, ys, triangles=None):
+        """Test points against triangles (edges included).
+
+        Uses the signs of the points' barycentric coordinates (the three cross products),
+        so it works for triangles of either orientation without any division.
+
+        Args:
+            xs (float, sequence): X coordinates
+            ys (float, sequence): Y coordinates
+            triangles (sequence, optional): Index of the triangle to test each point
+                against. Defaults to all triangles in order, so one point is tested
+                against every triangle, or point ``i`` against triangle ``i``.
+
+        Returns:
+            numpy.ndarray: Boolean mask (a list of bools without NumPy)
+        """
+        if np is None:
+            corners = self._corner_coordinates(triangles)
+            count = len(corners[0])
+            xs = [xs] * count if isinstance(xs, (int, float)) else xs
+            ys = [ys] * count if isinstance(ys, (int, float)) else ys
+            return [
+                self._contains(x, y, *triangle)
+                for x, y, *triangle in zip(xs, ys, *corners)
+            ]
+        if triangles is not None:
+            triangles = np.asarray(triangles, dtype=np.intp)
+        corners = self._corner_coordinates(triangles)
+        return self._contains(
+            np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64), *corners
+        )
+
+    @staticmethod
+    def _contains(x, y, ax, ay, bx, by, cx, cy):
+        """Point-in-triangle from the signs of the barycentric cross products."""
+        d1 = _cross(ax, ay, bx, by, x, y)
+        d2 = _cross(bx, by, cx, cy, x, y)
+        d3 = _cross(cx, cy, ax, ay, x, y)
+        if np is not None and isinstance(d1, np.ndarray):
+            negative = (d1 < 0) | (d2 < 0) | (d3 < 0)
+            positive = (d1 > 0) | (d2 > 0) | (d3 > 0)
+            return ~(negative & positive)
+        return not ((d1 < 0 or d2 < 0 or d3 < 0) and (d1 > 0 or d2 > 0 or d3 > 0))
+
+    def _build_grid(self):
+        """Bucket triangles by the grid cells their bounding boxes touch.
+
+        Cells start out the size of an average bounding box and are doubled until the
+        triangles cover at most ``_GRID_CELLS_PER_TRIANGLE`` cells each on average, so
+        a few large triangles among many small ones cannot blow up the grid. With
+        NumPy the grid is kept in CSR form over the occupied cells only: ``occupied``
+        holds their sorted ids, ``cells`` the triangle indices grouped by cell, and
+        ``offsets[i]:offsets[i + 1]`` is the slice of cell ``occupied[i]``.
+        """
+        ax, ay, bx, by, cx, cy = self._corner_coordinates()
+        limit = _GRID_CELLS_PER_TRIANGLE * len(self) + 64
+        if np is not None:
+            min_x = np.minimum(np.minimum(ax, bx), cx)
+            min_y = np.minimum(np.minimum(ay, by), cy)
+            max_x = np.maximum(np.maximum(ax, bx), cx)
+            max_y = np.maximum(np.maximum(ay, by), cy)
+            if len(self):
+                origin_x, origin_y = float(min_x.min()), float(min_y.min())
+                extent = max(
+                    float(max_x.max()) - origin_x, float(max_y.max()) - origin_y
+                )
+                cell_size = float(np.mean(max_x - min_x + max_y - min_y))
+            else:
+                origin_x = origin_y = extent = cell_size = 0.0
+            # Keep cell ids far from int64 overflow, however distant the triangles
+            cell_size = max(cell_size, extent / _GRID_MAX_SIDE) or 1.0
+            while True:
+                first_x = ((min_x - origin_x) // cell_size).astype(np.int64)
+                first_y = ((min_y - origin_y) // cell_size).astype(np.int64)
+                last_x = ((max_x - origin_x) // cell_size).astype(np.int64)
+                last_y = ((max_y - origin_y) // cell_size).astype(np.int64)
+                span_x = last_x - first_x + 1
+                span_y = last_y - first_y + 1
+                spans = span_x * span_y
+                if int(spans.sum()) <= limit:
+                    break
+                cell_size *= 2
+            columns = int(last_x.max()) + 1 if len(self) else 1
+            rows = int(last_y.max()) + 1 if len(self) else 1
+
+            # One (cell, triangle) pair per cell each bounding box covers
+            triangle = np.repeat(np.arange(len(self)), spans)
+            step = np.arange(len(triangle)) - np.repeat(np.cumsum(spans) - spans, spans)
+            cell_x = first_x[triangle] + step % span_x[triangle]
+            cell_y = first_y[triangle] + step // span_x[triangle]
+            cell_id = cell_y * columns + cell_x
+            order = np.argsort(cell_id, kind="stable")
+            cells = triangle[order].astype(np.int32)
+            occupied, starts = np.unique(cell_id[order], return_index=True)
+            offsets = np.append(starts, len(cells))
+            self._grid = (
+                origin_x,
+                origin_y,
+                cell_size,
+                columns,
+                rows,
+                cells,
+                occupied,
+                offsets,
+            )
+            return self._grid
+
+        grid = {}
+        boxes = [
+            (min(xs), min(ys), max(xs), max(ys))
+            for xs, ys in (
+                ((x1, x2, x3), (y1, y2, y3))
+                for x1, y1, x2, y2, x3, y3 in zip(ax, ay, bx, by, cx, cy)
+            )
+        ]
+        cell_size = (
+            sum(box[2] - box[0] + box[3] - box[1] for box in boxes) / len(boxes)
+            if boxes
+            else 1.0
+        ) or 1.0
+        while (
+            sum(
+                (floor(max_x / cell_size) - floor(min_x / cell_size) + 1)
+                * (floor(max_y / cell_size) - floor(min_y / cell_size) + 1)
+                for min_x, min_y, max_x, max_y in boxes
+            )
+            > limit
+        ):
+            cell_size *= 2
+        for index, (min_x, min_y, max_x, max_y) in enumerate(boxes):
+            for cell_x in range(floor(min_x / cell_size), floor(max_x / cell_size) + 1):
+                for cell_y in range(
+                    floor(min_y / cell_size), floor(max_y / cell_size) + 1
+                ):
+                    grid.setdefault((cell_x, cell_y), []).append(index)
+        self._grid = (cell_size, grid)
+        return self._grid
+
+    def invalidate(self):
+        """Drop the grid behind ``locate_point`` (rebuilt on next use) after vertices move."""
+        self._grid = None
+
+    def locate_point(self, x, y):
+        """Find a triangle containing a point.
+
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+
+        Returns:
+            int: Index of the lowest-numbered triangle containing the point, or -1
+        """
+        if np is not None:
+            return int(self.locate_points([x], [y])[0])
+        cell_size, grid = self._grid or self._build_grid()
+        candidates = grid.get((floor(x / cell_size), floor(y / cell_size)), ())
+        for index, hit in zip(candidates, self.contains_points(x, y, candidates)):
+            if hit:
+                return index
+        return -1
+
+    def locate_points(self, xs, ys):
+        """Find a triangle containing each of many points.
+
+        Args:
+            xs (sequence): X coordinates
+            ys (sequence): Y coordinates
+
+        Returns:
+            numpy.ndarray: For each point, the index of the lowest-numbered triangle
+                containing it, or -1 (a list without NumPy)
+        """
+        if np is None:
+            return [self.locate_point(x, y) for x, y in zip(xs, ys)]
+        origin_x, origin_y, cell_size, columns, rows, cells, occupied, offsets = (
+            self._grid or self._build_grid()
+        )
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        result = np.full(len(xs), -1, dtype=np.int64)
+        cell_x = (xs - origin_x) // cell_size
+        cell_y = (ys - origin_y) // cell_size
+        on_grid = np.flatnonzero(
+            (cell_x >= 0) & (cell_x < columns) & (cell_y >= 0) & (cell_y < rows)
+        )
+        cell_id = (cell_y[on_grid] * columns + cell_x[on_grid]).astype(np.int64)
+        slot = np.searchsorted(occupied, cell_id)
+        found = slot < len(occupied)
+        found[found] = occupied[slot[found]] == cell_id[found]
+        on_grid, slot = on_grid[found], slot[found]
+
+        # Test every point against every candidate in its cell in one batch
+        starts, stops = offsets[slot], offsets[slot + 1]
+        counts = stops - starts
+        point = np.repeat(on_grid, counts)
+        step = np.arange(len(point)) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate = cells[np.repeat(starts, counts) + step]
+        hits = self.contains_points(xs[point], ys[point], candidate)
+
+        # Keep the lowest-numbered hit of each point
+        first = np.full(len(xs), len(self), dtype=np.int64)
+        np.minimum.at(first, point[hits], candidate[hits])
+        result[first < len(self)] = first[first < len(self)]
+        return result
@@ -0,0 +1,223 @@
+from itertools import count
+from math import floor
+
+# Cell size used when an index starts out empty
+DEFAULT_CELL_SIZE = 64.0
+
+
+def _overlaps_box(rectangle, min_x, min_y, max_x, max_y):
+    """Exact test of a rotated rectangle against an axis-aligned box (edges touching count).
+
+    The bounding boxes are known to overlap, which settles the x and y axes; what is
+    left of the separating-axis test is projecting the box onto the rectangle's axes.
+    """
+    sin_a, cos_a = rectangle.get_sin_cos()
+    corners = ((min_x, min_y), (max_x, min_y), (max_x, max_y), (min_x, max_y))
+    for axis_x, axis_y, length in (
+        (cos_a, sin_a, rectangle.width),
+        (-sin_a, cos_a, rectangle.height),
+    ):
+        origin = rectangle.x * axis_x + rectangle.y * axis_y
+        low, high = sorted((origin, origin + length))
+        projections = [x * axis_x + y * axis_y for x, y in corners]
+        if max(projections) < low or min(projections) > high:
+            return False
+    return True
+
+
+class RectangleIndex:
+    """
+    Uniform-grid spatial index over (rotated) Rectangles.
+
+    Each rectangle is filed under every grid cell its rotated bounding box touches,
+    so a point query only looks at the rectangles registered in one cell. Candidates
+    are then checked exactly: ``query_point`` uses the same test as
+    ``Rectangle.point_in_rectangle``. Results come back in insertion order, so the
+    last one is the most recently inserted (for example the topmost on screen).
+
+    The index does not notice when a rectangle changes; call ``update()`` after
+    moving, resizing or rotating one.
+
+    Args:
+        rectangles (iterable, optional): Rectangles to insert straight away
+        cell_size (float, optional): Side of a grid cell. Defaults to twice the mean
+            bounding-box side of ``rectangles`` (or DEFAULT_CELL_SIZE without any);
+            cells a little larger than a typical rectangle work best.
+    """
+
+    def __init__(self, rectangles=(), cell_size=None):
+        rectangles = list(rectangles)
+        if cell_size is None:
+            cell_size = DEFAULT_CELL_SIZE
+            if rectangles:
+                total = 0
+                for rectangle in rectangles:
+                    min_x, min_y, max_x, max_y = rectangle.get_aabb()
+                    total += max_x - min_x + max_y - min_y
+                cell_size = max(total / len(rectangles), 1e-9)
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._cells = {}
+        self._entries = {}
+        self._order = count()
+        for rectangle in rectangles:
+            self.insert(rectangle)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, rectangle):
+        return id(rectangle) in self._entries
+
+    def __iter__(self):
+        return (entry[0] for entry in self._entries.values())
+
+    def _cell_range(self, min_x, min_y, max_x, max_y):
+        size = self.cell_size
+        return (
+            floor(min_x / size),
+            floor(min_y / size),
+            floor(max_x / size),
+            floor(max_y / size),
+        )
+
+    def _rectangle_cells(self, rectangle):
+        # Pad the box slightly so rounding in the corners can never put a point the
+        # exact test accepts into a cell the rectangle was not filed under
+        min_x, min_y, max_x, max_y = rectangle.get_aabb()
+        pad = self.cell_size * 1e-9
+        return self._cell_range(min_x - pad, min_y - pad, max_x + pad, max_y + pad)
+
+    def _file(self, key, rectangle, cells):
+        """Add or remove a rectangle from every cell in ``cells``."""
+        first_x, first_y, last_x, last_y = cells
+        grid = self._cells
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                if rectangle is None:
+                    cell = grid[cell_x, cell_y]
+                    del cell[key]
+                    if not cell:
+                        del grid[cell_x, cell_y]
+                else:
+                    grid.setdefault((cell_x, cell_y), {})[key] = rectangle
+
+    def insert(self, rectangle):
+        """Add a rectangle to the index.
+
+        Args:
+            rectangle (Rectangle): Rectangle to add (inserting it again updates it)
+        """
+        key = id(rectangle)
+        if key in self._entries:
+            self.update(rectangle)
+            return
+        cells = self._rectangle_cells(rectangle)
+        self._entries[key] = (rectangle, next(self._order), cells)
+        self._file(key, rectangle, cells)
+
+    def remove(self, rectangle):
+        """Remove a rectangle from the index.
+
+        Args:
+            rectangle (Rectangle): Rectangle to remove
+
+        Raises:
+            KeyError: If the rectangle is not in the index
+        """
+        key = id(rectangle)
+        if key not in self._entries:
+            raise KeyError(rectangle)
+        _, _, cells = self._entries.pop(key)
+        self._file(key, None, cells)
+
+    def update(self, rectangle):
+        """Re-file a rectangle after it moved, resized or rotated.
+
+        Only the cells it left or entered are touched, and it keeps its place in
+        the result order.
+
+        Args:
+            rectangle (Rectangle): Rectangle already in the index
+
+        Raises:
+            KeyError: If the rectangle is not in the index
+        """
+        key = id(rectangle)
+        if key not in self._entries:
+            raise KeyError(rectangle)
+        _, order, old_cells = self._entries[key]
+        cells = self._rectangle_cells(rectangle)
+        if cells != old_cells:
+            self._file(key, None, old_cells)
+            self._file(key, rectangle, cells)
+        self._entries[key] = (rectangle, order, cells)
+
+    def _sorted(self, keys):
+        entries = self._entries
+        ranked = sorted((entries[key][1], key) for key in keys)
+        return [entries[key][0] for _, key in ranked]
+
+    def query_point(self, x, y):
+        """Find the rectangles containing a point.
+
+        Args:
+            x (float): X coordinate of the point
+            y (float): Y coordinate of the point
+
+        Returns:
+            list: Rectangles for which ``point_in_rectangle(x, y)`` is True, in
+                insertion order
+        """
+        # point_in_rectangle truncates the hit point, so look up the truncated one
+        x, y = int(x), int(y)
+        size = self.cell_size
+        cell = self._cells.get((floor(x / size), floor(y / size)))
+        if not cell:
+            return []
+        hits = [
+            key for key, rectangle in cell.items() if rectangle.contains_point(x, y)
+        ]
+        return hits and self._sorted(hits)
+
+    def query_rect(self, min_x, min_y, max_x, max_y):
+        """Find the rectangles that overlap an axis-aligned region.
+
+        Args:
+            min_x (float): Left edge of the region
+            min_y (float): Top edge of the region
+            max_x (float): Right edge of the region
+            max_y (float): Bottom edge of the region
+
+        Returns:
+            list: Rectangles whose rotated shape overlaps or touches the region, in
+                insertion order
+        """
+        first_x, first_y, last_x, last_y = self._cell_range(min_x, min_y, max_x, max_y)
+        candidates = {}
+        grid = self._cells
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(grid):
+            # A region wider than the populated grid: walk the cells instead
+            for (cell_x, cell_y), cell in grid.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    candidates.update(cell)
+        else:
+            for cell_x in range(first_x, last_x + 1):
+                for cell_y in range(first_y, last_y + 1):
+                    cell = grid.get((cell_x, cell_y))
+                    if cell:
+                        candidates.update(cell)
+
+        hits = []
+        for key, rectangle in candidates.items():
+            box_min_x, box_min_y, box_max_x, box_max_y = rectangle.get_aabb()
+            if (
+                box_max_x >= min_x
+                and box_min_x <= max_x
+                and box_max_y >= min_y
+                and box_min_y <= max_y
+                and _overlaps_box(rectangle, min_x, min_y, max_x, max_y)
+            ):
+                hits.append(key)
+        return self._sorted(hits)
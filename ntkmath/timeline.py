@@ -0,0 +1,508 @@
+import asyncio
+import time
+from array import array
+from bisect import bisect_right
+from itertools import count
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .general import Curves
+except ImportError:
+    from general import Curves
+
+# Column names, in the order add() fills them
+_COLUMNS = ("ids", "start_values", "end_values", "start_times", "durations", "curves")
+
+
+class Timeline:
+    """
+    Tween engine that animates many values at once.
+
+    Every active tween is a row in a set of columns: id, start and end value, start
+    time, duration and curve. ``step(now)`` works on whole columns: the progress of
+    all tweens is computed together, every curve is evaluated once over all the
+    tweens using it (rows are kept grouped by curve, so each group is one slice),
+    and finished tweens are dropped and their completion callbacks fired.
+
+    Curves are called with an array of ``t`` values, so anything from ``Curves``,
+    a ``BakedCurve`` or another function that handles arrays will do. Without NumPy
+    the columns are lists and curves are called per tween.
+
+    Args:
+        clock (callable, optional): Returns the current time in seconds; used for
+            tweens added without a start time and by ``run()``. Defaults to
+            ``time.monotonic``.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._next_id = count()
+        self._pending = {name: [] for name in _COLUMNS}
+        self._cancelled = set()
+        self._live = set()
+        self._callbacks = {}
+        self._curves = []
+        self._curve_ids = {}
+        self._groups = []
+        if np is not None:
+            self._columns = {
+                name: np.empty(
+                    0, dtype=np.int64 if name in ("ids", "curves") else float
+                )
+                for name in _COLUMNS
+            }
+        else:
+            self._columns = {name: [] for name in _COLUMNS}
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, tween_id):
+        return tween_id in self._live
+
+    def add(
+        self,
+        start,
+        end,
+        duration,
+        curve=Curves.linear,
+        start_time=None,
+        delay=0.0,
+        on_complete=None,
+    ):
+        """Start animating a value from ``start`` to ``end``.
+
+        The tween joins the columns at the next ``step()``, so adding thousands of
+        tweens in one frame costs one append per column.
+
+        Args:
+            start (float): Value at the start
+            end (float): Value once finished
+            duration (float): Length in seconds; 0 jumps to ``end`` on the next step
+            curve (callable, optional): Easing curve. Defaults to ``Curves.linear``.
+            start_time (float, optional): When the tween starts. Defaults to the
+                clock's current time.
+            delay (float, optional): Seconds to add to ``start_time``
+            on_complete (callable, optional): Called with the tween's id once it
+                has finished
+
+        Returns:
+            int: Id of the tween
+
+        Raises:
+            ValueError: If ``duration`` is negative
+        """
+        if duration < 0:
+            raise ValueError("duration must not be negative")
+        if start_time is None:
+            start_time = self.clock()
+        curve_id = self._curve_ids.get(curve)
+        if curve_id is None:
+            curve_id = self._curve_ids[curve] = len(self._curves)
+            self._curves.append(curve)
+
+        tween_id = next(self._next_id)
+        row = (tween_id, start, end, start_time + delay, duration, curve_id)
+        for name, value in zip(_COLUMNS, row):
+            self._pending[name].append(value)
+        self._live.add(tween_id)
+        if on_complete is not None:
+            self._callbacks[tween_id] = on_complete
+        return tween_id
+
+    def cancel(self, tween_id):
+        """Stop a tween without calling its completion callback.
+
+        Args:
+            tween_id (int): Id returned by ``add()``
+
+        Raises:
+            KeyError: If the tween is not active
+        """
+        self._live.remove(tween_id)
+        self._callbacks.pop(tween_id, None)
+        self._cancelled.add(tween_id)
+
+    def _flush(self):
+        """Merge pending tweens into the columns, drop cancelled ones and regroup."""
+        columns, pending = self._columns, self._pending
+        if np is None:
+            for name in _COLUMNS:
+                columns[name] += pending[name]
+                pending[name] = []
+            if self._cancelled:
+                keep = [i not in self._cancelled for i in columns["ids"]]
+                self._compact(keep)
+                self._cancelled.clear()
+            return
+
+        for name in _COLUMNS:
+            columns[name] = np.concatenate(
+                (columns[name], np.array(pending[name], dtype=columns[name].dtype))
+            )
+            pending[name] = []
+        if self._cancelled:
+            keep = ~np.isin(columns["ids"], np.array(list(self._cancelled)))
+            self._cancelled.clear()
+            for name in _COLUMNS:
+                columns[name] = columns[name][keep]
+        # Keep rows sorted by curve so that every curve's tweens form one slice
+        order = np.argsort(columns["curves"], kind="stable")
+        for name in _COLUMNS:
+            columns[name] = columns[name][order]
+        self._regroup()
+        self._prune_curves()
+
+    def _regroup(self):
+        curves = self._columns["curves"]
+        bounds = np.flatnonzero(np.diff(curves)) + 1
+        starts = [0] + bounds.tolist()
+        stops = bounds.tolist() + [len(curves)]
+        self._groups = [
+            (self._curves[int(curves[first])], slice(first, last))
+            for first, last in zip(starts, stops)
+            if last > first
+        ]
+
+    def _compact(self, keep):
+        columns = self._columns
+        if np is not None:
+            for name in _COLUMNS:
+                columns[name] = columns[name][keep]
+            self._regroup()
+        else:
+            for name in _COLUMNS:
+                columns[name] = [
+                    value for value, kept in zip(columns[name], keep) if kept
+                ]
+        self._prune_curves()
+
+    def _prune_curves(self):
+        """Forget curves no tween uses any more and renumber the rest.
+
+        Called with no pending rows, so the columns hold every curve id in use.
+        Without this, a timeline fed a new function per tween (a lambda or
+        ``functools.partial`` built on the fly) would keep every one of them alive.
+        """
+        columns = self._columns
+        if np is not None:
+            # Rows are grouped by curve id, so each group is one id in order
+            if len(self._groups) == len(self._curves):
+                return
+            curves = columns["curves"]
+            for curve_id, (_, rows) in enumerate(self._groups):
+                curves[rows] = curve_id
+            self._curves = [curve for curve, _ in self._groups]
+        else:
+            used = sorted(set(columns["curves"]))
+            if len(used) == len(self._curves):
+                return
+            renumbered = {old: new for new, old in enumerate(used)}
+            columns["curves"] = [renumbered[old] for old in columns["curves"]]
+            self._curves = [self._curves[old] for old in used]
+        self._curve_ids = {curve: i for i, curve in enumerate(self._curves)}
+
+    def step(self, now=None):
+        """Advance every tween to ``now``.
+
+        Tweens that have not started yet sit at their start value; finished ones
+        report exactly their end value for this step, are removed, and then have
+        their completion callbacks called (which may add new tweens).
+
+        Args:
+            now (float, optional): Current time. Defaults to the clock's time.
+
+        Returns:
+            tuple: ``(ids, values)``, the id and current value of every tween that
+                was active in this step (NumPy arrays, or lists without NumPy)
+        """
+        if now is None:
+            now = self.clock()
+        if self._cancelled or self._pending["ids"]:
+            self._flush()
+        if np is None:
+            return self._step_python(now)
+
+        columns = self._columns
+        ids, start, end = columns["ids"], columns["start_values"], columns["end_values"]
+        elapsed = now - columns["start_times"]
+        durations = columns["durations"]
+        finished = elapsed >= durations
+        # Zero-length tweens have no progress to speak of: they are done or not
+        progress = np.divide(
+            elapsed, durations, out=finished.astype(float), where=durations > 0
+        )
+        np.clip(progress, 0.0, 1.0, out=progress)
+
+        eased = np.empty_like(progress)
+        for curve, rows in self._groups:
+            eased[rows] = curve(progress[rows])
+        values = start + (end - start) * eased
+        values[finished] = end[finished]
+
+        if finished.any():
+            done = ids[finished].tolist()
+            self._compact(~finished)
+            self._complete(done)
+        return ids, values
+
+    def _step_python(self, now):
+        columns = self._columns
+        curves = self._curves
+        values, keep, done = [], [], []
+        for tween_id, start, end, start_time, duration, curve_id in zip(
+            *(columns[name] for name in _COLUMNS)
+        ):
+            elapsed = now - start_time
+            if elapsed >= duration:
+                values.append(end)
+                keep.append(False)
+                done.append(tween_id)
+                continue
+            progress = min(max(elapsed / duration, 0.0), 1.0) if duration else 0.0
+            values.append(start + (end - start) * curves[curve_id](progress))
+            keep.append(True)
+
+        ids = columns["ids"]
+        if done:
+            self._compact(keep)
+            self._complete(done)
+        return ids, values
+
+    def _complete(self, done):
+        self._live.difference_update(done)
+        callbacks = self._callbacks
+        for tween_id in done:
+            callback = callbacks.pop(tween_id, None)
+            if callback is not None:
+                callback(tween_id)
+
+    async def run(self, fps=60.0, on_step=None, stop_when_idle=False):
+        """Step the timeline from an asyncio event loop at a fixed frame rate.
+
+        Frames are scheduled against absolute deadlines, so time spent stepping and
+        in ``on_step`` does not make the rate drift; if a frame overruns, the
+        missed deadlines are skipped instead of being caught up in a burst.
+
+        Args:
+            fps (float, optional): Target frames per second. Defaults to 60.
+            on_step (callable, optional): Called with ``(ids, values)`` after every
+                step, e.g. to move the widgets
+            stop_when_idle (bool, optional): Return once no tweens are left instead
+                of running until cancelled
+        """
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        interval = 1.0 / fps
+        clock = self.clock
+        deadline = clock()
+        while True:
+            ids, values = self.step(clock())
+            if on_step is not None:
+                on_step(ids, values)
+            if stop_when_idle and not self:
+                return
+            deadline += interval
+            delay = deadline - clock()
+            if delay < 0:
+                deadline += (-delay // interval + 1) * interval
+                delay = deadline - clock()
+            await asyncio.sleep(delay)
+
+
+class KeyframeTrack:
+    """
+    A value animated through keyframes, each segment with its own easing curve.
+
+    Keyframe times and values are kept sorted by time. Looking up the segment for a
+    time is a binary search, and a ``cursor()`` remembers the last segment so that
+    playback moving forward finds the next one in constant amortized time; either
+    way a track of 100,000 keyframes samples about as fast as one of ten. Before
+    the first keyframe the value is the first keyframe's, after the last the last's.
+
+    Args:
+        times (iterable): Keyframe times
+        values (iterable): Keyframe values, one per time
+        curves (callable or sequence, optional): Easing curve for every segment, or
+            one per segment (one fewer than keyframes, in time order). Defaults to
+            ``Curves.linear``.
+
+    Raises:
+        ValueError: If there are no keyframes, the lengths differ, or the number of
+            curves does not match the number of segments
+    """
+
+    def __init__(self, times, values, curves=Curves.linear):
+        times, values = list(times), list(values)
+        if len(times) != len(values):
+            raise ValueError(f"{len(times)} times for {len(values)} values")
+        if not times:
+            raise ValueError("a track needs at least one keyframe")
+        keyframes = sorted(zip(times, values), key=lambda keyframe: keyframe[0])
+        self._length = len(keyframes)
+        if callable(curves):
+            curves = [curves] * (len(keyframes) - 1)
+        else:
+            curves = list(curves)
+            if len(curves) != len(keyframes) - 1:
+                raise ValueError(
+                    f"{len(curves)} curves for {len(keyframes) - 1} segments"
+                )
+        if len(keyframes) == 1:
+            # A zero-length segment holding the single value at either end
+            keyframes.append(keyframes[0])
+            curves = [Curves.linear]
+        segments = len(keyframes) - 1
+
+        self._times = [float(time) for time, _ in keyframes]
+        self._values = [float(value) for _, value in keyframes]
+        self._curves = []
+        curve_ids = {}
+        for curve in curves:
+            if curve not in curve_ids:
+                curve_ids[curve] = len(self._curves)
+                self._curves.append(curve)
+        self._segment_curves = [curve_ids[curve] for curve in curves]
+        self._scalar_curves = [getattr(curve, "scalar", curve) for curve in curves]
+        self._last = segments - 1
+        self._arrays = None
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def start(self):
+        """float: Time of the first keyframe."""
+        return self._times[0]
+
+    @property
+    def end(self):
+        """float: Time of the last keyframe."""
+        return self._times[-1]
+
+    def _evaluate(self, segment, time):
+        """Value at ``time``, which lies in ``segment`` unless it is before the first
+        keyframe or at or after the last."""
+        times, values = self._times, self._values
+        start = times[segment]
+        if time < start:
+            return values[0]
+        stop = times[segment + 1]
+        if time >= stop:
+            return values[-1]
+        value = values[segment]
+        eased = self._scalar_curves[segment]((time - start) / (stop - start))
+        return value + (values[segment + 1] - value) * eased
+
+    def sample_at(self, time):
+        """Value of the track at any time, found by binary search.
+
+        Args:
+            time (float): Time to sample
+
+        Returns:
+            float: The eased value
+        """
+        segment = bisect_right(self._times, time) - 1
+        return self._evaluate(min(max(segment, 0), self._last), time)
+
+    def cursor(self):
+        """Start a playback cursor at the first segment.
+
+        Returns:
+            KeyframeCursor: Cursor sampling this track
+        """
+        return KeyframeCursor(self)
+
+    def sample(self, times):
+        """Values of the track at many times at once.
+
+        Every time's segment is found in one search, and each curve is evaluated
+        once over all the samples that fall in its segments.
+
+        Args:
+            times: Array, buffer or sequence of times, in any order
+
+        Returns:
+            A float64 array (``array('d')`` without NumPy), equal to ``sample_at``
+            at every time
+        """
+        if np is None:
+            cursor = self.cursor()
+            return array("d", map(cursor.sample, times))
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self._times),
+                np.array(self._values),
+                np.array(self._segment_curves, dtype=np.intp),
+            )
+        key_times, key_values, segment_curves = self._arrays
+        times = np.asarray(times, dtype=np.float64)
+
+        segment = np.searchsorted(key_times, times, side="right") - 1
+        np.clip(segment, 0, self._last, out=segment)
+        start, stop = key_times[segment], key_times[segment + 1]
+        value, next_value = key_values[segment], key_values[segment + 1]
+        length = stop - start
+        progress = np.divide(
+            times - start, length, out=np.zeros_like(times), where=length > 0
+        )
+
+        if len(self._curves) == 1:
+            eased = self._curves[0](progress)
+        else:
+            eased = np.empty_like(progress)
+            curve_ids = segment_curves[segment]
+            for curve_id, curve in enumerate(self._curves):
+                rows = curve_ids == curve_id
+                if rows.any():
+                    eased[rows] = curve(progress[rows])
+        result = value + (next_value - value) * eased
+        result[times < key_times[0]] = key_values[0]
+        result[times >= key_times[-1]] = key_values[-1]
+        return result
+
+
+class KeyframeCursor:
+    """
+    Sampling position on a KeyframeTrack, for playback.
+
+    The cursor remembers the segment it last sampled. Times that move forward
+    usually stay in that segment or move on to the next one, which costs one or two
+    comparisons; longer jumps, and any step backwards, fall back to a binary search
+    over the part of the track on the relevant side.
+
+    Args:
+        track (KeyframeTrack): Track to sample
+    """
+
+    __slots__ = ("track", "_segment")
+
+    def __init__(self, track):
+        self.track = track
+        self._segment = 0
+
+    def sample(self, time):
+        """Value of the track at ``time``.
+
+        Args:
+            time (float): Time to sample; cheapest when no earlier than the last one
+
+        Returns:
+            float: The eased value, the same as ``track.sample_at(time)``
+        """
+        track = self.track
+        times = track._times
+        segment = self._segment
+        if time < times[segment]:
+            segment = max(bisect_right(times, time, 0, segment) - 1, 0)
+        elif time >= times[segment + 1] and segment < track._last:
+            segment += 1
+            if time >= times[segment + 1] and segment < track._last:
+                segment = min(bisect_right(times, time, segment + 1) - 1, track._last)
+        self._segment = segment
+        return track._evaluate(segment, time)
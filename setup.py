@@ -41,6 +41,9 @@ setup(
         # For example: "numpy>=1.20.0",
     ],
     extras_require={
+        "numpy": [
+            "numpy>=1.20.0",
+        ],
         "dev": [
             "pytest>=6.0",
             "black",
@@ -6,9 +6,18 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../ntkmath"))
 
 import pytest
 import math
+import random
+import re
 import adv_decimal
+import decimal_array
+import decimal_io
+import decimal_linalg
 import geometry
+import geometry_array
+import spatial_index
+import collision
 import general
+import timeline
 
 
 class TestImports:
@@ -73,6 +82,59 @@ class TestPoint:
         assert p.y == 20
 
 
+class TestPointArray:
+    """Test the PointArray class"""
+
+    def test_point_has_slots(self):
+        """Test that Point stores its coordinates in slots"""
+        p = geometry.Point(1, 2)
+        assert not hasattr(p, "__dict__")
+        with pytest.raises(AttributeError):
+            p.z = 3
+
+    def test_points_roundtrip(self):
+        """Test conversion to and from lists of Point"""
+        points = [geometry.Point(1, 2), geometry.Point(-3.5, 4), (5, 6)]
+        array = geometry_array.PointArray.from_points(points)
+        assert len(array) == 3
+        assert [tuple(p) for p in array.to_points()] == [(1, 2), (-3.5, 4), (5, 6)]
+        assert tuple(array[-1]) == (5, 6)
+        assert isinstance(array[0], geometry.Point)
+        with pytest.raises(ValueError):
+            geometry_array.PointArray([1, 2], [3])
+
+    def test_offset_and_translate(self):
+        """Test vectorized offset (new array) and translate (in place)"""
+        array = geometry_array.PointArray([0, 1, 2], [0, 10, 20])
+        moved = array.offset(1, -1)
+        assert [tuple(p) for p in moved] == [(1, -1), (2, 9), (3, 19)]
+        assert tuple(array[1]) == (1, 10)
+        array.translate([1, 2, 3], 0.5)
+        assert [tuple(p) for p in array] == [(1, 0.5), (3, 10.5), (5, 20.5)]
+
+    def test_slices_are_views(self):
+        """Test that slices share the parent's buffers"""
+        array = geometry_array.PointArray(range(6), range(6))
+        view = array[2:4]
+        view.translate(100, 0)
+        assert list(array.x.tolist()) == [0, 1, 102, 103, 4, 5]
+        copied = array[::2].copy().translate(1, 1)
+        assert tuple(array[0]) == (0, 0)
+        assert tuple(copied[0]) == (1, 1)
+
+    def test_rotate_about_pivot(self):
+        """Test in-place rotation against Point-by-point math"""
+        array = geometry_array.PointArray([2, 1], [1, 3])
+        array.rotate(90, pivot=geometry.Point(1, 1))
+        assert array[0].x == pytest.approx(1)
+        assert array[0].y == pytest.approx(2)
+        assert array[1].x == pytest.approx(-1)
+        assert array[1].y == pytest.approx(1)
+        array.rotate(-90, pivot=(1, 1))
+        assert array[1].x == pytest.approx(1)
+        assert array[1].y == pytest.approx(3)
+
+
 class TestRectangle:
     """Test the Rectangle class"""
 
@@ -137,6 +199,347 @@ class TestRectangle:
         assert r.point_in_rectangle(15, 5) == False
         assert r.point_in_rectangle(5, 15) == False
 
+    def test_rectangle_cache_invalidation(self):
+        """Test that cached corners, trig and bounding box follow assignments"""
+        r = geometry.Rectangle(0, 0, 10, 5, 0)
+        points = r.get_points()
+        assert r.get_points() is points
+        assert r.get_aabb() == (0, 0, 10, 5)
+        r.x = 3
+        assert r.get_points() is not points
+        assert r.get_aabb() == (3, 0, 13, 5)
+        sin_cos = r.get_sin_cos()
+        r.width = 20
+        assert r.get_sin_cos() is sin_cos
+        assert r.get_aabb() == (3, 0, 23, 5)
+        r.rotation += 90
+        assert r.get_sin_cos() == pytest.approx((1, 0))
+        min_x, min_y, max_x, max_y = r.get_aabb()
+        assert (min_x, min_y, max_x, max_y) == pytest.approx((-2, 0, 3, 20))
+        assert r.get_rel_point_rect(2, 10) == pytest.approx((10, 1))
+
+    def test_rectangle_contains_point(self):
+        """Test the scalar hit test, rotated and unrotated"""
+        r = geometry.Rectangle(2.5, 2.5, 10, 5, 0)
+        assert r.contains_point(2.5, 7.5)
+        assert not r.contains_point(2.4, 3)
+        # Truncation to integers is kept by point_in_rectangle only
+        assert r.contains_point(2.9, 3)
+        assert not r.point_in_rectangle(2.9, 3)
+        rotated = geometry.Rectangle(0, 0, 10, 4, 90)
+        assert rotated.contains_point(-2, 5)
+        assert not rotated.contains_point(2, 5)
+        # Interior points of non-integral rectangles are inside
+        r = geometry.Rectangle(47.93, -19.62, 13.54, 38.23, 309.55)
+        assert r.point_in_rectangle(59.58, -18.55)
+
+    def test_rectangle_contains_points(self):
+        """Test that the batched hit test matches the scalar one"""
+        import random
+
+        rng = random.Random(7)
+        xs = [rng.uniform(-30, 30) for _ in range(500)]
+        ys = [rng.uniform(-30, 30) for _ in range(500)]
+        for rotation in (0, 30, 90, 217.5):
+            r = geometry.Rectangle(-3, 4, 20, -8, rotation)
+            mask = r.contains_points(xs, ys)
+            assert list(mask) == [r.contains_point(x, y) for x, y in zip(xs, ys)]
+            assert any(mask)
+        points = geometry_array.PointArray(xs, ys)
+        assert list(r.contains_points(points)) == list(mask)
+
+
+class TestRectangleArray:
+    """Test the RectangleArray class"""
+
+    @staticmethod
+    def scene():
+        return [
+            geometry.Rectangle(0, 0, 10, 5, 0),
+            geometry.Rectangle(3, -2, 4, 8, 30),
+            geometry.Rectangle(-5, 7, 2.5, 1, 270),
+            geometry.Rectangle(1, 1, 6, 6, -45),
+        ]
+
+    def test_rectangles_roundtrip(self):
+        """Test conversion to and from lists of Rectangle"""
+        rectangles = self.scene()
+        array = geometry_array.RectangleArray.from_rectangles(rectangles)
+        assert len(array) == 4
+        back = array.to_rectangles()
+        assert [(r.x, r.y, r.width, r.height, r.rotation) for r in back] == [
+            (r.x, r.y, r.width, r.height, r.rotation) for r in rectangles
+        ]
+        assert array[1].rotation == 30
+        assert len(array[1:3]) == 2
+        assert list(geometry_array.RectangleArray([1], [2], [3], [4]).rotation) == [0]
+        with pytest.raises(ValueError):
+            geometry_array.RectangleArray([1, 2], [1], [1], [1])
+
+    def test_bulk_geometry_matches_rectangle(self):
+        """Test areas, corners and bounding boxes against the scalar methods"""
+        rectangles = self.scene()
+        array = geometry_array.RectangleArray.from_rectangles(rectangles)
+        assert list(array.areas()) == [r.get_area() for r in rectangles]
+        corners = array.corners()
+        aabbs = array.aabbs()
+        for index, rectangle in enumerate(rectangles):
+            expected = [tuple(point) for point in rectangle.get_points()]
+            assert [tuple(point) for point in corners[index]] == pytest.approx(expected)
+            assert tuple(aabbs[index]) == pytest.approx(rectangle.get_aabb())
+        rel_x, rel_y = array.get_rel_point_rect(4, 2)
+        for index, rectangle in enumerate(rectangles):
+            assert (rel_x[index], rel_y[index]) == pytest.approx(
+                rectangle.get_rel_point_rect(4, 2)
+            )
+
+    def test_translate_and_rotate(self):
+        """Test in-place moves, through views as well"""
+        array = geometry_array.RectangleArray.from_rectangles(self.scene())
+        array[2:].translate(1, -1)
+        assert (array[0].x, array[2].x, array[3].y) == (0, -4, 0)
+        array.rotate(90)
+        assert list(array.rotation) == [90, 120, 360, 45]
+        array.rotate(-90, pivot=(0, 0))
+        assert (array[1].x, array[1].y) == pytest.approx((-2, -3))
+        assert array[1].rotation == 30
+
+
+class TestTriangleMesh:
+    """Test the TriangleMesh class"""
+
+    @staticmethod
+    def grid_mesh(size):
+        """A size x size square of unit cells, two triangles per cell."""
+        vertices = [(i, j) for j in range(size + 1) for i in range(size + 1)]
+        indices = []
+        for j in range(size):
+            for i in range(size):
+                v = j * (size + 1) + i
+                indices += [(v, v + 1, v + size + 2), (v, v + size + 2, v + size + 1)]
+        return geometry_array.TriangleMesh(vertices, indices)
+
+    def test_areas(self):
+        """Test vectorized areas against Triangle.get_area"""
+        mesh = self.grid_mesh(4)
+        assert len(mesh) == 32
+        assert len(mesh.vertices) == 25
+        assert list(mesh.areas()) == [0.5] * 32
+        assert mesh.total_area() == 16
+        triangle = mesh[5]
+        assert isinstance(triangle, geometry.Triangle)
+        assert triangle.get_area() == 0.5
+        with pytest.raises(IndexError):
+            geometry_array.TriangleMesh([(0, 0), (1, 0)], [(0, 1, 2)])
+
+    def test_from_triangles_shares_vertices(self):
+        """Test that shared corners are stored once"""
+        triangles = [
+            geometry.Triangle(geometry.Point(0, 0), (2, 0), (0, 2)),
+            geometry.Triangle((2, 0), (2, 2), geometry.Point(0, 2)),
+        ]
+        mesh = geometry_array.TriangleMesh.from_triangles(triangles)
+        assert len(mesh.vertices) == 4
+        assert [t.get_area() for t in mesh.to_triangles()] == [2, 2]
+
+    def test_contains_points(self):
+        """Test batched point-in-triangle, edges included, either orientation"""
+        mesh = geometry_array.TriangleMesh(
+            [(0, 0), (4, 0), (0, 4), (4, 4)], [(0, 1, 2), (3, 2, 1)]
+        )
+        assert list(mesh.contains_points(1, 1)) == [True, False]
+        assert list(mesh.contains_points(2, 2)) == [True, True]
+        assert list(mesh.contains_points([3, 3, 5], [3, 0.5, 0], [1, 0, 0])) == [
+            True,
+            True,
+            False,
+        ]
+
+    def test_locate_points(self):
+        """Test located triangles against a scan of every triangle"""
+        import random
+
+        rng = random.Random(3)
+        mesh = self.grid_mesh(12)
+        xs = [rng.uniform(-1, 13) for _ in range(300)] + [0, 12, 6]
+        ys = [rng.uniform(-1, 13) for _ in range(300)] + [0, 12, 6.5]
+        located = list(mesh.locate_points(xs, ys))
+        for x, y, index in zip(xs, ys, located):
+            hits = [i for i, hit in enumerate(mesh.contains_points(x, y)) if hit]
+            assert index == (hits[0] if hits else -1)
+            assert mesh.locate_point(x, y) == index
+        mesh.vertices.translate(100, 0)
+        mesh.invalidate()
+        assert mesh.locate_point(0.5, 0.5) == -1
+        assert mesh.locate_point(100.5, 0.2) == 0
+
+    def test_locate_in_sparse_mesh(self):
+        """Test a spread-out mesh with a distant outlier and one huge triangle"""
+        import random
+
+        rng = random.Random(8)
+        triangles = []
+        for _ in range(300):
+            x, y = rng.uniform(0, 1e6), rng.uniform(0, 1e6)
+            triangles.append(
+                geometry.Triangle(
+                    geometry.Point(x, y),
+                    geometry.Point(x + 50, y),
+                    geometry.Point(x, y + 50),
+                )
+            )
+        far = 1e12
+        triangles.append(
+            geometry.Triangle(
+                geometry.Point(far, far),
+                geometry.Point(far + 1, far),
+                geometry.Point(far, far + 1),
+            )
+        )
+        triangles.append(
+            geometry.Triangle(
+                geometry.Point(0, 0), geometry.Point(3e6, 0), geometry.Point(0, 3e6)
+            )
+        )
+        mesh = geometry_array.TriangleMesh.from_triangles(triangles)
+        xs = [rng.uniform(0, 2e6) for _ in range(200)] + [far + 0.25]
+        ys = [rng.uniform(0, 2e6) for _ in range(200)] + [far + 0.25]
+        located = list(mesh.locate_points(xs, ys))
+        # The grid stays proportional to the triangle count, not to the extent
+        if geometry_array.np is not None:
+            assert len(mesh._grid[5]) <= 8 * len(triangles) + 64
+        for x, y, index in zip(xs, ys, located):
+            hits = [i for i, hit in enumerate(mesh.contains_points(x, y)) if hit]
+            assert index == (hits[0] if hits else -1)
+        assert located[-1] == len(triangles) - 2
+
+
+class TestRectangleIndex:
+    """Test the RectangleIndex spatial index"""
+
+    @staticmethod
+    def scatter(count, seed=5):
+        import random
+
+        rng = random.Random(seed)
+        return rng, [
+            geometry.Rectangle(
+                rng.uniform(0, 300),
+                rng.uniform(0, 300),
+                rng.uniform(5, 40),
+                rng.uniform(5, 40),
+                rng.choice((0, 90, rng.uniform(0, 360))),
+            )
+            for _ in range(count)
+        ]
+
+    def test_query_point_matches_linear_scan(self):
+        """Test that point queries agree with point_in_rectangle on every rectangle"""
+        rng, rectangles = self.scatter(300)
+        index = spatial_index.RectangleIndex(rectangles)
+        assert len(index) == 300
+        for _ in range(500):
+            x, y = rng.uniform(-10, 330), rng.uniform(-10, 330)
+            expected = [r for r in rectangles if r.point_in_rectangle(x, y)]
+            assert index.query_point(x, y) == expected
+
+    def test_incremental_updates(self):
+        """Test insert, update after a move, and remove"""
+        rng, rectangles = self.scatter(50)
+        index = spatial_index.RectangleIndex(cell_size=16)
+        for r in rectangles:
+            index.insert(r)
+        moved = rectangles[10]
+        moved.x, moved.y, moved.rotation = 1000, 1000, 45
+        index.update(moved)
+        assert index.query_point(1000, 1005) == [moved]
+        index.remove(moved)
+        assert moved not in index
+        assert index.query_point(1000, 1005) == []
+        with pytest.raises(KeyError):
+            index.remove(moved)
+        for _ in range(200):
+            x, y = rng.uniform(0, 340), rng.uniform(0, 340)
+            expected = [
+                r for r in rectangles if r is not moved and r.point_in_rectangle(x, y)
+            ]
+            assert index.query_point(x, y) == expected
+
+    def test_query_rect(self):
+        """Test region queries against rotated shapes, not just bounding boxes"""
+        diamond = geometry.Rectangle(10, 0, 10, 10, 45)
+        square = geometry.Rectangle(30, 30, 5, 5, 0)
+        index = spatial_index.RectangleIndex([diamond, square])
+        # Inside the diamond's bounding box, but off its shape
+        assert index.query_rect(11, 0, 11.5, 0.5) == []
+        assert index.query_rect(8, 6, 12, 8) == [diamond]
+        assert index.query_rect(0, 0, 35, 35) == [diamond, square]
+        assert index.query_rect(35, 35, 50, 50) == [square]
+
+
+class TestCollision:
+    """Test exact overlap tests and the sweep-and-prune broad phase"""
+
+    def test_rectangles_overlap(self):
+        """Test rotated rectangles, including edge crossings with no corner inside"""
+        horizontal = geometry.Rectangle(0, 4, 20, 2, 0)
+        vertical = geometry.Rectangle(11, 0, 10, 2, 90)
+        # A plus sign: no corner of either lies inside the other
+        assert horizontal.overlaps(vertical)
+        assert not any(vertical.contains_point(*p) for p in horizontal.get_points())
+        diamond = geometry.Rectangle(10, 0, 10, 10, 45)
+        assert not diamond.overlaps(geometry.Rectangle(11, 0, 0.5, 0.5, 0))
+        assert diamond.overlaps(geometry.Rectangle(0, 0, 10, 10, 0))
+        # Touching edges count
+        assert geometry.Rectangle(0, 0, 5, 5).overlaps(geometry.Rectangle(5, 0, 5, 5))
+
+    def test_triangles_overlap(self):
+        """Test triangles against triangles and rectangles"""
+        t1 = geometry.Triangle(geometry.Point(0, 0), (4, 0), (0, 4))
+        t2 = geometry.Triangle((3, 3), (6, 3), (3, 6))
+        assert not t1.overlaps(t2)
+        assert t1.overlaps(geometry.Triangle((1, 1), (6, 1), (1, 6)))
+        assert t1.get_aabb() == (0, 0, 4, 4)
+        assert geometry.shapes_overlap(geometry.Rectangle(1.9, 1.9, 3, 3), t1)
+        assert not geometry.Rectangle(2.1, 2.1, 3, 3).overlaps(t1)
+
+    def test_sweep_and_prune_matches_brute_force(self):
+        """Test that the broad phase finds exactly the overlapping pairs, frame after frame"""
+        import random
+
+        rng = random.Random(11)
+        shapes = [
+            geometry.Rectangle(
+                rng.uniform(0, 200),
+                rng.uniform(0, 200),
+                rng.uniform(2, 25),
+                rng.uniform(2, 25),
+                rng.uniform(0, 360),
+            )
+            for _ in range(120)
+        ] + [
+            geometry.Triangle((x, y), (x + 10, y + 3), (x + 2, y - 9))
+            for x, y in ((rng.uniform(0, 200), rng.uniform(0, 200)) for _ in range(30))
+        ]
+        broad_phase = collision.SweepAndPrune(shapes)
+        for _ in range(3):
+            found = {frozenset(map(id, pair)) for pair in broad_phase.pairs()}
+            expected = {
+                frozenset((id(a), id(b)))
+                for i, a in enumerate(shapes)
+                for b in shapes[i + 1 :]
+                if geometry.shapes_overlap(a, b)
+            }
+            assert found == expected
+            for shape in shapes[:120]:
+                shape.x += rng.uniform(-4, 4)
+                shape.rotation += rng.uniform(-10, 10)
+
+        removed = shapes.pop()
+        broad_phase.remove(removed)
+        assert removed not in broad_phase
+        assert all(removed not in pair for pair in broad_phase.pairs())
+
 
 class TestTriangle:
     """Test the Triangle class"""
@@ -164,6 +567,68 @@ class TestTriangle:
         assert abs(area - 6.0) < 1e-10
 
 
+class TestPolygon:
+    """Test the Polygon class"""
+
+    @staticmethod
+    def l_shape():
+        return geometry.Polygon([(0, 0), (4, 0), (4, 1), (1, 1), (1, 3), (0, 3)])
+
+    def test_measurements(self):
+        """Test area, centroid and bounding box"""
+        polygon = self.l_shape()
+        assert polygon.get_area() == 6
+        assert polygon.get_signed_area() == 6
+        centroid = polygon.get_centroid()
+        assert (centroid.x, centroid.y) == pytest.approx((1.5, 1.0))
+        assert polygon.get_aabb() == (0, 0, 4, 3)
+        clockwise = geometry.Polygon(list(reversed(polygon.vertices)))
+        assert clockwise.get_signed_area() == -6
+        assert tuple(clockwise.get_centroid()) == pytest.approx(tuple(centroid))
+        with pytest.raises(ValueError):
+            geometry.Polygon([(0, 0), (1, 1)])
+
+    def test_contains_point(self):
+        """Test winding-number hits, boundary included"""
+        polygon = self.l_shape()
+        assert polygon.contains_point(0.5, 2)
+        assert not polygon.contains_point(2, 2)
+        assert polygon.contains_point(4, 0.5)
+        assert polygon.contains_point(1, 1)
+        assert not polygon.contains_point(-0.1, 0)
+        # A pentagram's center is wound twice: inside under the nonzero rule
+        star = geometry.Polygon([(0, 3), (2, -3), (-3, 1), (3, 1), (-2, -3)])
+        assert star.contains_point(0, 0)
+
+    def test_contains_points_matches_scalar(self):
+        """Test that the batched test agrees with the scalar one"""
+        import random
+
+        rng = random.Random(9)
+        polygon = self.l_shape()
+        xs = [rng.uniform(-1, 5) for _ in range(400)] + [0, 4, 2, 1]
+        ys = [rng.uniform(-1, 4) for _ in range(400)] + [0, 1, 1, 2]
+        mask = polygon.contains_points(xs, ys)
+        assert list(mask) == [polygon.contains_point(x, y) for x, y in zip(xs, ys)]
+        assert list(polygon.contains_points(xs, ys)) == list(mask)
+
+    def test_convex_hull(self):
+        """Test the hull of a point cloud"""
+        import random
+
+        rng = random.Random(2)
+        xs = [rng.uniform(-1, 1) for _ in range(500)] + [-2, 2, 2, -2, 0]
+        ys = [rng.uniform(-1, 1) for _ in range(500)] + [-2, -2, 2, 2, -2]
+        hull = geometry.Polygon.convex_hull(geometry_array.PointArray(xs, ys))
+        assert sorted(hull.vertices) == [(-2, -2), (-2, 2), (2, -2), (2, 2)]
+        assert hull.get_signed_area() == 16
+        assert all(hull.contains_points(xs, ys))
+        triangle = geometry.Polygon.convex_hull([geometry.Point(0, 0), (1, 0), (0, 1)])
+        assert len(triangle) == 3
+        with pytest.raises(ValueError):
+            geometry.Polygon.convex_hull([(0, 0), (1, 1), (2, 2)])
+
+
 class TestAngle:
     """Test the Angle class"""
 
@@ -183,6 +648,93 @@ class TestAngle:
         assert abs(geometry.Angle.to_radians(180) - math.pi) < 1e-10
         assert abs(geometry.Angle.to_radians(360) - 2 * math.pi) < 1e-10
 
+    def test_angle_sin_cos(self):
+        """Test the tabulated sin/cos pair"""
+        assert geometry.Angle.sin_cos(0) == (0, 1)
+        assert geometry.Angle.sin_cos(90) == (1, 0)
+        assert geometry.Angle.sin_cos(180) == (0, -1)
+        assert geometry.Angle.sin_cos(-90) == (-1, 0)
+        assert geometry.Angle.sin_cos(450) == (1, 0)
+        assert geometry.Angle.sin_cos(30)[0] == 0.5
+        assert geometry.Angle.sin_cos(240) == (
+            -geometry.Angle.sin_cos(60)[0],
+            -0.5,
+        )
+        for angle in (12, 37.5, 101.25, 359.75, 33.3, -17.1):
+            s, c = geometry.Angle.sin_cos(angle)
+            assert s == pytest.approx(math.sin(math.radians(angle)), abs=1e-15)
+            assert c == pytest.approx(math.cos(math.radians(angle)), abs=1e-15)
+        # Quadrants are exact rotations of one another
+        for angle in range(0, 90):
+            s, c = geometry.Angle.sin_cos(angle)
+            assert geometry.Angle.sin_cos(angle + 90) == (c, -s)
+
+    def test_angle_sin_cos_array(self):
+        """Test that the batched pair matches the scalar one exactly"""
+        angles = [0, 90, 30, -45, 12.25, 33.3, 720, 1e-3, 275.5]
+        sines, cosines = geometry.Angle.sin_cos_array(angles)
+        assert list(zip(sines, cosines)) == [geometry.Angle.sin_cos(a) for a in angles]
+
+
+class TestTransform:
+    """Test the Transform class"""
+
+    def test_apply_and_compose(self):
+        """Test applying translations and rotations, alone and composed"""
+        move = geometry.Transform.translation(3, -1)
+        turn = geometry.Transform.rotation(90)
+        p = geometry.Point(1, 0)
+        assert tuple(move.apply(p)) == (4, -1)
+        assert tuple(turn.apply(p)) == (0, 1)
+        assert tuple((move @ turn).apply(p)) == (3, 0)
+        assert tuple(turn.then(move).apply((1, 0))) == (3, 0)
+        assert tuple((turn @ move).apply(p)) == (1, 4)
+        pivot_turn = geometry.Transform.rotation(180, pivot=(1, 1))
+        assert tuple(pivot_turn.apply((2, 1))) == (0, 1)
+        assert geometry.Transform.scaling(2, 3).apply((1, 1)).y == 3
+        assert geometry.Transform.identity() == geometry.Transform()
+
+    def test_inverse(self):
+        """Test that inverses undo transforms and singular ones are rejected"""
+        transform = (
+            geometry.Transform.translation(5, 2)
+            @ geometry.Transform.rotation(30)
+            @ geometry.Transform.scaling(2, 0.5)
+        )
+        p = transform.inverse().apply(transform.apply((7, -3)))
+        assert (p.x, p.y) == pytest.approx((7, -3))
+        with pytest.raises(ValueError):
+            geometry.Transform.scaling(0, 1).inverse()
+        with pytest.raises(AttributeError):
+            transform.tx = 0
+
+    def test_rectangle_pose(self):
+        """Test that a rectangle's transform reproduces its corners and frame"""
+        r = geometry.Rectangle(4, -2, 10, 5, 30)
+        pose = geometry.Transform.from_rectangle(r)
+        local = [(0, 0), (10, 0), (10, 5), (0, 5)]
+        for corner, expected in zip(map(pose.apply, local), r.get_points()):
+            assert tuple(corner) == pytest.approx(tuple(expected))
+        assert tuple(pose.inverse().apply((6, 3))) == pytest.approx(
+            r.get_rel_point_rect(6, 3)
+        )
+
+    def test_apply_to_arrays(self):
+        """Test applying a transform to a PointArray in one call"""
+        pose = geometry.Transform.rotation(45, pivot=(1, 1))
+        points = geometry_array.PointArray([0, 1, 2.5], [3, 1, -4])
+        moved = pose.apply(points)
+        assert isinstance(moved, geometry_array.PointArray)
+        for before, after in zip(points, moved):
+            assert tuple(after) == pytest.approx(tuple(pose.apply(before)))
+        expected = points.copy().rotate(45, pivot=(1, 1))
+        assert list(moved.x) == pytest.approx(list(expected.x))
+        if geometry.np is not None:
+            coordinates = geometry.np.array([[0, 3], [1, 1], [2.5, -4]])
+            result = pose.apply(coordinates)
+            assert result.shape == (3, 2)
+            assert list(result[:, 1]) == pytest.approx(list(moved.y))
+
 
 class TestLine:
     """Test the Line function"""
@@ -248,6 +800,431 @@ class TestCurves:
         result = general.Curves.bounce(0.5)
         assert 0 <= result <= 1
 
+    def test_curves_accept_many_values(self):
+        """Test that every curve maps arrays and buffers exactly like scalars"""
+        from array import array
+
+        values = [i / 64 for i in range(65)]
+        # The bounce and ease-in-out segment boundaries, and values just below them
+        edges = [0.5, 1 / 2.75, 2 / 2.75, 2.5 / 2.75]
+        values += edges + [edge - 1e-12 for edge in edges]
+        # Values that are not short binary fractions, whose products need rounding
+        rng = random.Random(21)
+        values += [rng.random() for _ in range(5000)]
+        names = [
+            "linear",
+            "ease_in_quad",
+            "ease_out_quad",
+            "ease_in_out_quad",
+            "ease_in_cubic",
+            "ease_out_cubic",
+            "bounce",
+        ]
+        inputs = [array("d", values), memoryview(array("d", values)), values]
+        if general.np is not None:
+            inputs.append(general.np.array(values))
+        for name in names:
+            curve = getattr(general.Curves, name)
+            expected = [curve(value) for value in values]
+            for batch in inputs:
+                result = curve(batch)
+                assert not isinstance(result, list)
+                assert list(result) == expected, name
+
+
+class TestBakedCurve:
+    """Test easing curves baked into lookup tables"""
+
+    def test_samples_are_exact(self):
+        """Test that the table reproduces the curve at its samples"""
+        for interpolation in ("linear", "cubic"):
+            baked = general.BakedCurve(general.Curves.bounce, 64, interpolation)
+            for i in range(65):
+                t = i / 64
+                assert baked(t) == pytest.approx(general.Curves.bounce(t), abs=1e-12)
+
+    def test_error_shrinks_with_resolution(self):
+        """Test the measured error against the documented bounds"""
+        quad = general.Curves.ease_in_out_quad
+        coarse = general.BakedCurve(quad, 64)
+        fine = general.BakedCurve(quad, 256)
+        # h**2 / 8 * max|f''| with f'' = 4
+        assert coarse.max_error <= 4 / 8 / 64**2
+        assert fine.max_error < coarse.max_error / 10
+        cubic = general.BakedCurve(quad, 256, "cubic")
+        assert cubic.max_error < fine.max_error
+        # Straight lines are reproduced exactly, including near the ends
+        line = general.BakedCurve(general.Curves.linear, 16, "cubic")
+        assert line.max_error < 1e-12
+
+    def test_clamps_t(self):
+        """Test that t outside [0, 1] is clamped"""
+        baked = general.BakedCurve(general.Curves.ease_in_quad, 32)
+        assert baked(-1) == baked(0) == 0
+        assert baked(2) == baked(1) == pytest.approx(1)
+
+    def test_batched_matches_scalar(self):
+        """Test that batched evaluation matches the scalar path exactly"""
+        from array import array
+
+        values = [i / 97 - 0.1 for i in range(120)]
+        for interpolation in ("linear", "cubic"):
+            baked = general.BakedCurve(lambda t: t * t * (3 - 2 * t), 50, interpolation)
+            result = baked(array("d", values))
+            assert list(result) == [baked(value) for value in values]
+
+    def test_bake_curve_shares_tables(self):
+        """Test that baking the same curve twice returns one table"""
+        baked = general.bake_curve(general.Curves.bounce, 128)
+        assert general.bake_curve(general.Curves.bounce, 128) is baked
+        assert general.bake_curve(general.Curves.bounce, 128, "cubic") is not baked
+        assert general.bake_curve(general.Curves.bounce, 64) is not baked
+
+    def test_invalid_arguments(self):
+        """Test that bad resolutions and interpolations are rejected"""
+        with pytest.raises(ValueError):
+            general.BakedCurve(general.Curves.linear, 0)
+        with pytest.raises(ValueError):
+            general.BakedCurve(general.Curves.linear, 8, "quadratic")
+
+
+class TestCubicBezier:
+    """Test CSS-style cubic-bezier curves"""
+
+    def test_solves_x_to_y(self):
+        """Test points on the curve for several control points, flat slopes included"""
+        for points in [
+            (0.25, 0.1, 0.25, 1.0),
+            (0.42, 0.0, 0.58, 1.0),
+            (0.0, 0.0, 0.0, 0.0),
+            (1.0, 0.0, 1.0, 1.0),
+            (0.5, -0.5, 0.5, 1.5),
+        ]:
+            curve = general.CubicBezier(*points)
+            x1, y1, x2, y2 = points
+            for i in range(1, 100):
+                s = i / 100
+                x = 3 * (1 - s) ** 2 * s * x1 + 3 * (1 - s) * s * s * x2 + s**3
+                y = 3 * (1 - s) ** 2 * s * y1 + 3 * (1 - s) * s * s * y2 + s**3
+                assert curve(x) == pytest.approx(y, abs=1e-9)
+            assert curve(0) == 0 and curve(1) == 1
+
+    def test_css_ease(self):
+        """Test the CSS 'ease' and 'linear' curves"""
+        assert general.CubicBezier(0.25, 0.1, 0.25, 1.0)(0.5) == pytest.approx(
+            0.8024, abs=1e-4
+        )
+        linear = general.CubicBezier(0.0, 0.0, 1.0, 1.0)
+        for t in (0.1, 0.37, 0.9):
+            assert linear(t) == pytest.approx(t)
+
+    def test_batched_matches_scalar(self):
+        """Test that batched solving matches the scalar path exactly"""
+        curve = general.CubicBezier(0.68, -0.55, 0.27, 1.55)
+        values = [i / 250 - 0.1 for i in range(300)]
+        assert list(curve(values)) == [curve(value) for value in values]
+
+    def test_invalid_control_points(self):
+        """Test that x outside [0, 1] is rejected"""
+        with pytest.raises(ValueError):
+            general.CubicBezier(1.2, 0, 0.5, 1)
+
+
+class TestComposedCurve:
+    """Test curve combinators"""
+
+    def test_combinators(self):
+        """Test each combinator against its definition"""
+        curves = general.Curves
+        reverse = general.reverse_curve(curves.ease_in_quad)
+        mirror = general.mirror_curve(curves.ease_in_cubic)
+        blend = general.blend_curves(curves.linear, curves.ease_in_quad, 0.25)
+        clamped = general.clamp_curve(curves.ease_out_quad, 0.2, 0.6)
+        sequence = general.sequence_curves(
+            curves.ease_in_quad, curves.linear, spans=(1, 3)
+        )
+        for i in range(11):
+            t = i / 10
+            assert reverse(t) == pytest.approx((1 - t) ** 2)
+            assert mirror(t) == pytest.approx(curves.ease_out_cubic(t))
+            assert blend(t) == pytest.approx(0.75 * t + 0.25 * t * t)
+            assert clamped(t) == general.clamp(curves.ease_out_quad(t), 0.2, 0.6)
+            if t < 0.25:
+                assert sequence(t) == pytest.approx(0.25 * (4 * t) ** 2)
+            else:
+                assert sequence(t) == pytest.approx(t)
+
+    def test_nesting_is_flattened(self):
+        """Test that nested combinators compile into one function"""
+        curves = general.Curves
+        bezier = general.CubicBezier(0.42, 0, 0.58, 1)
+        inner = general.sequence_curves(curves.ease_in_quad, bezier)
+        curve = general.clamp_curve(
+            general.blend_curves(
+                general.mirror_curve(inner), general.reverse_curve(curves.bounce)
+            )
+        )
+        # Only the curves that cannot be written out remain calls
+        assert len(re.findall(r"\bf\d+\(", curve.source)) == 2
+        expected = lambda t: general.clamp(
+            (1 - inner(1 - t)) + (curves.bounce(1 - t) - (1 - inner(1 - t))) * 0.5,
+            0.0,
+            1.0,
+        )
+        for i in range(21):
+            assert curve(i / 20) == pytest.approx(expected(i / 20))
+
+    def test_batched_matches_scalar(self):
+        """Test that the batched function matches the scalar one exactly"""
+        curves = general.Curves
+        curve = general.clamp_curve(
+            general.sequence_curves(
+                curves.bounce,
+                general.mirror_curve(curves.ease_in_out_quad),
+                general.bake_curve(curves.ease_in_cubic, 32),
+                spans=(2, 1, 1),
+            ),
+            0.1,
+            0.95,
+        )
+        values = [i / 128 - 0.05 for i in range(140)]
+        assert list(curve(values)) == [curve(value) for value in values]
+
+    def test_inlined_curves_match_batched(self):
+        """Test that inlined curves agree with the batched ones at random values"""
+        curves = general.Curves
+        simple = [
+            curves.linear,
+            curves.ease_in_quad,
+            curves.ease_out_quad,
+            curves.ease_in_out_quad,
+            curves.ease_in_cubic,
+            curves.ease_out_cubic,
+        ]
+        composed = [general.reverse_curve(curve) for curve in simple]
+        composed += [
+            general.blend_curves(curve, curves.linear, 0.3) for curve in simple
+        ]
+        composed.append(general.sequence_curves(*simple, spans=(3, 1, 2, 1, 2, 1)))
+        rng = random.Random(24)
+        values = [rng.random() for _ in range(5000)]
+        for curve in composed:
+            assert list(curve(values)) == [curve(value) for value in values]
+
+    def test_invalid_sequence(self):
+        """Test that empty sequences and bad spans are rejected"""
+        with pytest.raises(ValueError):
+            general.sequence_curves()
+        with pytest.raises(ValueError):
+            general.sequence_curves(general.Curves.linear, spans=(0,))
+
+
+class TestTimeline:
+    """Test the batched tween engine"""
+
+    def test_step_interpolates_along_curves(self):
+        """Test values of tweens with different curves and start times"""
+        engine = timeline.Timeline(clock=lambda: 0.0)
+        linear = engine.add(0, 10, 2.0)
+        quad = engine.add(100, 200, 1.0, general.Curves.ease_in_quad)
+        later = engine.add(5, 6, 1.0, start_time=3.0)
+        assert len(engine) == 3
+
+        ids, values = engine.step(0.5)
+        result = dict(zip(list(ids), list(values)))
+        assert result[linear] == pytest.approx(2.5)
+        assert result[quad] == pytest.approx(125)
+        # Not started yet: still at its start value
+        assert result[later] == 5
+
+    def test_finished_tweens_retire_and_call_back(self):
+        """Test that finished tweens report their end value once and are removed"""
+        engine = timeline.Timeline(clock=lambda: 0.0)
+        done = []
+        first = engine.add(0, 1, 1.0, general.Curves.bounce, on_complete=done.append)
+        second = engine.add(0, 1, 3.0, on_complete=done.append)
+        ids, values = engine.step(1.5)
+        assert dict(zip(list(ids), list(values)))[first] == 1
+        assert done == [first]
+        assert first not in engine and second in engine
+
+        ids, _ = engine.step(2.0)
+        assert list(ids) == [second]
+        engine.step(10.0)
+        assert done == [first, second]
+        assert len(engine) == 0
+
+    def test_callbacks_can_chain_tweens(self):
+        """Test adding a tween from a completion callback"""
+        engine = timeline.Timeline(clock=lambda: 1.0)
+        chained = []
+        engine.add(0, 1, 0.5, on_complete=lambda _: chained.append(engine.add(1, 0, 1)))
+        engine.step(1.0)
+        engine.step(2.0)
+        assert len(chained) == 1 and chained[0] in engine
+        _, values = engine.step(1.5)
+        assert list(values) == [pytest.approx(0.5)]
+
+    def test_cancel(self):
+        """Test that cancelled tweens vanish without calling back"""
+        engine = timeline.Timeline(clock=lambda: 0.0)
+        done = []
+        tween = engine.add(0, 1, 1.0, on_complete=done.append)
+        other = engine.add(0, 1, 1.0)
+        engine.step(0.1)
+        engine.cancel(tween)
+        ids, _ = engine.step(2.0)
+        assert list(ids) == [other]
+        assert done == []
+        with pytest.raises(KeyError):
+            engine.cancel(tween)
+
+    def test_unused_curves_are_released(self):
+        """Test that per-tween curves are forgotten once their tweens are gone"""
+        engine = timeline.Timeline(clock=lambda: 0.0)
+        lasting = engine.add(0, 10, 100.0, general.Curves.ease_in_quad)
+        for frame in range(100):
+            now = frame * 0.5
+            for k in range(10):
+                curve = lambda t, k=k: t * (k + 1) / 10
+                engine.add(0, 1, 1.0, curve, start_time=now)
+            engine.cancel(engine.add(0, 1, 1.0, lambda t: t, start_time=now))
+            ids, values = engine.step(now)
+            # The tweens of this frame and the previous one, and the lasting one
+            assert len(engine._curves) <= 21
+            value = dict(zip(list(ids), list(values)))[lasting]
+            assert value == pytest.approx(10 * (now / 100) ** 2)
+        engine.step(200.0)
+        assert engine._curves == [] and engine._curve_ids == {}
+
+    def test_matches_per_tween_evaluation(self):
+        """Test many tweens over mixed curves against evaluating each one alone"""
+        curves = [
+            general.Curves.linear,
+            general.Curves.bounce,
+            general.Curves.ease_in_out_quad,
+            general.bake_curve(general.Curves.ease_out_cubic, 64),
+        ]
+        engine = timeline.Timeline(clock=lambda: 0.0)
+        tweens = {}
+        for i in range(200):
+            curve = curves[i * 7 % len(curves)]
+            start, end, duration = i, -i * 0.5, 0.5 + i % 5
+            tweens[engine.add(start, end, duration, curve, start_time=i % 3)] = (
+                start,
+                end,
+                i % 3,
+                duration,
+                curve,
+            )
+        for now in (0.25, 1.0, 2.5, 4.0):
+            ids, values = engine.step(now)
+            for tween_id, value in zip(list(ids), list(values)):
+                start, end, start_time, duration, curve = tweens[tween_id]
+                if now - start_time >= duration:
+                    expected = end
+                else:
+                    t = min(max((now - start_time) / duration, 0.0), 1.0)
+                    expected = start + (end - start) * curve(t)
+                assert value == pytest.approx(expected)
+
+    def test_run_drives_until_idle(self):
+        """Test the asyncio driver at a target frame rate"""
+        import asyncio
+
+        engine = timeline.Timeline()
+        done = []
+        frames = []
+        engine.add(0, 1, 0.05, on_complete=done.append)
+        asyncio.run(
+            engine.run(
+                fps=200,
+                on_step=lambda ids, values: frames.append(len(ids)),
+                stop_when_idle=True,
+            )
+        )
+        assert len(done) == 1
+        assert 5 <= len(frames) <= 20
+
+
+class TestKeyframeTrack:
+    """Test keyframe tracks and their cursors"""
+
+    def make_track(self):
+        curves = general.Curves
+        # Given out of order; curves follow the sorted segments
+        return timeline.KeyframeTrack(
+            [2.0, 0.0, 1.0, 4.0],
+            [30.0, 10.0, 20.0, 0.0],
+            [curves.linear, curves.ease_in_quad, curves.bounce],
+        )
+
+    def test_sample_at(self):
+        """Test values inside segments, at keyframes and outside the track"""
+        track = self.make_track()
+        assert len(track) == 4
+        assert (track.start, track.end) == (0.0, 4.0)
+        assert track.sample_at(-1) == 10
+        assert track.sample_at(0) == 10
+        assert track.sample_at(0.5) == pytest.approx(15)
+        assert track.sample_at(1.5) == pytest.approx(20 + 10 * 0.25)
+        assert track.sample_at(3.0) == pytest.approx(
+            30 - 30 * general.Curves.bounce(0.5)
+        )
+        assert track.sample_at(4) == 0
+        assert track.sample_at(9) == 0
+
+    def test_single_keyframe(self):
+        """Test that a single keyframe holds its value everywhere"""
+        track = timeline.KeyframeTrack([1.0], [5.0])
+        assert track.sample_at(0) == track.sample_at(1) == track.sample_at(2) == 5
+        assert list(track.sample([0.0, 1.0, 2.0])) == [5, 5, 5]
+        assert track.cursor().sample(3.0) == 5
+
+    def test_cursor_matches_binary_search(self):
+        """Test the cursor moving forward, jumping and going back"""
+        times = [i * 0.5 + (i % 3) * 0.1 for i in range(200)]
+        values = [(i * 37) % 11 for i in range(200)]
+        curves = [general.Curves.bounce, general.Curves.ease_out_cubic] * 99 + [
+            general.CubicBezier(0.4, 0, 0.2, 1)
+        ]
+        track = timeline.KeyframeTrack(times, values, curves)
+        cursor = track.cursor()
+        samples = [i * 0.07 - 1 for i in range(1500)]
+        samples += [50.0, 20.0, 20.01, 99.0, 0.3, -5.0, 120.0]
+        for time in samples:
+            assert cursor.sample(time) == track.sample_at(time)
+
+    def test_batched_sample(self):
+        """Test that batched sampling matches sampling one time at a time"""
+        track = self.make_track()
+        times = [i * 0.013 - 0.5 for i in range(400)]
+        times.reverse()
+        # Random times too, whose segment progress is not a short binary fraction
+        rng = random.Random(25)
+        times += [rng.uniform(-0.5, 4.5) for _ in range(5000)]
+        expected = [track.sample_at(time) for time in times]
+        assert list(track.sample(times)) == expected
+        cursor = track.cursor()
+        assert [cursor.sample(time) for time in times] == expected
+
+    def test_duplicate_times(self):
+        """Test that a repeated time jumps straight to the later value"""
+        track = timeline.KeyframeTrack([0, 1, 1, 2], [0, 10, 20, 30])
+        assert track.sample_at(0.5) == 5
+        assert track.sample_at(1) == 20
+        assert track.sample_at(1.5) == 25
+        assert list(track.sample([0.5, 1, 1.5])) == [5, 20, 25]
+
+    def test_invalid_tracks(self):
+        """Test that mismatched inputs are rejected"""
+        with pytest.raises(ValueError):
+            timeline.KeyframeTrack([], [])
+        with pytest.raises(ValueError):
+            timeline.KeyframeTrack([0, 1], [0])
+        with pytest.raises(ValueError):
+            timeline.KeyframeTrack([0, 1, 2], [0, 1, 2], [general.Curves.linear])
+
 
 class TestGeneralFunctions:
     """Test general utility functions"""
@@ -334,6 +1311,571 @@ class TestFixedPointArithmetic:
         assert isinstance(fpt, adv_decimal.FixedPointArithmetic)
         assert isinstance(decimal, adv_decimal.FixedPointArithmetic)
 
+    def test_fpa_compatible_string_results(self):
+        """Test that operators keep the string format of the string-based implementation"""
+        fpa = adv_decimal.FixedPointArithmetic("1.50")
+        assert fpa + 2 == "3.50"
+        assert fpa - "2.5" == "-1.00"
+        assert fpa * "0.20" == "0.3"
+        assert adv_decimal.FixedPointArithmetic(1) / 4 == ".25"
+        assert adv_decimal.FixedPointArithmetic(-10) / 3 == "-3." + "3" * 23
+        assert 1 - fpa == "-0.50"
+        assert 3 / fpa == "2.0"
+
+    def test_fpa_str_and_format(self):
+        """Test rendering of the integer-backed value"""
+        assert str(adv_decimal.FixedPointArithmetic("1.50")) == "1.50"
+        assert str(adv_decimal.FixedPointArithmetic("-.25")) == "-0.25"
+        assert str(adv_decimal.FixedPointArithmetic("1.5e3")) == "1500"
+        assert str(adv_decimal.FixedPointArithmetic("12e-4")) == "0.0012"
+        assert format(adv_decimal.FixedPointArithmetic("2.675"), ".2f") == "2.68"
+        assert f"{adv_decimal.FixedPointArithmetic('1234.5'):,}" == "1,234.5"
+
+    def test_fpa_accepts_instances_as_operands(self):
+        """Test that instances can be combined without a string round-trip"""
+        a = adv_decimal.FixedPointArithmetic("0.1")
+        b = adv_decimal.FixedPointArithmetic("0.2")
+        assert a + b == "0.3"
+        assert a < b
+        assert a == adv_decimal.FixedPointArithmetic("0.10")
+
+    def test_fpa_invalid_number(self):
+        """Test that unparseable input is rejected at construction"""
+        with pytest.raises(ValueError):
+            adv_decimal.FixedPointArithmetic("abc")
+        with pytest.raises(ZeroDivisionError):
+            adv_decimal.FixedPointArithmetic(1) / 0
+
+    def test_fpa_fpt_mode_returns_instances(self):
+        """Test that "fpt" mode operators return FixedPointArithmetic instances"""
+        fpa = adv_decimal.FixedPointArithmetic("10.5", mode="fpt")
+        result = (fpa + "5.5") * 2 / 4
+        assert isinstance(result, adv_decimal.FixedPointArithmetic)
+        assert result.mode == "fpt"
+        assert str(result) == "8.0"
+        assert str(fpa - 0.5) == "10.0"
+        assert str(3 - fpa) == "-7.5"
+        assert str(1 / adv_decimal.FixedPointArithmetic(8, mode="fpt")) == "0.125"
+
+    def test_fpa_invalid_mode(self):
+        """Test that unknown result modes are rejected"""
+        with pytest.raises(ValueError):
+            adv_decimal.FixedPointArithmetic(1, mode="float")
+
+    def test_fpa_lazy_mode_evaluates_once(self):
+        """Test that "lazy" mode records an expression and evaluates it exactly"""
+        total = adv_decimal.FixedPointArithmetic(0, mode="lazy")
+        for term in ("0.1", "0.25", 3, "-1.125"):
+            total = total + term
+        assert isinstance(total, adv_decimal.FixedPointExpression)
+        result = total.evaluate()
+        assert isinstance(result, adv_decimal.FixedPointArithmetic)
+        assert result == "2.225"
+        assert str(total) == "2.225"
+
+    def test_fpa_lazy_mode_rounds_only_at_the_end(self):
+        """Test that lazy division is carried out once, after the whole expression"""
+        third = adv_decimal.FixedPointArithmetic(1, mode="lazy") / 3
+        assert str(third * 3) == "1.0"
+        assert str(10 - third * 3) == "9.0"
+        eager = adv_decimal.FixedPointArithmetic(1, mode="fpt") / 3 * 3
+        assert str(eager) == "0." + "9" * 23
+        with pytest.raises(ZeroDivisionError):
+            (third / 0).evaluate()
+
+    def test_fpa_lazy_mode_keeps_operand_precision(self):
+        """Test that nested lazy expressions divide at their operands' precision"""
+        a = adv_decimal.FixedPointArithmetic(1, mode="lazy")
+        a.precision = 5
+        b = adv_decimal.FixedPointArithmetic(2, mode="lazy")
+        c = adv_decimal.FixedPointArithmetic(7, mode="lazy")
+        expression = (a + b) * c / 9
+        assert expression.precision == 5
+        assert str(expression) == "2.33333"
+        # Reflected operators take the precision of the fixed-point operand
+        assert str(10 / (a + 1)) == "5.0"
+        assert str(1 / (a * 3)) == "0.33333"
+        eager = adv_decimal.FixedPointArithmetic(1, mode="fpt")
+        eager.precision = 5
+        assert str((eager + 2) * 7 / 9) == "2.33333"
+
+    def test_fpa_division_matches_long_division(self):
+        """Test that division keeps the digits of the long-division algorithm"""
+        fpa = adv_decimal.FixedPointArithmetic("22", mode="fpt")
+        assert str(fpa / 7) == "3.14285714285714285714285"
+        assert str(fpa / "0.0625") == "352.0"
+        fpa.precision = 100
+        assert str(fpa / 7) == "3." + "142857" * 16 + "1428"
+        fpa.precision = 0
+        assert str(fpa / 7) == "3"
+
+    def test_fpa_newton_division(self):
+        """Test that the Newton reciprocal path agrees with divmod"""
+        dividend = 7**60000
+        divisor = 3**50000 + 1
+        assert adv_decimal._newton_divmod(dividend, divisor) == divmod(
+            dividend, divisor
+        )
+        assert adv_decimal._int_divmod(dividend, divisor) == divmod(dividend, divisor)
+        assert adv_decimal._newton_divmod(5, divisor) == (0, 5)
+
+    def test_fpa_hash_matches_equality(self):
+        """Test that numerically equal values hash alike"""
+        from fractions import Fraction
+
+        FPA = adv_decimal.FixedPointArithmetic
+        assert (
+            hash(FPA("1.50")) == hash(FPA("1.5")) == hash(1.5) == hash(Fraction(3, 2))
+        )
+        assert hash(FPA("-2.000")) == hash(-2)
+        assert hash(FPA("-0.1")) == hash(-0.1)
+        assert len({FPA("1.50"), FPA("1.5"), FPA("1"), FPA("1.0")}) == 2
+        assert {FPA("0.10"): "x"}[FPA("0.1")] == "x"
+
+    def test_fpa_float_equality_matches_hash(self):
+        """Test that floats compare by repr, and sets and dicts mixing them agree"""
+        FPA = adv_decimal.FixedPointArithmetic
+        assert FPA("0.1") == 0.1 and FPA(0.1) == 0.1 and FPA("1e-1") == 0.1
+        assert FPA("0.1") >= 0.1 and FPA("0.1") <= 0.1 and not FPA("0.1") < 0.1
+        assert FPA("0.1") - 0.1 == "0.0"
+        assert FPA("0.10000000000000001") != 0.1
+        numbers = [0.1, 0.5, -2.25, 3.0, 1e-7, 123.456, 0.3, 2.0**-60, 1e22, -7e15]
+        for number in numbers:
+            for fpa in (FPA(number), FPA(repr(number))):
+                assert fpa == number
+                assert hash(fpa) == hash(number)
+                assert {number: "x"}.get(fpa) == "x"
+                assert len({fpa, number}) == 1
+        assert len({FPA("0.1"), 0.1, FPA("0.10")}) == 1
+        assert adv_decimal.unique_decimals([FPA("0.1"), 0.1]) == [FPA("0.1")]
+        # Too large for a float: falls back to the exact rational hash
+        huge = FPA("1" + "0" * 400 + ".5")
+        assert hash(huge) == hash(huge.to_fraction())
+
+    def test_fpa_sort_key(self):
+        """Test that sort keys order values across scales"""
+        from fractions import Fraction
+
+        FPA = adv_decimal.FixedPointArithmetic
+        numbers = [
+            "1.5",
+            "-1.25",
+            "1.05",
+            "-1.3",
+            "0",
+            "1.50",
+            "10",
+            "-0.001",
+            "1.5001",
+        ]
+        keys = [FPA(number).sort_key for number in numbers]
+        expected = sorted(numbers, key=Fraction)
+        assert [
+            numbers[i] for i in sorted(range(len(keys)), key=keys.__getitem__)
+        ] == expected
+        assert FPA("1.50").sort_key == FPA("1.5").sort_key
+
+    def test_bulk_sort_argsort_unique(self):
+        """Test the bulk ordering helpers"""
+        numbers = ["2.5", "-1", "0.75", "2.50", 3, "-1.000", "0.7"]
+        assert adv_decimal.argsort_decimals(numbers) == [1, 5, 6, 2, 0, 3, 4]
+        assert adv_decimal.sort_decimals(numbers, reverse=True) == [
+            3,
+            "2.5",
+            "2.50",
+            "0.75",
+            "0.7",
+            "-1",
+            "-1.000",
+        ]
+        assert adv_decimal.unique_decimals(numbers) == ["-1", "0.7", "0.75", "2.5", 3]
+        assert adv_decimal.sort_decimals([]) == []
+
+    def test_fpa_interop_constructors(self):
+        """Test conversions in from int, Fraction, stdlib Decimal and float"""
+        import decimal
+        from fractions import Fraction
+
+        FPA = adv_decimal.FixedPointArithmetic
+        assert str(FPA.from_int(-42)) == "-42"
+        with pytest.raises(TypeError):
+            FPA.from_int(1.5)
+        assert str(FPA.from_decimal(decimal.Decimal("1.50"))) == "1.50"
+        assert str(FPA.from_decimal(decimal.Decimal("-1.2E+3"))) == "-1200"
+        assert str(FPA.from_decimal(decimal.Decimal("3E-30"))) == "0." + "0" * 29 + "3"
+        with pytest.raises(ValueError):
+            FPA.from_decimal(decimal.Decimal("NaN"))
+        assert FPA(decimal.Decimal("2.5"), mode="fpt") + 1 == "3.5"
+        assert str(FPA.from_fraction(Fraction(-3, 8))) == "-0.375"
+        assert str(FPA.from_fraction(Fraction(2, 3), precision=5)) == "0.66666"
+        assert str(FPA.from_float(0.1)) == str(decimal.Decimal(0.1))
+        assert FPA.from_float(0.1) != FPA(0.1)
+        assert str(FPA.from_float(0.1, exact=False)) == "0.10000000000000000555111"
+        assert FPA.from_float(-2.0, mode="fpt").mode == "fpt"
+
+    def test_fpa_interop_exporters(self):
+        """Test conversions out to float, int, ratios, Fraction and stdlib Decimal"""
+        import decimal
+        from fractions import Fraction
+
+        FPA = adv_decimal.FixedPointArithmetic
+        assert float(FPA("0.1")) == 0.1
+        assert float(FPA("-1" + "0" * 30 + ".5")) == -1e30
+        assert int(FPA("-7.99")) == -7
+        assert int(FPA("12.0")) == 12
+        assert FPA("-1.50").as_integer_ratio() == (-3, 2)
+        assert FPA("0.000").as_integer_ratio() == (0, 1)
+        assert FPA("2.125").to_fraction() == Fraction(17, 8)
+        value = FPA("-123456789012345678901234.567890")
+        assert value.to_decimal().as_tuple() == decimal.Decimal(str(value)).as_tuple()
+        assert FPA.from_decimal(value.to_decimal()) == value
+
+
+class TestFixedPointContext:
+    """Test the FixedPointContext settings for FixedPointArithmetic"""
+
+    def test_default_context(self):
+        """Test the default precision and rounding"""
+        context = adv_decimal.getcontext()
+        assert context.precision == 23
+        assert context.rounding == adv_decimal.ROUND_DOWN
+        assert context.scale is None
+
+    def test_localcontext_precision_and_rounding(self):
+        """Test that a local context changes division precision and rounding"""
+        with adv_decimal.localcontext(
+            precision=4, rounding=adv_decimal.ROUND_HALF_EVEN
+        ):
+            assert adv_decimal.FixedPointArithmetic(2) / 3 == ".6667"
+            assert adv_decimal.FixedPointArithmetic(1) / 8 == ".125"
+            assert adv_decimal.FixedPointArithmetic("0.00025") / 2 == ".0001"
+        assert adv_decimal.FixedPointArithmetic(2) / 3 == "." + "6" * 23
+
+    def test_rounding_modes(self):
+        """Test rounding modes on a negative halfway quotient"""
+        expected = {
+            adv_decimal.ROUND_DOWN: "-0.2",
+            adv_decimal.ROUND_UP: "-0.3",
+            adv_decimal.ROUND_HALF_UP: "-0.3",
+            adv_decimal.ROUND_HALF_DOWN: "-0.2",
+            adv_decimal.ROUND_HALF_EVEN: "-0.2",
+            adv_decimal.ROUND_CEILING: "-0.2",
+            adv_decimal.ROUND_FLOOR: "-0.3",
+            adv_decimal.ROUND_05UP: "-0.2",
+        }
+        for rounding, result in expected.items():
+            with adv_decimal.localcontext(precision=1, rounding=rounding):
+                value = adv_decimal.FixedPointArithmetic("-0.5", mode="fpt") / 2
+                assert str(value) == result, rounding
+
+    def test_fixed_output_scale(self):
+        """Test that a fixed scale rounds every result to the same number of decimals"""
+        with adv_decimal.localcontext(scale=2, rounding=adv_decimal.ROUND_HALF_UP):
+            fpa = adv_decimal.FixedPointArithmetic("1.005")
+            assert fpa + 0 == "1.01"
+            assert fpa * 3 == "3.02"
+            assert adv_decimal.FixedPointArithmetic(10) / 4 == "2.50"
+            lazy = adv_decimal.FixedPointArithmetic(1, mode="lazy") / 3 + 1
+            assert str(lazy) == "1.33"
+
+    def test_invalid_context_settings(self):
+        """Test that invalid settings are rejected"""
+        with pytest.raises(ValueError):
+            adv_decimal.FixedPointContext(precision=-1)
+        with pytest.raises(ValueError):
+            adv_decimal.FixedPointContext(rounding="nearest")
+        with pytest.raises(TypeError):
+            adv_decimal.setcontext(23)
+
+    def test_instance_precision_overrides_context(self):
+        """Test that assigning precision on an instance overrides the context"""
+        fpa = adv_decimal.FixedPointArithmetic(1)
+        fpa.precision = 3
+        with adv_decimal.localcontext(precision=10):
+            assert fpa / 3 == ".333"
+            assert adv_decimal.FixedPointArithmetic(1).precision == 10
+
+    def test_context_caches_powers_of_ten(self):
+        """Test that powers of ten are computed once and shared by copies"""
+        context = adv_decimal.FixedPointContext()
+        assert context.pow10(30) == 10**30
+        assert context.copy(precision=5).pow10(30) is context.pow10(30)
+
+    def test_contexts_are_isolated_between_threads(self):
+        """Test that concurrent threads can use different precisions"""
+        import threading
+
+        results = {}
+        barrier = threading.Barrier(2)
+
+        def worker(precision):
+            with adv_decimal.localcontext(precision=precision):
+                barrier.wait()
+                results[precision] = adv_decimal.FixedPointArithmetic(1) / 3
+
+        threads = [threading.Thread(target=worker, args=(p,)) for p in (2, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == {2: ".33", 5: ".33333"}
+
+    def test_contexts_are_isolated_between_tasks(self):
+        """Test that concurrent asyncio tasks can use different precisions"""
+        import asyncio
+
+        async def handler(precision):
+            with adv_decimal.localcontext(precision=precision):
+                await asyncio.sleep(0)
+                return adv_decimal.FixedPointArithmetic(2) / 3
+
+        async def main():
+            return await asyncio.gather(handler(1), handler(4))
+
+        assert asyncio.run(main()) == [".6", ".6666"]
+
+
+class TestDecimalAccumulator:
+    """Test the DecimalAccumulator running sum"""
+
+    def test_add_and_extend(self):
+        """Test summing mixed inputs at the widest scale"""
+        accumulator = adv_decimal.DecimalAccumulator(["1.5", 2])
+        accumulator.add(0.25).extend(value for value in ("0.001", "-1"))
+        accumulator += adv_decimal.FixedPointArithmetic("10")
+        assert str(accumulator.result()) == "12.751"
+        assert accumulator.count == 6
+
+    def test_sum_is_exact(self):
+        """Test that many small terms sum without drift"""
+        accumulator = adv_decimal.DecimalAccumulator("0.1" for _ in range(100000))
+        assert accumulator.result() == 10000
+
+    def test_merge_partial_sums(self):
+        """Test combining partial sums, including through pickling"""
+        import pickle
+
+        left = adv_decimal.DecimalAccumulator(["1.25", "2"])
+        right = pickle.loads(pickle.dumps(adv_decimal.DecimalAccumulator(["0.125"])))
+        left.merge(right)
+        assert str(left.result()) == "3.375"
+        assert left.count == 3
+
+    def test_empty(self):
+        """Test the result of an empty accumulator"""
+        assert adv_decimal.DecimalAccumulator().result() == 0
+
+
+class TestDecimalArray:
+    """Test the DecimalArray column type"""
+
+    def test_creation_aligns_to_one_scale(self):
+        """Test that values share the largest scale"""
+        array = decimal_array.DecimalArray(["1.5", 2, "0.125"])
+        assert array.scale == 3
+        assert list(array.scaled) == [1500, 2000, 125]
+        assert array.to_strings() == ["1.500", "2.000", "0.125"]
+        assert array[2] == "0.125"
+        assert len(array[1:]) == 2
+
+    def test_elementwise_arithmetic(self):
+        """Test elementwise operations and scalar broadcasting"""
+        a = decimal_array.DecimalArray(["1.10", "2.20", "-3.30"])
+        b = decimal_array.DecimalArray(["0.1", "0.2", "0.3"])
+        assert (a + b).to_strings() == ["1.20", "2.40", "-3.00"]
+        assert (a - b).to_strings() == ["1.00", "2.00", "-3.60"]
+        assert (a * b).to_strings() == ["0.110", "0.440", "-0.990"]
+        assert (1 - b).to_strings() == ["0.9", "0.8", "0.7"]
+        assert (b * 2).to_strings() == ["0.2", "0.4", "0.6"]
+        assert (-b).to_strings() == ["-0.1", "-0.2", "-0.3"]
+
+    def test_division_uses_context(self):
+        """Test that division rounds to the context scale with its rounding mode"""
+        a = decimal_array.DecimalArray(["1", "2", "-2"])
+        with adv_decimal.localcontext(scale=2, rounding=adv_decimal.ROUND_HALF_UP):
+            assert (a / 3).to_strings() == ["0.33", "0.67", "-0.67"]
+            assert (1 / decimal_array.DecimalArray(["8", "-4"])).to_strings() == [
+                "0.13",
+                "-0.25",
+            ]
+        assert (a / 4).to_strings()[0] == "0.25" + "0" * 21
+        with pytest.raises(ZeroDivisionError):
+            a / decimal_array.DecimalArray(["1", "0", "1"])
+
+    def test_default_division_matches_scalar(self):
+        """Test that division without a scale keeps the scalar class's decimals"""
+        FPA = adv_decimal.FixedPointArithmetic
+        values = ["1", "1.25", "-7.5", "92233720368.5"]
+        a = decimal_array.DecimalArray(values)
+        for divisor in (3, "0.7", -9):
+            quotient = a / divisor
+            assert quotient.scale == adv_decimal.getcontext().precision
+            for value, result in zip(values, quotient.to_strings()):
+                assert FPA(result) == FPA(value) / divisor
+        with adv_decimal.localcontext(precision=5):
+            assert (decimal_array.DecimalArray(["1"]) / 3).to_strings() == ["0.33333"]
+        # An explicit or context scale small enough keeps int64 arrays in int64
+        small = decimal_array.DecimalArray(["1.25", "-7.5", "1000000"])
+        with adv_decimal.localcontext(scale=4):
+            assert (small / 3).to_strings()[0] == "0.4166"
+        if decimal_array.np is not None:
+            quotient = small.divide(3, scale=6)
+            assert quotient.scaled.dtype == decimal_array.np.int64
+
+    def test_comparisons_return_masks(self):
+        """Test that comparisons return boolean masks"""
+        a = decimal_array.DecimalArray(["1.50", "2", "3"])
+        assert list(a == "1.5") == [True, False, False]
+        assert list(a > 1.75) == [False, True, True]
+        assert list(a <= decimal_array.DecimalArray(["1.5", "1", "4"])) == [
+            True,
+            False,
+            True,
+        ]
+
+    def test_large_values_stay_exact(self):
+        """Test that values beyond 64 bits fall back to exact Python integers"""
+        a = decimal_array.DecimalArray(["9223372036854775807", "1"])
+        assert (a + 1).to_strings() == ["9223372036854775808", "2"]
+        assert (a * a)[0] == str(9223372036854775807**2)
+        assert a.sum() == "9223372036854775808"
+        with pytest.raises(ValueError):
+            a + decimal_array.DecimalArray(["1"])
+
+
+class TestDecimalLinalg:
+    """Test exact dot, matmul and weighted-sum kernels"""
+
+    def test_dot(self):
+        """Test that the dot product is exact and rescaled once"""
+        quantities = ["3", "0.5", "-2.25"]
+        prices = decimal_array.DecimalArray(["10.01", "0.333", "4"])
+        assert str(decimal_linalg.dot(quantities, prices)) == "21.19650"
+        assert (
+            str(decimal_linalg.dot(["1" + "0" * 30], ["0.1"])) == "1" + "0" * 29 + ".0"
+        )
+        with adv_decimal.localcontext(scale=2, rounding=adv_decimal.ROUND_HALF_UP):
+            assert str(decimal_linalg.dot(quantities, prices)) == "21.20"
+        with pytest.raises(ValueError):
+            decimal_linalg.dot(["1"], ["1", "2"])
+
+    def test_dot_in_worker_processes(self):
+        """Test that partial sums from a process pool combine exactly"""
+        values = ["%d.%02d" % (i, i % 100) for i in range(-500, 500)]
+        serial = decimal_linalg.dot(values, values)
+        assert decimal_linalg.dot(values, values, workers=2, chunk_size=128) == serial
+
+    def test_matmul_and_weighted_sum(self):
+        """Test matrix products and weighted sums of vectors"""
+        product = decimal_linalg.matmul(
+            [["1.5", "2"], ["0", "-0.25"]], [["2", "0.1"], ["1", "3"]]
+        )
+        assert [row.to_strings() for row in product] == [
+            ["5.000", "6.150"],
+            ["-0.250", "-0.750"],
+        ]
+        assert decimal_linalg.matmul(
+            [["1.5", "2"], ["0", "-0.25"]],
+            [["2", "0.1"], ["1", "3"]],
+            workers=2,
+            chunk_size=2,
+        )[1].to_strings() == ["-0.250", "-0.750"]
+        combined = decimal_linalg.weighted_sum(
+            [["1.5", "2"], decimal_array.DecimalArray(["0.25", "-1"])], ["0.2", 4]
+        )
+        assert combined.to_strings() == ["1.300", "-3.600"]
+        with pytest.raises(ValueError):
+            decimal_linalg.matmul([["1", "2"]], [["1"]])
+
+    def test_int64_rows_stay_arrays(self):
+        """Test that int64 DecimalArrays reach the kernels without list conversion"""
+        from fractions import Fraction
+
+        a = decimal_array.DecimalArray(["1.5", "-2.25", "3"])
+        b = decimal_array.DecimalArray(["0.001", "4", "-7.5"])
+        rows, exp, largest = decimal_linalg._scaled_rows([a, b])
+        assert exp == 3 and largest == 7500
+        if decimal_array.np is not None:
+            assert all(row.dtype == decimal_array.np.int64 for row in rows)
+            product = decimal_linalg.matmul([a], [[1, 2]] * 3)[0]
+            assert product.scaled.dtype == decimal_array.np.int64
+        assert str(decimal_linalg.dot(a, b)) == "-31.49850"
+
+        # Rescaling past int64 falls back to exact Python ints
+        huge = decimal_array.DecimalArray(["9000000000000000000"])
+        fine = decimal_array.DecimalArray(["0.0000000001"])
+        rows, _, _ = decimal_linalg._scaled_rows([huge, fine])
+        assert rows[0] == [9 * 10**28]
+        result = decimal_linalg.dot(huge, fine)
+        assert result.to_fraction() == Fraction(9 * 10**8)
+
+
+class TestDecimalIO:
+    """Test streaming parse and format of decimal text columns"""
+
+    def test_read_column_in_blocks(self):
+        """Test reading one column across several blocks"""
+        data = b"name;price\r\n" + b"".join(
+            b"item%d;%d.%d\r\n" % (i, i, i % 10) for i in range(1000)
+        )
+        blocks = list(
+            decimal_io.read_decimal_column(
+                data, column=1, delimiter=";", skip_rows=1, block_size=256
+            )
+        )
+        assert len(blocks) > 1
+        values = [value for block in blocks for value in block.to_strings()]
+        assert values == ["%d.%d" % (i, i % 10) for i in range(1000)]
+
+    def test_read_mixed_syntax(self):
+        """Test fields the bulk path cannot take, and alignment to one scale"""
+        data = b"1.5\n-.25\n 3 \n2e-3\n" + b"9" * 25 + b"\n\n"
+        (block,) = decimal_io.read_decimal_column(data)
+        assert block.scale == 3
+        assert block.to_strings() == [
+            "1.500",
+            "-0.250",
+            "3.000",
+            "0.002",
+            "9" * 25 + ".000",
+        ]
+
+    def test_read_with_fixed_scale(self):
+        """Test rounding fields to a fixed scale"""
+        with adv_decimal.localcontext(rounding=adv_decimal.ROUND_HALF_UP):
+            (block,) = decimal_io.read_decimal_column(b"1.005\n2\n-0.125\n", scale=2)
+        assert block.to_strings() == ["1.01", "2.00", "-0.13"]
+
+    def test_read_file_and_mmap(self, tmp_path):
+        """Test reading from a path and from a memory-mapped file"""
+        import mmap
+
+        path = tmp_path / "prices.csv"
+        path.write_bytes(b"0.1\n0.2\n0.3")
+        (block,) = decimal_io.read_decimal_column(path)
+        assert block.sum() == "0.6"
+        with open(path, "rb") as stream:
+            with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                (block,) = decimal_io.read_decimal_column(mapped)
+                assert block.to_strings() == ["0.1", "0.2", "0.3"]
+
+    def test_read_invalid_fields(self):
+        """Test that malformed fields are rejected"""
+        for data in (b"1.2.3\n", b"12-3\n", b"1 2\n", b"abc\n"):
+            with pytest.raises(ValueError):
+                list(decimal_io.read_decimal_column(data))
+        with pytest.raises(ValueError):
+            list(decimal_io.read_decimal_column(b"1,2\n3\n", column=1))
+
+    def test_write_roundtrip(self, tmp_path):
+        """Test writing blocks back out as text"""
+        path = tmp_path / "out.txt"
+        blocks = decimal_io.read_decimal_column(b"-0.5\n1\n12.25\n", block_size=4)
+        assert decimal_io.write_decimal_column(path, blocks) == 3
+        assert path.read_text() == "-0.5\n1.0\n12.25\n"
+        array = decimal_array.DecimalArray(["-0.05", "10"])
+        assert decimal_io.format_decimal_block(array) == "-0.05\n10.00\n"
+
 
 class TestIntegration:
     """Integration tests to ensure components work together"""